@@ -0,0 +1,65 @@
+"""Initial schema: resumes, analyses and bias metrics
+
+Databases created before migrations were introduced already have these
+tables; mark them with ``alembic stamp 0001`` before upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'resumes',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('content', sa.String(), nullable=False),
+        sa.Column('extracted_features', sa.JSON()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime())
+    )
+    op.create_index('ix_resumes_id', 'resumes', ['id'])
+
+    op.create_table(
+        'analyses',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('resume_id', sa.Integer(), sa.ForeignKey('resumes.id')),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('decision', sa.String(), nullable=False),
+        sa.Column('confidence', sa.Float(), nullable=False),
+        sa.Column('feature_importance', sa.JSON()),
+        sa.Column('explanation', sa.String()),
+        sa.Column('created_at', sa.DateTime())
+    )
+    op.create_index('ix_analyses_id', 'analyses', ['id'])
+
+    op.create_table(
+        'bias_metrics',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('resume_id', sa.Integer(), sa.ForeignKey('resumes.id')),
+        sa.Column('demographic_parity', sa.Float()),
+        sa.Column('equal_opportunity', sa.Float()),
+        sa.Column('disparate_impact', sa.Float()),
+        sa.Column('protected_attributes', sa.JSON()),
+        sa.Column('mitigation_applied', sa.String()),
+        sa.Column('created_at', sa.DateTime())
+    )
+    op.create_index('ix_bias_metrics_id', 'bias_metrics', ['id'])
+
+
+def downgrade():
+    op.drop_index('ix_bias_metrics_id', 'bias_metrics')
+    op.drop_table('bias_metrics')
+    op.drop_index('ix_analyses_id', 'analyses')
+    op.drop_table('analyses')
+    op.drop_index('ix_resumes_id', 'resumes')
+    op.drop_table('resumes')
@@ -0,0 +1,31 @@
+"""Record the model version of each analysis; index rows by resume
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Analyses stored before this revision keep a NULL version
+    with op.batch_alter_table('analyses') as batch:
+        batch.add_column(sa.Column('model_version', sa.String()))
+    op.create_index('ix_analyses_model_version', 'analyses', ['model_version'])
+    op.create_index('ix_analyses_resume_id', 'analyses', ['resume_id'])
+    op.create_index('ix_bias_metrics_resume_id', 'bias_metrics', ['resume_id'])
+
+
+def downgrade():
+    op.drop_index('ix_bias_metrics_resume_id', 'bias_metrics')
+    op.drop_index('ix_analyses_resume_id', 'analyses')
+    op.drop_index('ix_analyses_model_version', 'analyses')
+    with op.batch_alter_table('analyses') as batch:
+        batch.drop_column('model_version')
@@ -0,0 +1,151 @@
+"""
+Conditional GET and an in-process cache of serialized responses.
+
+Stored analyses do not change once written, so their responses carry a
+strong ETag and are kept, already serialized, in a bounded LRU. Each
+entry remembers a cheap validator of its source (a file's mtime and size,
+or the IDs of the rows it was built from); a request whose validator
+still matches is served from memory, or with 304 when the client already
+holds that ETag.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+
+from fastapi import Request, Response
+
+from ..core.config import settings
+from ..core.metrics import counter
+from .responses import compression_for, dumps, weak_etag
+
+
+class CachedResponse(NamedTuple):
+    validator: Hashable
+    body: bytes
+    etag: str
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag of a response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether ``If-None-Match`` lists ``etag``.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    ``W/`` prefix added by a proxy still matches.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in header.split(",")
+    )
+
+
+class ResponseCache:
+    """
+    Bounded LRU of serialized JSON responses, keyed by resource.
+
+    Args:
+        max_bytes: Total body bytes kept before least recently used
+            entries are evicted
+        max_age: ``Cache-Control`` max-age, in seconds, of the responses
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_age: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else settings.RESPONSE_CACHE_MAX_BYTES
+        self.max_age = max_age if max_age is not None else settings.RESPONSE_CACHE_MAX_AGE
+        self.bytes = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = counter("response_cache_hits_total", "Responses served from the in-process cache")
+        self.misses = counter("response_cache_misses_total", "Responses serialized because no valid cache entry existed")
+        self.not_modified = counter("response_not_modified_total", "Conditional GETs answered with 304")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        validator: Hashable,
+        load: Callable[[], Any]
+    ) -> Response:
+        """
+        Response for ``key``, built by ``load`` only when not cached.
+
+        Args:
+            request: Request whose If-None-Match is honoured
+            key: Resource identity, e.g. ("resume_analysis", 42)
+            validator: Value that changes whenever the resource does
+            load: Returns the JSON content when the cache cannot answer
+
+        Returns:
+            304 when the client holds the current version, else the JSON body
+
+        With compression enabled, responses vary by ``Accept-Encoding``.
+        When ``CompressionMiddleware`` would compress the body, the ETag is
+        weak in the 304 as well as the 200, so both name the same
+        representation.
+        """
+        entry = self.get(key, validator)
+        if entry is None:
+            self.misses.inc()
+            body = dumps(load())
+            entry = CachedResponse(validator, body, etag_for(body))
+            self.put(key, entry)
+        else:
+            self.hits.inc()
+
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": f"private, max-age={self.max_age}"
+        }
+        if settings.COMPRESSION_ENABLED:
+            headers["Vary"] = "Accept-Encoding"
+            if compression_for(request.headers, len(entry.body)):
+                headers["ETag"] = weak_etag(entry.etag)
+        if etag_matches(request, entry.etag):
+            self.not_modified.inc()
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def get(self, key: Hashable, validator: Hashable) -> Optional[CachedResponse]:
+        """The entry for ``key`` if it was built from the same ``validator``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.validator != validator:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: CachedResponse):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.bytes += len(entry.body)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key: Hashable):
+        self.bytes -= len(self._entries.pop(key).body)
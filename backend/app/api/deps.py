@@ -0,0 +1,30 @@
+"""
+Shared, process-wide ML components used by the API.
+
+Every router imports these instances instead of creating its own, so a
+model hot-swap through the admin endpoints is seen by all of them.
+"""
+from ..ml.model import ResumeAnalyzer
+from ..ml.bias import BiasDetector
+from ..ml.batching import MicroBatcher
+from ..ml.shadow import ShadowEvaluator
+from ..db.audit import AuditLog
+from ..core.config import settings
+from .jobs import JobManager
+from .caching import ResponseCache
+
+resume_analyzer = ResumeAnalyzer()
+bias_detector = BiasDetector()
+prediction_batcher = MicroBatcher(resume_analyzer)
+shadow_evaluator = ShadowEvaluator(resume_analyzer)
+resume_analyzer.shadow = shadow_evaluator
+decision_audit = AuditLog(
+    settings.AUDIT_DIR,
+    segment_bytes=settings.AUDIT_SEGMENT_BYTES,
+    flush_interval_ms=settings.AUDIT_FLUSH_INTERVAL_MS,
+    flush_records=settings.AUDIT_FLUSH_RECORDS,
+    fsync=settings.AUDIT_FSYNC,
+    enabled=settings.AUDIT_ENABLED
+)
+job_manager = JobManager()
+response_cache = ResponseCache()
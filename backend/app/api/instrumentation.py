@@ -0,0 +1,105 @@
+"""
+Request instrumentation shared by both API applications.
+
+``instrument(app)`` adds a middleware that counts requests and errors,
+times them, and echoes the per-stage timings recorded with
+``app.core.metrics.stage`` in a ``Server-Timing`` response header, plus a
+``/metrics`` endpoint in the Prometheus text format.
+"""
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from ..core.metrics import (
+    STAGE_BUCKETS, counter, gauge, histogram, render_prometheus, request_timings, server_timing
+)
+from ..core.logging import logger
+from .deps import resume_analyzer, prediction_batcher, shadow_evaluator, job_manager, response_cache
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _route_label(request: Request) -> str:
+    # The route template rather than the raw path, so IDs do not multiply series
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+def _model_info():
+    bundle = resume_analyzer.bundle
+    return [({
+        "version": bundle.version,
+        "classifier": type(bundle.classifier).__name__,
+        "compiled": str(bundle.compiled is not None).lower()
+    }, 1.0)]
+
+
+def _lemma_cache_entries() -> float:
+    cache = getattr(resume_analyzer, '_lemma_cache', None)
+    return len(cache) if cache is not None else 0
+
+
+def _register_gauges():
+    gauge("model_info", "Active model bundle; the value is always 1", _model_info)
+    gauge("lemma_memo_tokens", "Tokens held by the fast-mode lemma memo", lambda: len(resume_analyzer.lemma_memo))
+    gauge("lemma_memo_document_hits", "Documents answered from the lemma memo", lambda: resume_analyzer.lemma_memo.hits)
+    gauge("lemma_memo_document_misses", "Documents the lemma memo could not answer", lambda: resume_analyzer.lemma_memo.misses)
+    gauge("lemma_cache_entries", "Documents in the persistent lemma cache", _lemma_cache_entries)
+    gauge("inference_queue_depth", "Predictions waiting for a batch", lambda: prediction_batcher.stats()["queue_depth"])
+    gauge("inference_in_flight", "Predictions queued or being scored", lambda: prediction_batcher.stats()["in_flight"])
+    gauge("shadow_queue_depth", "Live predictions waiting for the shadow model", lambda: shadow_evaluator.queue_depth)
+    gauge("analysis_jobs_active", "Asynchronous analysis jobs queued or running", job_manager.active)
+    gauge("response_cache_entries", "Serialized responses held in memory", lambda: len(response_cache))
+    gauge("response_cache_bytes", "Bytes of serialized responses held in memory", lambda: response_cache.bytes)
+
+
+def instrument(app: FastAPI):
+    """Add request metrics, Server-Timing headers and a /metrics endpoint to ``app``."""
+    _register_gauges()
+
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        timings = []
+        token = request_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        except Exception:
+            route = _route_label(request)
+            counter("http_requests_total", "HTTP requests by route and status", {
+                "method": request.method, "route": route, "status": "500"
+            }).inc()
+            counter("http_request_errors_total", "HTTP requests that failed with a server error", {
+                "method": request.method, "route": route
+            }).inc()
+            raise
+        finally:
+            request_timings.reset(token)
+        elapsed = time.perf_counter() - start
+
+        route = _route_label(request)
+        counter("http_requests_total", "HTTP requests by route and status", {
+            "method": request.method, "route": route, "status": str(response.status_code)
+        }).inc()
+        if response.status_code >= 500:
+            counter("http_request_errors_total", "HTTP requests that failed with a server error", {
+                "method": request.method, "route": route
+            }).inc()
+        histogram(
+            "http_request_duration_seconds",
+            "Time to produce a response, by route",
+            STAGE_BUCKETS,
+            {"method": request.method, "route": route}
+        ).observe(elapsed)
+
+        response.headers["Server-Timing"] = server_timing(timings, elapsed)
+        if timings:
+            logger.debug(f"{request.method} {route}: {response.headers['Server-Timing']}")
+        return response
+
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Every registered metric in the Prometheus text format."""
+        return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,435 @@
+"""
+Asynchronous analysis jobs.
+
+An upload in job mode is answered with 202 and a job ID as soon as it is
+on disk; the analysis runs in a local thread pool. Clients poll the job
+or follow it as Server-Sent Events, one event per analyzed file. A zip
+of resumes is read one member at a time and its files are analyzed
+concurrently.
+
+Jobs live in the memory of the process that accepted them. With several
+uvicorn workers, status requests must reach the same worker as the upload.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logging import logger
+from ..core.metrics import counter
+
+# Analyzes one file: (filename, raw bytes) -> JSON-serializable result
+Processor = Callable[[str, bytes], Dict[str, Any]]
+
+# Seconds between SSE comments that keep idle connections open
+KEEPALIVE_SECONDS = 15.0
+
+_COPY_CHUNK = 1024 * 1024
+
+
+class IdempotencyConflict(Exception):
+    """An idempotency key was reused for a different upload."""
+
+
+class Job:
+    """
+    State and progress events of one upload.
+
+    Worker threads update the job and publish events; any number of SSE
+    streams follow the event list from the event loop.
+    """
+
+    def __init__(self, idempotency_key: str, fingerprint: str, kind: str, total: int):
+        self.id = uuid.uuid4().hex
+        self.idempotency_key = idempotency_key
+        self.fingerprint = fingerprint
+        self.kind = kind
+        self.state = "queued"
+        self.total = total
+        self.processed = 0
+        self.failed = 0
+        self.error: Optional[str] = None
+        self.results: List[Dict[str, Any]] = []
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("succeeded", "failed")
+
+    def start(self):
+        self.state = "running"
+        self.started_at = time.time()
+        self.publish("started", self.progress())
+
+    def record(self, result: Dict[str, Any]):
+        """Add the outcome of one file and publish it as a progress event."""
+        with self._lock:
+            self.processed += 1
+            if result.get("status") == "failed":
+                self.failed += 1
+            self.results.append(result)
+        self.publish("progress", {**result, **self.progress()})
+
+    def finish(self, error: Optional[str] = None):
+        self.error = error
+        self.state = "failed" if error else "succeeded"
+        self.finished_at = time.time()
+        self.publish("failed" if error else "completed", self.snapshot(include_results=False))
+
+    def progress(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "processed": self.processed,
+            "failed": self.failed,
+            "total": self.total
+        }
+
+    def snapshot(self, include_results: bool = True, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Job status for the API.
+
+        Args:
+            include_results: Include per-file results
+            offset: First result to include
+            limit: Most results to include
+        """
+        snapshot = {
+            "job_id": self.id,
+            "idempotency_key": self.idempotency_key,
+            "kind": self.kind,
+            **self.progress(),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if include_results:
+            end = None if limit is None else offset + limit
+            with self._lock:
+                snapshot["results"] = self.results[offset:end]
+        return snapshot
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        """Append an event and wake the streams following this job."""
+        with self._lock:
+            self.events.append({"id": len(self.events), "event": event, "data": data})
+            waiters = list(self._waiters)
+        for loop, ready in waiters:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                # The stream's loop has closed
+                pass
+
+    async def follow(self, last_event_id: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Server-Sent Events for this job, from just after ``last_event_id``.
+
+        Replays the events already published, then streams new ones until
+        the job finishes. Reconnecting clients send the ``Last-Event-ID``
+        header and miss nothing.
+        """
+        ready = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), ready)
+        with self._lock:
+            self._waiters.append(waiter)
+        position = 0 if last_event_id is None else last_event_id + 1
+        try:
+            while True:
+                ready.clear()
+                with self._lock:
+                    events = self.events[position:]
+                    done = self.finished
+                for event in events:
+                    yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+                position += len(events)
+                if done and position >= len(self.events):
+                    return
+                try:
+                    await asyncio.wait_for(ready.wait(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            with self._lock:
+                self._waiters.remove(waiter)
+
+
+def spool_upload(source: BinaryIO, suffix: str = "") -> Tuple[str, str]:
+    """
+    Copy an upload to a temporary file in chunks.
+
+    The request's own spool is closed once the response is sent, so job
+    input has to outlive it.
+
+    Returns:
+        (path, SHA-256 of the content); the caller owns the file
+    """
+    digest = hashlib.sha256()
+    fd, path = tempfile.mkstemp(prefix="analysis-job-", suffix=suffix)
+    with os.fdopen(fd, "wb") as target:
+        while True:
+            chunk = source.read(_COPY_CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+            target.write(chunk)
+    return path, digest.hexdigest()
+
+
+def zip_members(path: str) -> List[zipfile.ZipInfo]:
+    """
+    Resume files in a zip archive, in archive order.
+
+    Only the central directory is read. Directories and macOS resource
+    forks are skipped.
+
+    Raises:
+        ValueError: Not a zip archive, or more files than ``JOB_MAX_FILES``
+    """
+    if not zipfile.is_zipfile(path):
+        raise ValueError("Upload is not a zip archive")
+    with zipfile.ZipFile(path) as archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+            and not os.path.basename(info.filename).startswith(".")
+        ]
+    if not members:
+        raise ValueError("Zip archive contains no files")
+    if len(members) > settings.JOB_MAX_FILES:
+        raise ValueError(f"Zip archive contains {len(members)} files; the limit is {settings.JOB_MAX_FILES}")
+    return members
+
+
+class JobManager:
+    """
+    Runs analysis jobs in a local thread pool.
+
+    Each job has a coordinator thread, at most ``max_running`` at once,
+    which feeds its files to a worker pool shared by all jobs while keeping
+    only a few files per worker in memory. Jobs are keyed by an
+    idempotency key: submitting the same upload under the same key again
+    returns the existing job instead of analyzing it twice. Finished jobs
+    are forgotten after ``retention_seconds``.
+
+    Args:
+        workers: Files analyzed concurrently across all jobs
+        max_running: Jobs processed concurrently; the rest wait queued
+        retention_seconds: How long finished jobs stay queryable
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_running: Optional[int] = None,
+        retention_seconds: Optional[float] = None
+    ):
+        self.workers = workers or settings.JOB_WORKERS
+        self.max_running = max_running or settings.JOB_MAX_RUNNING
+        self.retention_seconds = retention_seconds if retention_seconds is not None else settings.JOB_RETENTION_SECONDS
+
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._coordinators: Optional[ThreadPoolExecutor] = None
+        self._workers: Optional[ThreadPoolExecutor] = None
+
+        self.jobs_total = counter("analysis_jobs_total", "Asynchronous analysis jobs accepted")
+        self.job_files_total = counter("analysis_job_files_total", "Files analyzed by asynchronous jobs")
+        self.job_files_failed = counter("analysis_job_files_failed_total", "Files asynchronous jobs failed to analyze")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self) -> int:
+        """Jobs queued or running."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def submit_file(
+        self,
+        filename: str,
+        content: bytes,
+        process: Processor,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Job, bool]:
+        """
+        Analyze one file in the background.
+
+        Returns:
+            (job, created); ``created`` is False when the key was seen before
+
+        Raises:
+            IdempotencyConflict: The key was used for a different upload
+        """
+        fingerprint = hashlib.sha256(content).hexdigest()
+        return self._submit(
+            idempotency_key, fingerprint, "file", 1,
+            lambda: iter([(filename, lambda: content)]), process
+        )
+
+    def submit_zip(
+        self,
+        path: str,
+        fingerprint: str,
+        process: Processor,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Job, bool]:
+        """
+        Analyze every file in a spooled zip archive in the background.
+
+        The job takes ownership of ``path`` and deletes it when done; it
+        is deleted right away when the upload is refused or a replay.
+
+        Raises:
+            ValueError: The archive is unusable (see ``zip_members``)
+            IdempotencyConflict: The key was used for a different upload
+        """
+        try:
+            members = zip_members(path)
+        except (ValueError, zipfile.BadZipFile) as e:
+            os.unlink(path)
+            raise ValueError(str(e))
+
+        def files() -> Iterator[Tuple[str, Callable[[], bytes]]]:
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    for info in members:
+                        yield info.filename, lambda info=info: _read_member(archive, info)
+            finally:
+                os.unlink(path)
+
+        try:
+            job, created = self._submit(idempotency_key, fingerprint, "zip", len(members), files, process)
+        except IdempotencyConflict:
+            os.unlink(path)
+            raise
+        if not created:
+            os.unlink(path)
+        return job, created
+
+    def _submit(
+        self,
+        idempotency_key: Optional[str],
+        fingerprint: str,
+        kind: str,
+        total: int,
+        files: Callable[[], Iterator[Tuple[str, Callable[[], bytes]]]],
+        process: Processor
+    ) -> Tuple[Job, bool]:
+        key = idempotency_key or uuid.uuid4().hex
+        with self._lock:
+            self._evict()
+            existing = self._keys.get(key)
+            if existing is not None:
+                job = self._jobs[existing]
+                if job.fingerprint != fingerprint:
+                    raise IdempotencyConflict(f"Idempotency key {key} was used for a different upload")
+                return job, False
+
+            job = Job(key, fingerprint, kind, total)
+            self._jobs[job.id] = job
+            self._keys[key] = job.id
+            if self._coordinators is None:
+                self._coordinators = ThreadPoolExecutor(self.max_running, thread_name_prefix="analysis-job")
+                self._workers = ThreadPoolExecutor(self.workers, thread_name_prefix="analysis-worker")
+            self._coordinators.submit(self._run, job, files, process)
+
+        self.jobs_total.inc()
+        logger.info(f"Accepted {kind} analysis job {job.id} ({total} files)")
+        return job, True
+
+    def _run(
+        self,
+        job: Job,
+        files: Callable[[], Iterator[Tuple[str, Callable[[], bytes]]]],
+        process: Processor
+    ):
+        """Feed a job's files to the worker pool, two per worker at most in flight."""
+        job.start()
+        pending: Dict[Future, str] = {}
+
+        def collect(done):
+            for future in done:
+                filename = pending.pop(future)
+                try:
+                    result = {"filename": filename, "status": "succeeded", **future.result()}
+                except Exception as e:
+                    logger.error(f"Job {job.id}: error processing {filename}: {str(e)}")
+                    result = {"filename": filename, "status": "failed", "error": str(e)}
+                    self.job_files_failed.inc()
+                job.record(result)
+                self.job_files_total.inc()
+
+        try:
+            for filename, read in files():
+                if len(pending) >= 2 * self.workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                try:
+                    content = read()
+                except Exception as e:
+                    job.record({"filename": filename, "status": "failed", "error": str(e)})
+                    self.job_files_failed.inc()
+                    continue
+                pending[self._workers.submit(process, filename, content)] = filename
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        except Exception as e:
+            logger.error(f"Analysis job {job.id} failed: {str(e)}")
+            for future in pending:
+                future.cancel()
+            job.finish(error=str(e))
+            return
+
+        job.finish()
+        logger.info(f"Analysis job {job.id} finished: {job.processed - job.failed} analyzed, {job.failed} failed")
+
+    def _evict(self):
+        """Forget finished jobs past their retention; call with the lock held."""
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]:
+            job = self._jobs.pop(job_id)
+            self._keys.pop(job.idempotency_key, None)
+
+    def shutdown(self):
+        """Stop taking work; queued jobs and files are abandoned."""
+        with self._lock:
+            coordinators, workers = self._coordinators, self._workers
+            self._coordinators = self._workers = None
+        if coordinators is not None:
+            coordinators.shutdown(wait=False, cancel_futures=True)
+            workers.shutdown(wait=False, cancel_futures=True)
+
+
+def _read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+    """Read one archive member, refusing files over ``JOB_MAX_FILE_BYTES``."""
+    limit = settings.JOB_MAX_FILE_BYTES
+    if info.file_size > limit:
+        raise ValueError(f"File is larger than {limit} bytes")
+    with archive.open(info) as member:
+        # The declared size is not trusted: stop reading past the limit
+        content = member.read(limit + 1)
+    if len(content) > limit:
+        raise ValueError(f"File is larger than {limit} bytes")
+    return content
@@ -0,0 +1,253 @@
+"""
+Lean API responses: fast JSON, field selection and compression.
+
+``dumps`` serializes with orjson when it is installed. ``FieldSelection``
+is the ``fields=``/``view=`` query selector the analysis and list
+endpoints accept, and ``CompressionMiddleware`` negotiates br or gzip for
+large responses.
+"""
+import gzip
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+from ..core.config import settings
+from ..core.metrics import counter
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Compact JSON of ``content`` as UTF-8 bytes.
+
+    NumPy arrays and scalars, datetimes and dataclasses are serialized
+    natively by orjson; anything else goes through FastAPI's encoder.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            content,
+            default=jsonable_encoder,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serialized with ``dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _project(content: Any, paths: List[Tuple[str, ...]]) -> Any:
+    if isinstance(content, list):
+        return [_project(item, paths) for item in content]
+    if not isinstance(content, dict):
+        return content
+
+    nested: Dict[str, List[Tuple[str, ...]]] = {}
+    for path in paths:
+        nested.setdefault(path[0], []).append(path[1:])
+    projected = {}
+    for key, rests in nested.items():
+        if key not in content:
+            continue
+        # A bare key selects the whole value even when sub-paths are also listed
+        projected[key] = content[key] if any(not rest for rest in rests) else _project(content[key], rests)
+    return projected
+
+
+class FieldSelection(NamedTuple):
+    """
+    Which parts of a payload a client asked for.
+
+    ``fields`` is a comma-separated list of keys, with dots reaching into
+    nested objects and through lists (``analysis.decision``); it takes
+    precedence over ``view``. Unknown keys are ignored.
+    """
+    fields: Optional[str]
+    view: str
+
+    def apply(self, content: Any, summary: Sequence[str]) -> Any:
+        """``content`` reduced to the selected fields; ``summary`` lists the summary view's."""
+        if self.fields:
+            paths = [field.strip() for field in self.fields.split(",") if field.strip()]
+        elif self.view == "summary":
+            paths = list(summary)
+        else:
+            return content
+        return _project(content, [tuple(path.split(".")) for path in paths])
+
+    def selects(self, key: str, summary: Sequence[str]) -> bool:
+        """Whether the top-level ``key`` survives the selection, so callers can skip building it."""
+        if self.fields:
+            paths = self.fields.split(",")
+        elif self.view == "summary":
+            paths = summary
+        else:
+            return True
+        return any(path.strip().split(".")[0] == key for path in paths)
+
+    def respond(self, content: Any, summary: Sequence[str], status_code: int = 200) -> FastJSONResponse:
+        return FastJSONResponse(self.apply(content, summary), status_code=status_code)
+
+
+def field_selection(
+    fields: Optional[str] = Query(None, description="Comma-separated keys to return; dots reach into nested objects"),
+    view: str = Query("full", pattern="^(summary|full)$")
+) -> FieldSelection:
+    """Dependency parsing the ``fields``/``view`` query parameters."""
+    return FieldSelection(fields, view)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Content coding to use for an ``Accept-Encoding`` header, if any.
+
+    Honours q-values and ``*``; br is preferred over gzip on ties, when
+    the brotli package is installed.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    supported = ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+    best, best_weight = None, 0.0
+    for encoding in supported:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compression_for(request_headers: Headers, size: int) -> Optional[str]:
+    """Encoding ``CompressionMiddleware`` would pick for a compressible body of ``size`` bytes."""
+    if not settings.COMPRESSION_ENABLED or size < settings.COMPRESSION_MIN_BYTES:
+        return None
+    return negotiate_encoding(request_headers.get("accept-encoding", ""))
+
+
+def weak_etag(etag: str) -> str:
+    """ETag of a compressed representation, whose bytes differ from what ``etag`` names."""
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+def add_vary_accept_encoding(headers: MutableHeaders):
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in [value.strip().lower() for value in vary.split(",")]:
+        headers.add_vary_header("Accept-Encoding")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete responses of at least ``minimum_size`` bytes.
+
+    Only single-message bodies are compressed; streamed responses such
+    as Server-Sent Events pass through untouched, so they are never
+    buffered. Compressed responses get ``Vary: Accept-Encoding`` and a
+    weak ETag, since the bytes differ from the representation the strong
+    ETag names.
+
+    Args:
+        app: ASGI application to wrap
+        minimum_size: Smallest body worth compressing
+    """
+
+    COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/csv")
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else settings.COMPRESSION_MIN_BYTES
+        self.saved_bytes = counter(
+            "http_response_compression_saved_bytes_total", "Response bytes saved by compression"
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Dict[str, Any]] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            passthrough = True
+            if message.get("more_body", False) or not self._compressible(start, message.get("body", b"")):
+                await send(start)
+                await send(message)
+                return
+
+            body = message["body"]
+            compressed = compress(body, encoding)
+            if len(compressed) >= len(body):
+                await send(start)
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            add_vary_accept_encoding(headers)
+            etag = headers.get("etag")
+            if etag:
+                headers["ETag"] = weak_etag(etag)
+            self.saved_bytes.inc(len(body) - len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, start: Dict[str, Any], body: bytes) -> bool:
+        if len(body) < self.minimum_size or start["status"] in (204, 206, 304):
+            return False
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip()
+        return content_type in self.COMPRESSIBLE_TYPES
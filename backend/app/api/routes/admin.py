@@ -0,0 +1,151 @@
+from datetime import datetime
+from itertools import islice
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+
+from ..deps import resume_analyzer, decision_audit, shadow_evaluator
+from ...core.logging import logger
+
+router = APIRouter()
+
+@router.get("/models")
+async def list_models():
+    """List model versions in the registry and the active one."""
+    return {
+        "active_version": resume_analyzer.model_version,
+        "swap": resume_analyzer.swap_status,
+        "versions": resume_analyzer.registry.list_versions()
+    }
+
+@router.post("/models/{version}/activate", status_code=202)
+async def activate_model(
+    version: str,
+    background_tasks: BackgroundTasks
+):
+    """
+    Load, warm and activate a model version without a restart.
+    
+    Loading runs in the background; requests keep being served by the
+    current model until the new one is swapped in. Poll GET /models for
+    the swap status.
+    
+    Activation is per process: only the worker that handles this request
+    swaps models. The version is recorded as active in the registry, so
+    every worker loads it when it (re)starts; with several uvicorn workers,
+    restart them to switch all of them.
+    """
+    if not any(v["version"] == version for v in resume_analyzer.registry.list_versions()):
+        raise HTTPException(
+            status_code=404,
+            detail="Model version not found"
+        )
+    
+    if resume_analyzer.swap_status.get("state") == "loading":
+        raise HTTPException(
+            status_code=409,
+            detail="Another model version is being loaded"
+        )
+    
+    background_tasks.add_task(_load_version, version)
+    logger.info(f"Scheduled activation of model version {version}")
+    
+    return {
+        "version": version,
+        "state": "scheduled"
+    }
+
+def _load_version(version: str):
+    """Background task wrapper; failures are recorded in swap_status."""
+    try:
+        resume_analyzer.load_model(version)
+    except Exception:
+        # load_model has already logged the error and recorded it in swap_status
+        pass
+
+@router.get("/shadow")
+async def shadow_status():
+    """
+    Shadow model state and how it compares with production so far.
+    
+    Includes the disagreement rate, score distributions of both models,
+    per-group selection rates and fairness metrics, and how many live
+    predictions were dropped because the shadow model fell behind.
+    """
+    return shadow_evaluator.stats()
+
+@router.post("/shadow/{version}", status_code=202)
+async def start_shadow(
+    version: str,
+    background_tasks: BackgroundTasks
+):
+    """
+    Score live traffic with a model version next to the active one.
+    
+    The shadow model never affects responses. Loading runs in the
+    background; poll GET /shadow for its state and statistics.
+    """
+    if not any(v["version"] == version for v in resume_analyzer.registry.list_versions()):
+        raise HTTPException(
+            status_code=404,
+            detail="Model version not found"
+        )
+    
+    if shadow_evaluator.status.get("state") == "loading":
+        raise HTTPException(
+            status_code=409,
+            detail="Another shadow model version is being loaded"
+        )
+    
+    background_tasks.add_task(_start_shadow, version)
+    logger.info(f"Scheduled shadow evaluation of model version {version}")
+    
+    return {
+        "version": version,
+        "state": "scheduled"
+    }
+
+def _start_shadow(version: str):
+    """Background task wrapper; failures are recorded in the shadow status."""
+    try:
+        shadow_evaluator.start(version)
+    except Exception:
+        pass
+
+@router.delete("/shadow")
+async def stop_shadow():
+    """Stop shadow evaluation and return its final statistics."""
+    stats = shadow_evaluator.stats()
+    shadow_evaluator.stop()
+    return stats
+
+@router.get("/audit")
+def read_audit_log(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    decision: Optional[str] = None,
+    model_version: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=100000)
+):
+    """
+    Decisions from the append-only audit log, oldest first.
+    
+    Reads the log's segment indexes rather than the database; naive
+    ``start``/``end`` datetimes are UTC and ``end`` is exclusive.
+    """
+    filters = {}
+    if decision:
+        filters["decision"] = decision
+    if model_version:
+        filters["model_version"] = model_version
+    
+    # Include decisions still waiting in this process's write buffer
+    decision_audit.flush()
+    records = list(islice(decision_audit.read(start, end, **filters), limit + 1))
+    
+    return {
+        "records": records[:limit],
+        "count": min(len(records), limit),
+        "truncated": len(records) > limit,
+        "log": decision_audit.stats()
+    }
@@ -1,20 +1,37 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Dict
+from typing import List, Dict, Any, Hashable, Optional, Tuple
 from datetime import datetime, timedelta
+import threading
+import numpy as np
+import pandas as pd
 
 from app.db.base import get_db
 from app.models.resume import Resume, Analysis, BiasMetrics
+from app.api.deps import bias_detector, prediction_batcher
 from app.core.logging import logger
 
 router = APIRouter()
 
+# Bootstrap intervals of the last summary, with the row counts and IDs they were computed from
+_intervals: Optional[Tuple[Hashable, Dict[str, Any]]] = None
+_intervals_lock = threading.Lock()
+
+# Rows fetched per round trip when streaming stored decisions
+_PAGE_SIZE = 1000
+
 @router.get("/summary")
-async def get_metrics_summary(
+def get_metrics_summary(
     db: Session = Depends(get_db)
 ):
-    """Get summary of all metrics."""
+    """
+    Get summary of all metrics.
+    
+    A plain function, so the bootstrap runs in the threadpool rather than
+    on the event loop. Stored decisions are append-only, so the fairness
+    intervals are recomputed only after analyses or bias metrics are added.
+    """
     try:
         # Get total counts
         total_resumes = db.query(func.count(Resume.id)).scalar()
@@ -35,6 +52,8 @@ async def get_metrics_summary(
             func.count(BiasMetrics.id).label('count')
         ).group_by(BiasMetrics.mitigation_applied).all()
         
+        fairness_intervals = _fairness_intervals(db)
+        
         return {
             "total_resumes": total_resumes,
             "total_shortlisted": total_shortlisted,
@@ -47,7 +66,8 @@ async def get_metrics_summary(
             "mitigation_statistics": {
                 stat[0] or "none": stat[1]
                 for stat in mitigation_stats
-            }
+            },
+            "fairness_intervals": fairness_intervals
         }
         
     except Exception as e:
@@ -57,6 +77,32 @@ async def get_metrics_summary(
             detail="Error getting metrics summary"
         )
 
+def _fairness_intervals(db: Session) -> Dict[str, Any]:
+    """Bootstrap intervals per protected attribute, reused while no rows were added."""
+    global _intervals
+    validator = (
+        tuple(db.query(func.count(Analysis.id), func.max(Analysis.id)).one()),
+        tuple(db.query(func.count(BiasMetrics.id), func.max(BiasMetrics.id)).one())
+    )
+    with _intervals_lock:
+        if _intervals is not None and _intervals[0] == validator:
+            return _intervals[1]
+        
+        # Get decisions with their protected attributes for confidence intervals
+        decisions = db.query(
+            Analysis.decision,
+            BiasMetrics.protected_attributes
+        ).join(
+            BiasMetrics, BiasMetrics.resume_id == Analysis.resume_id
+        ).all()
+        
+        intervals = bias_detector.summarize_attribute_intervals(
+            predictions=np.array([1 if row[0] == "shortlist" else 0 for row in decisions]),
+            protected_attributes=[row[1] for row in decisions]
+        ) if decisions else {}
+        _intervals = (validator, intervals)
+        return intervals
+
 @router.get("/trends")
 async def get_metrics_trends(
     days: int = 30,
@@ -159,4 +205,56 @@ async def get_protected_attributes_impact(
         raise HTTPException(
             status_code=500,
             detail="Error analyzing protected attributes"
-        ) 
\ No newline at end of file
+        ) 
+
+@router.get("/intersectional")
+def get_intersectional_bias(
+    min_support: int = None,
+    top_k: int = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the most disparate intersections of protected attributes.
+    
+    A plain function, so the rows are read and scored in the threadpool
+    rather than on the event loop. Rows are streamed in pages and only
+    the decision and the protected attribute values are kept.
+    """
+    try:
+        rows = db.query(
+            Analysis.decision,
+            BiasMetrics.protected_attributes
+        ).join(
+            BiasMetrics, BiasMetrics.resume_id == Analysis.resume_id
+        ).yield_per(_PAGE_SIZE)
+        
+        names = list(bias_detector.protected_attributes)
+        predictions = []
+        columns = {name: [] for name in names}
+        for decision, attributes in rows:
+            predictions.append(1 if decision == "shortlist" else 0)
+            attributes = attributes or {}
+            for name in names:
+                columns[name].append(attributes.get(name))
+        
+        if not predictions:
+            return []
+        
+        return bias_detector.detect_intersectional_bias(
+            predictions=np.array(predictions, dtype=np.int8),
+            protected_attributes=pd.DataFrame(columns),
+            min_support=min_support,
+            top_k=top_k
+        )
+        
+    except Exception as e:
+        logger.error(f"Error analyzing intersectional bias: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Error analyzing intersectional bias"
+        )
+
+@router.get("/inference")
+async def get_inference_metrics():
+    """Get micro-batching queue state and batch-size / queue-wait histograms."""
+    return prediction_batcher.stats()
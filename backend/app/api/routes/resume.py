@@ -1,116 +1,324 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only, selectinload
+from typing import List, Dict, Any, Optional, Tuple
+from functools import partial
+import asyncio
 import json
 from pathlib import Path
+import numpy as np
+import pandas as pd
 
-from app.db.base import get_db
+from app.db.base import get_db, SessionLocal
 from app.models.resume import Resume, Analysis, BiasMetrics
-from app.ml.model import ResumeAnalyzer
-from app.ml.bias import BiasDetector
+from app.api.deps import resume_analyzer, bias_detector, prediction_batcher, decision_audit, job_manager, response_cache
+from app.api.jobs import IdempotencyConflict, Job, spool_upload
+from app.api.responses import FieldSelection, field_selection
 from app.core.config import settings
-from app.core.logging import logger
+from app.core.logging import logger, model_logger
+from app.core.metrics import stage
+from app.ml.rescoring import shortlist_probability
 
 router = APIRouter()
-resume_analyzer = ResumeAnalyzer()
-bias_detector = BiasDetector()
+
+# Fields returned with view=summary
+UPLOAD_SUMMARY = ("resume_id", "decision", "confidence", "model_version")
+ANALYSIS_SUMMARY = ("analysis.decision", "analysis.confidence", "analysis.model_version")
+LIST_SUMMARY = ("id", "filename", "analysis_results.decision")
 
 @router.post("/upload")
 async def upload_resume(
+    request: Request,
     file: UploadFile = File(...),
+    mode: str = Query("sync", pattern="^(sync|async)$"),
+    idempotency_key: Optional[str] = Header(None),
+    selection: FieldSelection = Depends(field_selection),
     db: Session = Depends(get_db)
 ):
-    """Upload and analyze a resume."""
+    """
+    Upload and analyze a resume.
+    
+    With ``mode=async`` the upload is answered with 202 and a job ID right
+    away and analyzed in the background (see GET /jobs/{job_id}).
+    ``fields``/``view`` trim the synchronous response.
+    """
+    if mode == "async":
+        with stage("decode"):
+            content = await file.read()
+        try:
+            job, created = job_manager.submit_file(
+                file.filename, content, partial(_analyze_file, asyncio.get_running_loop()), idempotency_key
+            )
+        except IdempotencyConflict as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        return _accepted(request, job, created)
+    
     try:
         # Read and save resume content
-        content = await file.read()
-        content_str = content.decode()
+        with stage("decode"):
+            content = await file.read()
+            content_str = content.decode()
         
         # Create resume record
+        with stage("save"):
+            resume = Resume(
+                filename=file.filename,
+                content=content_str
+            )
+            db.add(resume)
+            db.commit()
+            db.refresh(resume)
+        
+        # Extract features in the threadpool; spaCy would block the event loop
+        features = await run_in_threadpool(resume_analyzer.extract_features, content_str)
+        resume.extracted_features = features
+        
+        # Analyze resume
+        with stage("predict"):
+            prediction = await prediction_batcher.predict(
+                content_str, features.get('protected_attributes', {})
+            )
+        
+        result = _record_analysis(db, resume, features, prediction)
+        
+    except Exception as e:
+        logger.error(f"Error processing resume: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Error processing resume"
+        )
+    
+    return selection.respond(result, UPLOAD_SUMMARY)
+
+@router.post("/upload-zip", status_code=202)
+async def upload_resume_archive(
+    request: Request,
+    file: UploadFile = File(...),
+    idempotency_key: Optional[str] = Header(None)
+):
+    """
+    Upload a zip of resumes and analyze them in the background.
+    
+    The archive is spooled to disk, then its files are read one at a time
+    and analyzed concurrently; follow the per-file progress with
+    GET /jobs/{job_id}/events.
+    """
+    path, fingerprint = await run_in_threadpool(spool_upload, file.file, ".zip")
+    try:
+        job, created = await run_in_threadpool(
+            job_manager.submit_zip,
+            path, fingerprint, partial(_analyze_file, asyncio.get_running_loop()), idempotency_key
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _accepted(request, job, created)
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000)
+):
+    """Progress of an analysis job and its per-file results so far."""
+    return _job_or_404(job_id).snapshot(offset=offset, limit=limit)
+
+@router.get("/jobs/{job_id}/events")
+async def follow_job(
+    job_id: str,
+    last_event_id: Optional[int] = Header(None)
+):
+    """
+    Progress of an analysis job as Server-Sent Events.
+    
+    Emits ``started``, one ``progress`` event per file, then
+    ``completed`` or ``failed``. Reconnecting with ``Last-Event-ID``
+    resumes after that event.
+    """
+    job = _job_or_404(job_id)
+    return StreamingResponse(
+        job.follow(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _job_or_404(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Job not found"
+        )
+    return job
+
+def _accepted(request: Request, job: Job, created: bool) -> JSONResponse:
+    """202 response pointing at the job; repeats of a known idempotency key get the same job."""
+    status_url = str(request.url_for("get_job", job_id=job.id))
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job.id,
+            "idempotency_key": job.idempotency_key,
+            "state": job.state,
+            "total": job.total,
+            "status_url": status_url,
+            "events_url": str(request.url_for("follow_job", job_id=job.id))
+        },
+        headers={
+            "Location": status_url,
+            "Idempotency-Key": job.idempotency_key,
+            "Idempotent-Replayed": str(not created).lower()
+        }
+    )
+
+def _analyze_file(loop: asyncio.AbstractEventLoop, filename: str, content: bytes) -> Dict[str, Any]:
+    """
+    Analyze one resume from a job's worker thread.
+    
+    Predictions go through the shared micro-batcher on the event loop, so
+    files analyzed concurrently are scored together.
+    """
+    content_str = content.decode()
+    db = SessionLocal()
+    try:
         resume = Resume(
-            filename=file.filename,
+            filename=filename,
             content=content_str
         )
         db.add(resume)
         db.commit()
         db.refresh(resume)
         
-        # Extract features
         features = resume_analyzer.extract_features(content_str)
         resume.extracted_features = features
         
-        # Analyze resume
-        decision, confidence, feature_importance = resume_analyzer.predict(content_str)
+        prediction = asyncio.run_coroutine_threadsafe(
+            prediction_batcher.predict(content_str, features.get('protected_attributes', {})), loop
+        ).result()
         
-        # Create analysis record
-        analysis = Analysis(
-            resume_id=resume.id,
-            score=confidence,
-            decision=decision,
-            confidence=confidence,
-            feature_importance=feature_importance,
-            explanation=f"Decision based on {len(feature_importance)} features"
-        )
-        db.add(analysis)
-        
-        # Detect bias
+        result = _record_analysis(db, resume, features, prediction)
+        return {
+            "resume_id": result["resume_id"],
+            "decision": result["decision"],
+            "confidence": result["confidence"],
+            "model_version": result["model_version"]
+        }
+    finally:
+        db.close()
+
+def _record_analysis(
+    db: Session,
+    resume: Resume,
+    features: Dict[str, Any],
+    prediction: Tuple[str, float, Dict[str, float], str]
+) -> Dict[str, Any]:
+    """Log, audit and store a prediction with its bias metrics; returns the API result."""
+    decision, confidence, feature_importance, model_version = prediction
+    model_logger.info(
+        "Resume %s: %s (confidence %.3f, model %s)", resume.id, decision, confidence, model_version,
+        extra={"fields": {
+            "resume_id": resume.id,
+            "decision": decision,
+            "confidence": confidence,
+            "model_version": model_version
+        }}
+    )
+    # Create analysis record
+    analysis = Analysis(
+        resume_id=resume.id,
+        score=confidence,
+        decision=decision,
+        confidence=confidence,
+        feature_importance=feature_importance,
+        explanation=f"Decision based on {len(feature_importance)} features",
+        model_version=model_version
+    )
+    db.add(analysis)
+    
+    # Detect bias
+    with stage("bias"):
         bias_metrics = bias_detector.detect_bias(
             features=pd.DataFrame([features]),
             predictions=np.array([1 if decision == "shortlist" else 0]),
             protected_attributes=features.get('protected_attributes', {})
         )
-        
-        # Create bias metrics record
-        metrics = BiasMetrics(
-            resume_id=resume.id,
-            demographic_parity=bias_metrics['demographic_parity'],
-            equal_opportunity=bias_metrics['equal_opportunity'],
-            disparate_impact=bias_metrics['disparate_impact'],
-            protected_attributes=features.get('protected_attributes', {}),
-            mitigation_applied=None
-        )
-        db.add(metrics)
-        
+    
+    # Create bias metrics record; detect_bias nests the metrics under "fairness"
+    # and leaves out those it cannot compute for the given attributes
+    fairness = bias_metrics.get('fairness', {})
+    metrics = BiasMetrics(
+        resume_id=resume.id,
+        demographic_parity=fairness.get('demographic_parity'),
+        equal_opportunity=fairness.get('equal_opportunity'),
+        disparate_impact=fairness.get('disparate_impact'),
+        protected_attributes=features.get('protected_attributes', {}),
+        mitigation_applied=None
+    )
+    db.add(metrics)
+    
+    with stage("db_commit"):
         db.commit()
-        
-        return {
-            "resume_id": resume.id,
-            "decision": decision,
-            "confidence": confidence,
-            "bias_metrics": bias_metrics,
-            "feature_importance": feature_importance
-        }
-        
-    except Exception as e:
-        logger.error(f"Error processing resume: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail="Error processing resume"
-        )
+    
+    # Audited once committed, so every entry has a stored decision
+    decision_audit.record(
+        resume.content, model_version, shortlist_probability(decision, confidence), decision,
+        features.get('protected_attributes', {}), resume_id=resume.id
+    )
+    
+    return {
+        "resume_id": resume.id,
+        "decision": decision,
+        "confidence": confidence,
+        "model_version": model_version,
+        "bias_metrics": bias_metrics,
+        "feature_importance": feature_importance
+    }
 
 @router.get("/analysis/{resume_id}")
 async def get_analysis(
     resume_id: int,
+    request: Request,
+    selection: FieldSelection = Depends(field_selection),
     db: Session = Depends(get_db)
 ):
-    """Get analysis results for a resume."""
-    analysis = db.query(Analysis).filter(Analysis.resume_id == resume_id).first()
-    if not analysis:
+    """
+    Get analysis results for a resume.
+    
+    Only the IDs of the resume's first analysis and bias metrics rows are
+    queried on every call; stored rows never change, so those IDs validate
+    the cached response, which carries a strong ETag.
+    """
+    analysis_id, metrics_id = db.query(
+        db.query(func.min(Analysis.id)).filter(Analysis.resume_id == resume_id).scalar_subquery(),
+        db.query(func.min(BiasMetrics.id)).filter(BiasMetrics.resume_id == resume_id).scalar_subquery()
+    ).one()
+    if analysis_id is None:
         raise HTTPException(
             status_code=404,
             detail="Analysis not found"
         )
     
-    bias_metrics = db.query(BiasMetrics).filter(
-        BiasMetrics.resume_id == resume_id
-    ).first()
-    
+    return response_cache.respond(
+        request,
+        ("resume_analysis", resume_id, selection),
+        (analysis_id, metrics_id),
+        lambda: selection.apply(
+            _analysis_content(db.get(Analysis, analysis_id), metrics_id and db.get(BiasMetrics, metrics_id)),
+            ANALYSIS_SUMMARY
+        )
+    )
+
+def _analysis_content(analysis: Analysis, bias_metrics: Optional[BiasMetrics]) -> Dict[str, Any]:
     return {
         "analysis": {
             "decision": analysis.decision,
             "confidence": analysis.confidence,
             "feature_importance": analysis.feature_importance,
-            "explanation": analysis.explanation
+            "explanation": analysis.explanation,
+            "model_version": analysis.model_version
         },
         "bias_metrics": {
             "demographic_parity": bias_metrics.demographic_parity,
@@ -123,16 +331,27 @@ async def get_analysis(
 
 @router.get("/list")
 async def list_resumes(
+    selection: FieldSelection = Depends(field_selection),
     db: Session = Depends(get_db)
 ):
-    """List all processed resumes."""
-    resumes = db.query(Resume).all()
-    return [{
+    """
+    List all processed resumes.
+    
+    Resume contents are never loaded, and analyses only when selected.
+    """
+    with_analyses = selection.selects("analysis_results", LIST_SUMMARY)
+    query = db.query(Resume).options(load_only(Resume.id, Resume.filename, Resume.created_at))
+    if with_analyses:
+        query = query.options(
+            selectinload(Resume.analysis_results).load_only(Analysis.decision, Analysis.confidence)
+        )
+    resumes = query.all()
+    return selection.respond([{
         "id": resume.id,
         "filename": resume.filename,
         "created_at": resume.created_at,
-        "analysis_results": [{
+        **({"analysis_results": [{
             "decision": analysis.decision,
             "confidence": analysis.confidence
-        } for analysis in resume.analysis_results]
-    } for resume in resumes] 
\ No newline at end of file
+        } for analysis in resume.analysis_results]} if with_analyses else {})
+    } for resume in resumes], LIST_SUMMARY)
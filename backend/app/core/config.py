@@ -19,6 +19,13 @@ class Settings(BaseSettings):
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_DIR: str = os.getenv(
+        "LOG_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs")
+    )
+    # Write <name>.<pid>.jsonl files: "auto" does so in worker processes of a
+    # multi-process server, so no two processes rotate the same file; "true"
+    # or "false" force it on or off
+    LOG_FILE_PER_PROCESS: str = os.getenv("LOG_FILE_PER_PROCESS", "auto").lower()
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
@@ -29,7 +36,10 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "Dipak@4646")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "ethicalhire")
-    SQLALCHEMY_DATABASE_URI: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
+    SQLALCHEMY_DATABASE_URI: str = os.getenv(
+        "SQLALCHEMY_DATABASE_URI",
+        f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
+    )
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -39,19 +49,99 @@ class Settings(BaseSettings):
     
     # File storage settings
     MODEL_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models")
+    MODEL_REGISTRY_DIR: str = os.getenv("MODEL_REGISTRY_DIR", os.path.join(MODEL_DIR, "registry"))
     RESUMES_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "resumes")
     ANALYSIS_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "analysis")
     
+    # Training resources
+    N_JOBS: int = int(os.getenv("N_JOBS", "-1"))
+    PREPROCESS_N_PROCESS: int = int(os.getenv("PREPROCESS_N_PROCESS", str(os.cpu_count() or 1)))
+    PREPROCESS_BATCH_SIZE: int = int(os.getenv("PREPROCESS_BATCH_SIZE", "64"))
+    PREPROCESS_CACHE_PATH: str = os.getenv(
+        "PREPROCESS_CACHE_PATH", os.path.join(MODEL_DIR, "cache", "lemmas.sqlite3")
+    )
+    # "full" runs the whole spaCy pipeline; "fast" skips unused components
+    # and memoizes token lemmas (see ResumeAnalyzer._lemmatize)
+    PREPROCESS_MODE: str = os.getenv("PREPROCESS_MODE", "full")
+    LEMMA_MEMO_SIZE: int = int(os.getenv("LEMMA_MEMO_SIZE", "100000"))
+    
+    # Documents longer than this are split into chunks and processed in parallel
+    LONG_DOCUMENT_CHARS: int = int(os.getenv("LONG_DOCUMENT_CHARS", "50000"))
+    CHUNK_MAX_CHARS: int = int(os.getenv("CHUNK_MAX_CHARS", "20000"))
+    CHUNK_WORKERS: int = int(os.getenv("CHUNK_WORKERS", str(os.cpu_count() or 1)))
+    LONG_DOCUMENT_BUDGET_SECONDS: float = float(os.getenv("LONG_DOCUMENT_BUDGET_SECONDS", "5.0"))
+    
+    # Entity extraction: "rules" (section parser and patterns), "statistical"
+    # (spaCy NER as well) or "both"; rules always supply skills and experience
+    ENTITY_EXTRACTION: str = os.getenv("ENTITY_EXTRACTION", "rules")
+    
+    # Streaming (out-of-core) training
+    STREAMING_BATCH_SIZE: int = int(os.getenv("STREAMING_BATCH_SIZE", "1000"))
+    HASHING_N_FEATURES: int = int(os.getenv("HASHING_N_FEATURES", str(2 ** 20)))
+    HASHED_IMPORTANCE_TOP_K: int = int(os.getenv("HASHED_IMPORTANCE_TOP_K", "50"))
+    
+    # Resume classifier: "random_forest" or "fair_logistic"
+    CLASSIFIER: str = os.getenv("CLASSIFIER", "random_forest")
+    FAIRNESS_PENALTY: float = float(os.getenv("FAIRNESS_PENALTY", "1.0"))
+    
+    # Shortlist threshold used when no group thresholds are fitted
+    DECISION_THRESHOLD: float = float(os.getenv("DECISION_THRESHOLD", "0.5"))
+    
+    # Score random forests with the array-compiled evaluator
+    COMPILED_INFERENCE: bool = os.getenv("COMPILED_INFERENCE", "true").lower() == "true"
+    
+    # Micro-batching of concurrent predictions
+    BATCHING_ENABLED: bool = os.getenv("BATCHING_ENABLED", "true").lower() == "true"
+    BATCH_MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", "32"))
+    BATCH_MAX_WAIT_MS: float = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+    
+    # Append-only decision audit log (see app.db.audit)
+    AUDIT_ENABLED: bool = os.getenv("AUDIT_ENABLED", "true").lower() == "true"
+    AUDIT_DIR: str = os.getenv("AUDIT_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "audit"))
+    AUDIT_SEGMENT_BYTES: int = int(os.getenv("AUDIT_SEGMENT_BYTES", str(64 * 2 ** 20)))
+    AUDIT_FLUSH_INTERVAL_MS: float = float(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "200"))
+    AUDIT_FLUSH_RECORDS: int = int(os.getenv("AUDIT_FLUSH_RECORDS", "512"))
+    AUDIT_FSYNC: bool = os.getenv("AUDIT_FSYNC", "false").lower() == "true"
+    
+    # Re-scoring stored decisions with a candidate model (see app.ml.rescoring)
+    RESCORING_WORKERS: int = int(os.getenv("RESCORING_WORKERS", str(os.cpu_count() or 1)))
+    RESCORING_BATCH_SIZE: int = int(os.getenv("RESCORING_BATCH_SIZE", "500"))
+    
+    # Shadow evaluation of a candidate model on live traffic (see app.ml.shadow)
+    SHADOW_QUEUE_SIZE: int = int(os.getenv("SHADOW_QUEUE_SIZE", "1000"))
+    SHADOW_BATCH_SIZE: int = int(os.getenv("SHADOW_BATCH_SIZE", "32"))
+    SHADOW_SAMPLE_RATE: float = float(os.getenv("SHADOW_SAMPLE_RATE", "1.0"))
+    SHADOW_MAX_WAIT_MS: float = float(os.getenv("SHADOW_MAX_WAIT_MS", "100"))
+    
+    # Asynchronous analysis jobs (see app.api.jobs)
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_MAX_RUNNING: int = int(os.getenv("JOB_MAX_RUNNING", "2"))
+    JOB_MAX_FILES: int = int(os.getenv("JOB_MAX_FILES", "10000"))
+    JOB_MAX_FILE_BYTES: int = int(os.getenv("JOB_MAX_FILE_BYTES", str(2 * 2 ** 20)))
+    JOB_RETENTION_SECONDS: float = float(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+    
+    # ETags and in-process cache of stored analysis responses (see app.api.caching)
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 2 ** 20)))
+    RESPONSE_CACHE_MAX_AGE: int = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "60"))
+    
+    # br/gzip compression of large responses (see app.api.responses)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "1"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    
     # Protected attributes for bias detection
     PROTECTED_ATTRIBUTES: Dict[str, Any] = {
         "gender": {
             "type": "categorical",
-            "values": ["male", "female", "other"]
+            "values": ["male", "female", "other"],
+            "privileged": "male"
         },
         "age": {
             "type": "numerical",
             "min": 18,
-            "max": 65
+            "max": 65,
+            "privileged": ["25-34", "35-44"]
         }
     }
     
@@ -59,8 +149,18 @@ class Settings(BaseSettings):
     BIAS_THRESHOLDS: Dict[str, float] = {
         "demographic_parity": 0.8,
         "equal_opportunity": 0.8,
-        "disparate_impact": 0.8
+        "disparate_impact": 0.8,
+        "average_odds": 0.8
     }
+    
+    # Confidence intervals for fairness metrics
+    BIAS_INTERVAL_METHOD: str = os.getenv("BIAS_INTERVAL_METHOD", "bootstrap")  # or "analytical"
+    BIAS_CONFIDENCE_LEVEL: float = float(os.getenv("BIAS_CONFIDENCE_LEVEL", "0.95"))
+    BIAS_BOOTSTRAP_RESAMPLES: int = int(os.getenv("BIAS_BOOTSTRAP_RESAMPLES", "2000"))
+    
+    # Intersectional subgroup analysis
+    INTERSECTIONAL_MIN_SUPPORT: int = int(os.getenv("INTERSECTIONAL_MIN_SUPPORT", "30"))
+    INTERSECTIONAL_TOP_K: int = int(os.getenv("INTERSECTIONAL_TOP_K", "20"))
 
 # Create global settings object
 settings = Settings()
@@ -1,61 +1,153 @@
+import atexit
+import json
 import logging
+import multiprocessing
+import os
+import queue
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
-def setup_logging():
-    # Create logs directory if it doesn't exist
-    log_dir = Path("backend/logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Configure logging format
-    log_format = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    
-    # Setup root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(log_format)
-    root_logger.addHandler(console_handler)
-    
-    # File handler
-    file_handler = RotatingFileHandler(
-        log_dir / "app.log",
-        maxBytes=10485760,  # 10MB
-        backupCount=5
-    )
-    file_handler.setFormatter(log_format)
-    root_logger.addHandler(file_handler)
-    
-    # Bias monitoring logger
-    bias_logger = logging.getLogger("bias_monitoring")
-    bias_handler = RotatingFileHandler(
-        log_dir / "bias_monitoring.log",
-        maxBytes=10485760,  # 10MB
-        backupCount=5
+from .config import settings
+
+# Files written by the listener: name -> logger whose records it receives
+# (None for every record)
+LOG_FILES = {
+    "app": None,
+    "bias_monitoring": "bias_monitoring",
+    "model_decisions": "model_decisions",
+}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats each record as one JSON object per line.
+
+    Structured values passed as ``extra={"fields": {...}}`` are merged into
+    the object, so they are serialized here, on the listener thread,
+    rather than by the code that logs them.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues records unformatted.
+
+    The standard QueueHandler formats the message before enqueueing so the
+    record can be pickled; this queue never leaves the process, so message
+    interpolation and serialization are left to the listener thread. Values
+    logged as arguments or fields should not be mutated afterwards.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def per_process_files() -> bool:
+    """Whether this process writes its own log files (see LOG_FILE_PER_PROCESS)."""
+    if settings.LOG_FILE_PER_PROCESS != "auto":
+        return settings.LOG_FILE_PER_PROCESS == "true"
+    # uvicorn starts its workers with multiprocessing; gunicorn forks them but
+    # sets WEB_CONCURRENCY, as uvicorn --workers honours it too
+    return (
+        multiprocessing.parent_process() is not None
+        or int(os.getenv("WEB_CONCURRENCY", "1") or 1) > 1
     )
-    bias_handler.setFormatter(log_format)
-    bias_logger.addHandler(bias_handler)
-    bias_logger.setLevel(logging.INFO)
-    
-    # Model decisions logger
-    model_logger = logging.getLogger("model_decisions")
-    model_handler = RotatingFileHandler(
-        log_dir / "model_decisions.log",
+
+
+def _file_handler(log_dir: Path, name: str, logger_name: Optional[str]) -> logging.Handler:
+    # With several workers, per-process files keep each rotating handler
+    # the only writer of its file
+    suffix = f".{os.getpid()}" if per_process_files() else ""
+    handler = RotatingFileHandler(
+        log_dir / f"{name}{suffix}.jsonl",
         maxBytes=10485760,  # 10MB
         backupCount=5
     )
-    model_handler.setFormatter(log_format)
-    model_logger.addHandler(model_handler)
-    model_logger.setLevel(logging.INFO)
-    
+    handler.setFormatter(JsonLinesFormatter())
+    if logger_name:
+        handler.addFilter(logging.Filter(logger_name))
+    return handler
+
+
+def setup_logging():
+    """
+    Route all logging through a queue drained by a single writer thread.
+
+    Loggers only enqueue records; a QueueListener thread formats them and
+    writes the console and the JSON-lines files, so no request waits on
+    file I/O. Safe to call more than once.
+
+    Returns:
+        The root logger
+    """
+    global _listener
+
+    root_logger = logging.getLogger()
+    if _listener is not None:
+        return root_logger
+
+    log_dir = Path(settings.LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    ))
+
+    handlers = [console_handler] + [
+        _file_handler(log_dir, name, logger_name) for name, logger_name in LOG_FILES.items()
+    ]
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    root_logger.setLevel(settings.LOG_LEVEL)
+    root_logger.addHandler(DeferredQueueHandler(log_queue))
+    for logger_name in ("bias_monitoring", "model_decisions"):
+        logging.getLogger(logger_name).setLevel(logging.INFO)
+
     return root_logger
 
+
+def stop_logging():
+    """Write out queued records and stop the listener thread."""
+    global _listener
+
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            root_logger.removeHandler(handler)
+    _listener = None
+
 # Create logger instances
 logger = logging.getLogger(__name__)
 bias_logger = logging.getLogger("bias_monitoring")
-model_logger = logging.getLogger("model_decisions") 
\ No newline at end of file
+model_logger = logging.getLogger("model_decisions")
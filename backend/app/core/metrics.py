@@ -0,0 +1,270 @@
+"""
+In-process metrics shared by the API and the ML components.
+
+Histograms, counters and gauges live in one process-wide registry keyed by
+name and labels, and are exported in the Prometheus text format by
+``render_prometheus``. ``stage`` times one step of a request into the
+stage histogram and into the current request's Server-Timing entries.
+"""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Sequence, List, Tuple, Optional, Callable, Union, Iterable
+
+
+Labels = Dict[str, str]
+
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Thread-safe cumulative histogram with fixed bucket upper bounds.
+
+    Args:
+        name: Metric name
+        description: One-line description
+        buckets: Increasing bucket upper bounds; an implicit +Inf bucket is added
+        labels: Constant labels distinguishing this series from others of the same name
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: Sequence[float], labels: Optional[Labels] = None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative bucket counts, total count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative, running = {}, 0
+        for bound, count in zip(list(self.buckets) + [float('inf')], counts):
+            running += count
+            cumulative['+Inf' if bound == float('inf') else str(bound)] = running
+
+        return {
+            "description": self.description,
+            "buckets": cumulative,
+            "count": running,
+            "sum": total
+        }
+
+
+class Counter:
+    """
+    Thread-safe monotonically increasing counter.
+
+    Args:
+        name: Metric name, conventionally ending in ``_total``
+        description: One-line description
+        labels: Constant labels distinguishing this series from others of the same name
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Optional[Labels] = None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        """Add ``amount``, which must not be negative."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        with self._lock:
+            return self._value
+
+
+GaugeValue = Union[float, Iterable[Tuple[Labels, float]]]
+
+
+class Gauge:
+    """
+    Gauge read from a callback when metrics are collected.
+
+    The callback returns either a number or (labels, value) pairs, so a
+    gauge can report state such as the active model version as a label
+    without the caller having to keep the metric up to date.
+
+    Args:
+        name: Metric name
+        description: One-line description
+        function: Returns the current value or labelled values
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, function: Callable[[], GaugeValue]):
+        self.name = name
+        self.description = description
+        self.labels: Labels = {}
+        self.function = function
+
+    def samples(self) -> List[Tuple[Labels, float]]:
+        """Current labelled values."""
+        value = self.function()
+        if isinstance(value, (int, float)):
+            return [({}, float(value))]
+        return [(dict(labels), float(v)) for labels, v in value]
+
+
+_registry: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Any] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(cls, name: str, labels: Optional[Labels], *args):
+    key = (name, tuple(sorted((labels or {}).items())))
+    with _registry_lock:
+        metric = _registry.get(key)
+        if metric is None:
+            for (other, _), existing in _registry.items():
+                if other == name and not isinstance(existing, cls):
+                    raise ValueError(f"Metric {name} is already registered as a {existing.kind}")
+            metric = _registry[key] = cls(name, *args) if cls is Gauge else cls(name, *args, labels)
+        return metric
+
+
+def histogram(
+    name: str,
+    description: str,
+    buckets: Sequence[float],
+    labels: Optional[Labels] = None
+) -> Histogram:
+    """Get or create the process-wide histogram called ``name`` with ``labels``."""
+    return _register(Histogram, name, labels, description, buckets)
+
+
+def counter(name: str, description: str, labels: Optional[Labels] = None) -> Counter:
+    """Get or create the process-wide counter called ``name`` with ``labels``."""
+    return _register(Counter, name, labels, description)
+
+
+def gauge(name: str, description: str, function: Callable[[], GaugeValue]) -> Gauge:
+    """Get or create the process-wide gauge called ``name``; the first callback wins."""
+    return _register(Gauge, name, None, description, function)
+
+
+def histograms() -> List[Histogram]:
+    """All registered histogram series."""
+    with _registry_lock:
+        return [metric for metric in _registry.values() if isinstance(metric, Histogram)]
+
+
+# Stage timings of the request being handled, for the Server-Timing header
+request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar('request_timings', default=None)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Time one stage of an analysis.
+
+    The duration goes to the ``analysis_stage_seconds`` histogram and,
+    inside a request, to that request's Server-Timing entries. Failed
+    stages are recorded too.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        histogram(
+            "analysis_stage_seconds",
+            "Time spent in each stage of a resume analysis",
+            STAGE_BUCKETS,
+            {"stage": name}
+        ).observe(elapsed)
+        timings = request_timings.get()
+        if timings is not None:
+            timings.append((name, elapsed))
+
+
+def server_timing(timings: List[Tuple[str, float]], total: Optional[float] = None) -> str:
+    """
+    Server-Timing header value, in milliseconds.
+
+    Repeated stages are summed and keep the position of their first run.
+    """
+    durations: Dict[str, float] = {}
+    for name, seconds in timings:
+        durations[name] = durations.get(name, 0.0) + seconds
+    if total is not None:
+        durations["total"] = total
+    return ", ".join(f"{name};dur={seconds * 1e3:.3f}" for name, seconds in durations.items())
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def render_prometheus() -> str:
+    """All registered metrics in the Prometheus text exposition format (0.0.4)."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+
+    by_name: Dict[str, List[Any]] = {}
+    for metric in metrics:
+        by_name.setdefault(metric.name, []).append(metric)
+
+    lines = []
+    for name in sorted(by_name):
+        series = by_name[name]
+        lines.append(f"# HELP {name} {series[0].description}")
+        lines.append(f"# TYPE {name} {series[0].kind}")
+        for metric in series:
+            if isinstance(metric, Histogram):
+                snapshot = metric.snapshot()
+                for bound, count in snapshot["buckets"].items():
+                    lines.append(f"{name}_bucket{_format_labels({**metric.labels, 'le': bound})} {count}")
+                lines.append(f"{name}_sum{_format_labels(metric.labels)} {_format_value(snapshot['sum'])}")
+                lines.append(f"{name}_count{_format_labels(metric.labels)} {snapshot['count']}")
+            elif isinstance(metric, Counter):
+                lines.append(f"{name}{_format_labels(metric.labels)} {_format_value(metric.value)}")
+            else:
+                try:
+                    samples = metric.samples()
+                except Exception:
+                    # A failing callback must not break the whole scrape
+                    continue
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,311 @@
+"""
+Append-only, segmented audit log of model decisions.
+"""
+import atexit
+import hashlib
+import heapq
+import json
+import os
+import struct
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from ..core.logging import logger
+
+# Index entry: timestamp (ms) and byte offset of a record, written for
+# every INDEX_INTERVAL-th record of a segment
+INDEX_ENTRY = struct.Struct('<qq')
+INDEX_INTERVAL = 128
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of the resume text, identifying it without storing it."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _to_ms(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    # Exact integer arithmetic; float timestamps can be off by a millisecond
+    return (value - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(milliseconds=1)
+
+
+class AuditLog:
+    """
+    Append-only log of every model decision in JSON-lines segments.
+
+    ``record`` only appends to an in-memory buffer; a background thread
+    writes the buffer in batches, one write per batch. Each process
+    appends to its own segments, named by first timestamp and process id,
+    so uvicorn workers never share a file. Every ``INDEX_INTERVAL``-th
+    record adds a (timestamp, byte offset) entry to the segment's binary
+    ``.idx`` file, so a time-range read loads only the small index files,
+    skips segments outside the range and seeks to within a few records of
+    the first match.
+
+    Args:
+        directory: Where segments are stored
+        segment_bytes: Size at which the writer starts a new segment
+        flush_interval_ms: Longest a record waits in the buffer
+        flush_records: Buffered records that trigger an immediate write
+        fsync: Whether each batch is fsynced before the next is taken
+        enabled: When False, ``record`` does nothing
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 2 ** 20,
+        flush_interval_ms: float = 200,
+        flush_records: int = 512,
+        fsync: bool = False,
+        enabled: bool = True
+    ):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_records = flush_records
+        self.fsync = fsync
+        self.enabled = enabled
+        self.records_written = 0
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_timestamp = 0
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._closing = False
+
+        self._segment: Optional[Path] = None
+        self._file = None
+        self._index = None
+        self._size = 0
+        self._segment_records = 0
+
+    def record(
+        self,
+        content: str,
+        model_version: str,
+        score: float,
+        decision: str,
+        protected_attributes: Optional[Dict[str, Any]] = None,
+        **context
+    ):
+        """
+        Queue one decision for writing.
+
+        Args:
+            content: Resume text; only its hash is stored
+            model_version: Version of the model that made the decision
+            score: Model score (shortlist probability)
+            decision: "shortlist" or "reject"
+            protected_attributes: Attributes the decision was made with
+            **context: Extra JSON-serializable fields, e.g. a resume id
+        """
+        if not self.enabled:
+            return
+        entry = {
+            "timestamp": 0,
+            "content_hash": content_hash(content),
+            "model_version": model_version,
+            "score": float(score),
+            "decision": decision,
+            "protected_attributes": protected_attributes or {},
+            **context
+        }
+        with self._condition:
+            if self._writer is None:
+                self._start()
+            # Timestamps never decrease within a process, so each segment is sorted
+            self._last_timestamp = max(int(time.time() * 1000), self._last_timestamp)
+            entry["timestamp"] = self._last_timestamp
+            self._buffer.append(entry)
+            if len(self._buffer) >= self.flush_records:
+                self._condition.notify()
+
+    def _start(self):
+        self._closing = False
+        self._writer = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: len(self._buffer) >= self.flush_records or self._closing,
+                    timeout=self.flush_interval
+                )
+                closing = self._closing
+            self.flush()
+            if closing:
+                return
+
+    def _open_segment(self, timestamp: int):
+        self._close_segment()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segment = self.directory / f"{timestamp:013d}-{os.getpid()}.jsonl"
+        self._file = open(self._segment, 'ab')
+        self._index = open(self._segment.with_suffix('.idx'), 'ab')
+        self._size = self._file.tell()
+        self._segment_records = 0
+
+    def _close_segment(self):
+        for f in (self._file, self._index):
+            if f is not None:
+                f.close()
+        self._file = self._index = None
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        lines = [
+            (json.dumps(entry, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+            for entry in batch
+        ]
+        try:
+            if self._file is None or self._size >= self.segment_bytes:
+                self._open_segment(batch[0]["timestamp"])
+            index, offset = [], self._size
+            for position, (entry, line) in enumerate(zip(batch, lines), self._segment_records):
+                if position % INDEX_INTERVAL == 0:
+                    index.append(INDEX_ENTRY.pack(entry["timestamp"], offset))
+                offset += len(line)
+            self._file.write(b''.join(lines))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            # Index entries follow the data, so they never point past the segment
+            self._index.write(b''.join(index))
+            self._index.flush()
+            self._size = offset
+            self._segment_records += len(batch)
+            self.records_written += len(batch)
+        except OSError as e:
+            logger.error(f"Failed to write {len(batch)} audit records: {str(e)}")
+            self._close_segment()
+
+    def flush(self):
+        """Write buffered records now."""
+        # Taking the buffer under the write lock keeps batches in timestamp order
+        with self._write_lock:
+            with self._condition:
+                batch, self._buffer = self._buffer, []
+            if batch:
+                self._write(batch)
+
+    def close(self):
+        """Write buffered records and stop the writer thread."""
+        with self._condition:
+            writer = self._writer
+            self._closing = True
+            self._condition.notify()
+        if writer is not None:
+            writer.join()
+        self.flush()
+        with self._write_lock:
+            self._close_segment()
+        self._writer = None
+
+    @staticmethod
+    def _load_index(segment: Path) -> List[Tuple[int, int]]:
+        try:
+            data = segment.with_suffix('.idx').read_bytes()
+        except OSError:
+            return []
+        # Ignore an entry still being written
+        data = data[:len(data) - len(data) % INDEX_ENTRY.size]
+        return list(INDEX_ENTRY.iter_unpack(data))
+
+    @staticmethod
+    def _scan(
+        segment: Path,
+        offset: int,
+        start: Optional[int],
+        end: Optional[int],
+        filters: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        with open(segment, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # A batch still being written
+                    return
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Left behind by a failed write
+                    continue
+                timestamp = entry["timestamp"]
+                if start is not None and timestamp < start:
+                    continue
+                if end is not None and timestamp >= end:
+                    return
+                if all(entry.get(key) == value for key, value in filters.items()):
+                    yield entry
+
+    def segments(self) -> List[Path]:
+        """Segment files of every process, oldest first."""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob('*.jsonl'))
+
+    def read(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        **filters
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Decisions recorded in [start, end), oldest first.
+
+        Args:
+            start: Earliest timestamp (inclusive); naive datetimes are UTC
+            end: Latest timestamp (exclusive)
+            **filters: Top-level fields that must match exactly, e.g.
+                ``decision="reject"`` or ``model_version="..."``
+
+        Returns:
+            Iterator over the matching records, merged across processes
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+
+        by_process: Dict[str, List[Tuple[Path, List[Tuple[int, int]]]]] = {}
+        for segment in self.segments():
+            index = self._load_index(segment)
+            if index:
+                by_process.setdefault(segment.stem.rsplit('-', 1)[1], []).append((segment, index))
+
+        scans = []
+        for segments in by_process.values():
+            for position, (segment, index) in enumerate(segments):
+                if end_ms is not None and index[0][0] >= end_ms:
+                    break
+                following = segments[position + 1][1] if position + 1 < len(segments) else None
+                if start_ms is not None and following and following[0][0] < start_ms:
+                    # A later segment of the same process starts before the range
+                    continue
+                first = 0
+                if start_ms is not None:
+                    # Records sharing a millisecond may straddle index entries,
+                    # so start from the last entry strictly before the range
+                    first = max(0, bisect_left([timestamp for timestamp, _ in index], start_ms) - 1)
+                scans.append(self._scan(segment, index[first][1], start_ms, end_ms, filters))
+
+        return heapq.merge(*scans, key=lambda entry: entry["timestamp"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Writer state and on-disk size."""
+        segments = self.segments()
+        return {
+            "enabled": self.enabled,
+            "records_written": self.records_written,
+            "buffered": len(self._buffer),
+            "segments": len(segments),
+            "bytes": sum(segment.stat().st_size for segment in segments),
+            "current_segment": self._segment.name if self._segment else None
+        }
@@ -99,7 +99,9 @@ def main():
         print("Features extracted successfully")
 
         # Predict
-        decision, confidence, feature_importance = resume_analyzer.predict(resume_data["content"])
+        decision, confidence, feature_importance, model_version = resume_analyzer.predict(
+            resume_data["content"], resume_data["protected_attributes"]
+        )
         print(f"Prediction: {decision} (confidence: {confidence:.2f})")
 
         # Bias detection
@@ -117,6 +119,7 @@ def main():
             "decision": decision,
             "confidence": confidence,
             "feature_importance": feature_importance,
+            "model_version": model_version,
             "bias_metrics": bias_metrics,
             "protected_attributes": resume_data["protected_attributes"],
             "analyzed_at": datetime.utcnow().isoformat()
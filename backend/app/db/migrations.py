@@ -0,0 +1,27 @@
+"""
+Schema migrations with Alembic (see backend/alembic).
+
+``create_all`` only creates missing tables and never alters existing
+ones, so schema changes ship as Alembic revisions instead.
+"""
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+
+from ..core.config import settings
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def alembic_config(database_url: Optional[str] = None) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    config.set_main_option("sqlalchemy.url", (database_url or settings.SQLALCHEMY_DATABASE_URI).replace("%", "%%"))
+    return config
+
+
+def upgrade(database_url: Optional[str] = None, revision: str = "head"):
+    """Migrate the database to ``revision``; defaults to the configured database."""
+    command.upgrade(alembic_config(database_url), revision)
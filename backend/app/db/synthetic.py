@@ -0,0 +1,418 @@
+"""
+Deterministic synthetic resumes with protected attributes and injected bias.
+
+Generates realistic resume texts in the layout of the sample resumes
+(experience entries with date ranges, education, a skills list), each with
+a gender and an age, a latent merit score, the ground-truth ``qualified``
+label it implies, and a historical ``shortlisted`` decision into which
+group disparities can be injected. Because the injected disparity is
+known, the corpus measures how accurately the fairness metrics recover it,
+and because generation streams in fixed-size blocks it scales to millions
+of resumes in constant memory.
+
+Every block of ``BLOCK_SIZE`` resumes draws from its own generator seeded
+with ``(seed, block index)``, so resume ``i`` is the same whatever the
+batch size, the starting offset or the number of processes generating it.
+
+Run from the backend directory:
+
+    python -m app.db.synthetic --count 1000000 --output data/synthetic.jsonl.gz
+    python -m app.db.synthetic --count 100000 --database-url sqlite:///synthetic.db --disparity gender=female:0.8
+"""
+import argparse
+import gzip
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+import numpy as np
+from scipy.special import ndtri
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from ..ml.fairness import age_groups
+from ..models.resume import Resume, Analysis, BiasMetrics
+
+
+BLOCK_SIZE = 10_000
+
+FIRST_NAMES = {
+    'male': ['James', 'Robert', 'Michael', 'David', 'Daniel', 'Ahmed', 'Wei', 'Carlos', 'Kwame', 'Ivan'],
+    'female': ['Mary', 'Jennifer', 'Linda', 'Sarah', 'Emily', 'Fatima', 'Mei', 'Lucia', 'Amara', 'Olga'],
+    'non-binary': ['Alex', 'Jordan', 'Taylor', 'Casey', 'Riley', 'Quinn', 'Avery', 'Sam', 'Jamie', 'Rowan']
+}
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Garcia', 'Chen', 'Okafor', 'Novak', 'Tanaka', 'Patel',
+    'Kowalski', 'Haddad', 'Silva', 'Nguyen', 'Muller', 'Kim', 'Rossi', 'Brown'
+]
+ROLES = [
+    ('Software Engineer', ['python', 'java', 'javascript', 'sql', 'docker', 'aws']),
+    ('Data Scientist', ['python', 'sql', 'pandas', 'numpy', 'scikit-learn', 'tensorflow']),
+    ('Frontend Developer', ['javascript', 'typescript', 'react', 'angular', 'vue']),
+    ('Backend Developer', ['java', 'go', 'postgresql', 'redis', 'kubernetes', 'spring']),
+    ('Machine Learning Engineer', ['python', 'pytorch', 'tensorflow', 'kubernetes', 'gcp']),
+    ('DevOps Engineer', ['docker', 'kubernetes', 'aws', 'azure', 'go', 'terraform']),
+]
+# Roughly in order of popularity, which skill_zipf weights by rank
+SKILLS = [
+    'python', 'sql', 'javascript', 'java', 'aws', 'docker', 'react', 'typescript', 'kubernetes',
+    'machine learning', 'postgresql', 'pandas', 'numpy', 'node.js', 'azure', 'go', 'c++', 'c#',
+    'tensorflow', 'scikit-learn', 'gcp', 'mysql', 'mongodb', 'redis', 'spring', 'django', 'flask',
+    'angular', 'vue', 'pytorch', 'spark', 'airflow', 'terraform', 'statistical analysis', 'php',
+    'ruby', 'kotlin', 'swift', 'rust'
+]
+SENIORITY = ['Junior', '', 'Senior', 'Lead', 'Principal']
+COMPANIES = [
+    'Tech Corp', 'StartupX', 'AI Solutions', 'BigData Inc', 'WebTech', 'AppCo', 'CloudNine',
+    'DataWorks', 'FinServe', 'HealthStack', 'RetailOne', 'LogiChain', 'EduSoft', 'GreenGrid'
+]
+DEGREES = ['BS', 'BS', 'BA', 'MS', 'MS', 'PhD']
+FIELDS = ['Computer Science', 'Software Engineering', 'Mathematics', 'Statistics', 'Data Science', 'Physics']
+INSTITUTIONS = ['University of Technology', 'Tech University', 'State College', 'Tech Institute', 'City University']
+
+# Wording that correlates with a group, so models can learn a proxy for it
+PROXY_PHRASES = {
+    'male': "Captain of the men's rugby team.",
+    'female': "President of the Women in Engineering society.",
+    'non-binary': "Organizer of the campus LGBTQ+ tech meetup."
+}
+
+
+@dataclass(frozen=True)
+class CorpusConfig:
+    """
+    Distributions of a synthetic corpus.
+
+    Args:
+        seed: Seed of the whole corpus
+        gender_distribution: Probability of each gender
+        age_range: Inclusive range of candidate ages
+        experience_median_years: Median years of experience (log-normal)
+        experience_sigma: Spread of log years of experience
+        skills_range: Inclusive range of the number of listed skills
+        skill_zipf: Zipf exponent of skill popularity; 0 makes every skill equally likely
+        qualified_rate: Share of candidates whose merit makes them qualified
+        decision_accuracy: Chance that an unbiased historical decision
+            agrees with the qualified label
+        disparity: Attribute -> group -> multiplier of the shortlist
+            probability; age groups use the labels in
+            app.ml.fairness.AGE_GROUPS. A multiplier of 0.8 injects a
+            disparate impact of 0.8 against that group
+        proxy_strength: Chance that a resume carries wording associated
+            with the candidate's gender
+        as_of: Date that "present" and graduation years are relative to
+    """
+    seed: int = 0
+    gender_distribution: Dict[str, float] = field(
+        default_factory=lambda: {'male': 0.48, 'female': 0.48, 'non-binary': 0.04}
+    )
+    age_range: Tuple[int, int] = (21, 65)
+    experience_median_years: float = 6.0
+    experience_sigma: float = 0.6
+    skills_range: Tuple[int, int] = (3, 10)
+    skill_zipf: float = 1.0
+    qualified_rate: float = 0.4
+    decision_accuracy: float = 0.9
+    disparity: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    proxy_strength: float = 0.0
+    as_of: datetime = datetime(2024, 6, 1)
+
+
+def _shortlist_multiplier(config: CorpusConfig, attributes: Dict[str, np.ndarray]) -> np.ndarray:
+    multiplier = np.ones(len(next(iter(attributes.values()))))
+    for attribute, factors in config.disparity.items():
+        values = attributes[attribute]
+        for group, factor in factors.items():
+            multiplier[values == group] *= factor
+    return multiplier
+
+
+def _resume_text(
+    config: CorpusConfig,
+    gender: str,
+    age: int,
+    experience: float,
+    skills: List[str],
+    proxy: bool,
+    choices: Dict[str, np.ndarray]
+) -> str:
+    """Resume text from one record's attributes and its row of block-level choices."""
+    role, role_skills = ROLES[choices['role']]
+    name = f"{FIRST_NAMES[gender][choices['first_name']]} {LAST_NAMES[choices['last_name']]}"
+    seniority = SENIORITY[min(len(SENIORITY) - 1, int(experience // 4))]
+    title = f"{seniority} {role}".strip()
+
+    # Split the career into one to four consecutive jobs; bounds are
+    # years before as_of and job 0 is the current one
+    jobs = int(choices['jobs']) if experience >= 2 else 1
+    bounds = np.concatenate([[0.0], np.sort(choices['cuts'][:jobs - 1]) * experience, [experience]])
+    lines = [name, title]
+    relevant = [skill for skill in skills if skill in role_skills]
+    summary = f"Summary: {title} with {int(experience)} years of experience"
+    lines.append(f"{summary} in {', '.join(relevant)}." if relevant else f"{summary}.")
+    lines.append("Experience:")
+    for i in range(jobs):
+        start = config.as_of.year - int(round(bounds[i + 1]))
+        end = 'present' if i == 0 else config.as_of.year - int(round(bounds[i]))
+        lines.append(f"- {title if i == 0 else role} at {COMPANIES[choices['companies'][i]]} ({start}-{end})")
+
+    degree = DEGREES[choices['degree']]
+    graduated = config.as_of.year - max(0, age - 22 - (2 if degree == 'MS' else 5 if degree == 'PhD' else 0))
+    lines += [
+        "Education:",
+        f"- {degree} {FIELDS[choices['field']]}, {INSTITUTIONS[choices['institution']]} ({graduated})",
+        "Skills:",
+        ', '.join(skills)
+    ]
+    if proxy:
+        lines += ["Activities:", PROXY_PHRASES[gender]]
+    return '\n'.join(lines)
+
+
+def _generate_block(config: CorpusConfig, block: int, start: int, stop: int) -> List[Dict[str, Any]]:
+    """Resumes ``start`` to ``stop`` (exclusive) of block ``block``."""
+    rng = np.random.default_rng([config.seed, block])
+    size = BLOCK_SIZE
+
+    # Every draw is made for the whole block, so a record does not depend
+    # on which slice of the block is being generated
+    genders = rng.choice(
+        list(config.gender_distribution), size, p=np.array(list(config.gender_distribution.values()))
+    )
+    ages = rng.integers(config.age_range[0], config.age_range[1] + 1, size)
+    log_experience = rng.normal(0.0, 1.0, size)
+    experience = np.minimum(
+        np.exp(np.log(config.experience_median_years) + config.experience_sigma * log_experience),
+        np.maximum(0, ages - 18)
+    )
+    low, high = config.skills_range
+    skill_counts = rng.integers(low, high + 1, size)
+
+    # Skills without replacement, weighted by Zipf popularity: the top-k of
+    # log-weights plus Gumbel noise is a weighted sample without replacement
+    log_popularity = -config.skill_zipf * np.log(np.arange(1, len(SKILLS) + 1))
+    skill_order = np.argsort(-(log_popularity + rng.gumbel(size=(size, len(SKILLS)))), axis=1)
+
+    # Merit mixes skills, experience and noise, standardized to N(0, 1)
+    skill_z = (skill_counts - (low + high) / 2) / max(1.0, np.sqrt(((high - low + 1) ** 2 - 1) / 12))
+    merit = (skill_z + log_experience + rng.normal(0.0, 1.0, size)) / np.sqrt(3)
+    qualified = merit > ndtri(1 - config.qualified_rate)
+
+    probability = np.where(qualified, config.decision_accuracy, 1 - config.decision_accuracy)
+    probability = np.clip(
+        probability * _shortlist_multiplier(config, {'gender': genders, 'age': age_groups(ages)}), 0, 1
+    )
+    shortlisted = rng.random(size) < probability
+    proxies = rng.random(size) < config.proxy_strength
+    confidence = rng.uniform(0.5, 1.0, size)
+
+    choices = {
+        'role': rng.integers(len(ROLES), size=size),
+        'first_name': rng.integers(10, size=size),
+        'last_name': rng.integers(len(LAST_NAMES), size=size),
+        'jobs': rng.integers(1, 5, size=size),
+        'cuts': rng.uniform(0, 1, (size, 3)),
+        'companies': rng.integers(len(COMPANIES), size=(size, 4)),
+        'degree': rng.integers(len(DEGREES), size=size),
+        'field': rng.integers(len(FIELDS), size=size),
+        'institution': rng.integers(len(INSTITUTIONS), size=size)
+    }
+
+    records = []
+    for i in range(start, stop):
+        skills = [SKILLS[j] for j in skill_order[i, :skill_counts[i]]]
+        gender, age, years = str(genders[i]), int(ages[i]), float(experience[i])
+        records.append({
+            'id': block * BLOCK_SIZE + i,
+            'text': _resume_text(
+                config, gender, age, years, skills, bool(proxies[i]),
+                {key: values[i] for key, values in choices.items()}
+            ),
+            'gender': gender,
+            'age': age,
+            'experience_years': round(years, 1),
+            'skills': skills,
+            'merit': float(merit[i]),
+            'qualified': bool(qualified[i]),
+            'shortlisted': bool(shortlisted[i]),
+            'confidence': float(confidence[i])
+        })
+    return records
+
+
+def generate_batches(
+    count: int,
+    config: Optional[CorpusConfig] = None,
+    batch_size: int = BLOCK_SIZE,
+    start: int = 0
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Generate resumes ``start`` to ``start + count`` in batches.
+
+    Args:
+        count: Number of resumes
+        config: Corpus distributions; defaults to CorpusConfig()
+        batch_size: Resumes per yielded batch
+        start: Index of the first resume, for generating slices in parallel
+
+    Yields:
+        Lists of resume records with the text, protected attributes,
+        experience, skills, merit, ``qualified`` label and (possibly
+        biased) ``shortlisted`` decision
+    """
+    config = config or CorpusConfig()
+    batch = []
+    position, stop = start, start + count
+    while position < stop:
+        block = position // BLOCK_SIZE
+        block_stop = min(stop, (block + 1) * BLOCK_SIZE)
+        for record in _generate_block(config, block, position - block * BLOCK_SIZE, block_stop - block * BLOCK_SIZE):
+            batch.append(record)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        position = block_stop
+    if batch:
+        yield batch
+
+
+def generate(count: int, config: Optional[CorpusConfig] = None, start: int = 0) -> Iterator[Dict[str, Any]]:
+    """Generate resume records one at a time; see generate_batches."""
+    for batch in generate_batches(count, config, start=start):
+        yield from batch
+
+
+def write_jsonl(path: str, count: int, config: Optional[CorpusConfig] = None, start: int = 0) -> int:
+    """
+    Stream resume records to a JSON-lines file, gzip-compressed if it ends in ".gz".
+
+    Returns:
+        Number of records written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    opener = gzip.open if path.suffix == '.gz' else open
+    written = 0
+    with opener(path, 'wt', encoding='utf-8') as f:
+        for batch in generate_batches(count, config, start=start):
+            f.writelines(json.dumps(record) + '\n' for record in batch)
+            written += len(batch)
+    return written
+
+
+def bulk_insert(
+    db: Session,
+    count: int,
+    config: Optional[CorpusConfig] = None,
+    batch_size: int = BLOCK_SIZE,
+    start: int = 0
+) -> int:
+    """
+    Insert resumes with their analyses and bias metrics into the database.
+
+    Rows go in with one executemany INSERT per table and batch, committed
+    per batch, so memory stays flat however many resumes are inserted.
+    The historical decision becomes the analysis decision, which is what
+    training from the database (``iter_labeled_batches``) uses as label.
+    Resume ids continue after the largest id already in the table, and
+    creation times are spread over the year before ``config.as_of``.
+
+    Returns:
+        Number of resumes inserted
+    """
+    config = config or CorpusConfig()
+    next_id = (db.query(func.max(Resume.id)).scalar() or 0) + 1
+    inserted = 0
+
+    for batch in generate_batches(count, config, batch_size, start):
+        resumes, analyses, metrics = [], [], []
+        for offset, record in enumerate(batch):
+            resume_id = next_id + inserted + offset
+            created_at = config.as_of - timedelta(minutes=(record['id'] * 7919) % (365 * 24 * 60))
+            decision = "shortlist" if record['shortlisted'] else "reject"
+            resumes.append({
+                'id': resume_id,
+                'filename': f"synthetic_{record['id']}.txt",
+                'content': record['text'],
+                'extracted_features': {
+                    'skills': record['skills'],
+                    'experience': record['experience_years']
+                },
+                'created_at': created_at,
+                'updated_at': created_at
+            })
+            analyses.append({
+                'resume_id': resume_id,
+                'score': record['confidence'] if record['shortlisted'] else 1 - record['confidence'],
+                'decision': decision,
+                'confidence': record['confidence'],
+                'explanation': "Synthetic historical decision",
+                'model_version': "synthetic",
+                'created_at': created_at
+            })
+            metrics.append({
+                'resume_id': resume_id,
+                'protected_attributes': {'gender': record['gender'], 'age': record['age']},
+                'created_at': created_at
+            })
+
+        db.execute(insert(Resume.__table__), resumes)
+        db.execute(insert(Analysis.__table__), analyses)
+        db.execute(insert(BiasMetrics.__table__), metrics)
+        db.commit()
+        inserted += len(batch)
+
+    return inserted
+
+
+def _parse_disparity(values: List[str]) -> Dict[str, Dict[str, float]]:
+    disparity: Dict[str, Dict[str, float]] = {}
+    for value in values:
+        attribute, _, assignment = value.partition('=')
+        group, _, factor = assignment.rpartition(':')
+        disparity.setdefault(attribute, {})[group] = float(factor)
+    return disparity
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start', type=int, default=0, help="Index of the first resume")
+    parser.add_argument('--output', help="JSON-lines file to write; .gz to compress")
+    parser.add_argument('--database-url', help="Insert into this database instead of writing a file")
+    parser.add_argument(
+        '--disparity', nargs='*', default=[],
+        help="Injected disparities as attribute=group:multiplier, e.g. gender=female:0.8 age=55+:0.7"
+    )
+    parser.add_argument('--proxy-strength', type=float, default=0.0)
+    parser.add_argument('--qualified-rate', type=float, default=0.4)
+    args = parser.parse_args()
+
+    config = CorpusConfig(
+        seed=args.seed,
+        disparity=_parse_disparity(args.disparity),
+        proxy_strength=args.proxy_strength,
+        qualified_rate=args.qualified_rate
+    )
+
+    if args.database_url:
+        from sqlalchemy import create_engine
+        from .base import Base
+
+        engine = create_engine(args.database_url)
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            count = bulk_insert(db, args.count, config, start=args.start)
+        print(f"Inserted {count} synthetic resumes into {engine.url.render_as_string(hide_password=True)}")
+    elif args.output:
+        count = write_jsonl(args.output, args.count, config, start=args.start)
+        print(f"Wrote {count} synthetic resumes to {args.output}")
+    else:
+        parser.error("one of --output or --database-url is required")
+
+
+if __name__ == "__main__":
+    main()
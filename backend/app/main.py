@@ -1,15 +1,27 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import json
 from datetime import datetime
-from .ml.model import ResumeAnalyzer
-from .ml.bias import BiasDetector
+from .api.deps import resume_analyzer, bias_detector, prediction_batcher, decision_audit, response_cache
+from .api.routes import admin
+from .api.instrumentation import instrument
+from .api.responses import CompressionMiddleware, FastJSONResponse, FieldSelection, field_selection
+from .core.logging import model_logger, setup_logging, stop_logging
+from .core.config import settings
+from .core.metrics import stage
+from .db import init_db
 from .db.init_db import save_resume, save_analysis
+from .ml.rescoring import shortlist_probability
 import pandas as pd
 import numpy as np
 
-app = FastAPI(title="Resume Analysis API")
+app = FastAPI(title="Resume Analysis API", default_response_class=FastJSONResponse)
+
+# Fields returned by the analysis and list endpoints with view=summary
+ANALYSIS_SUMMARY = ("filename", "decision", "confidence", "model_version", "analyzed_at")
+LIST_SUMMARY = ("filename", "decision", "confidence")
 
 # Configure CORS
 app.add_middleware(
@@ -20,42 +32,90 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize ML models
-resume_analyzer = ResumeAnalyzer()
-bias_detector = BiasDetector()
+# br/gzip for large responses
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Request metrics, Server-Timing headers and the /metrics scrape endpoint
+instrument(app)
+
+# Admin endpoints (model registry and hot-swap)
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+
+@app.on_event("startup")
+async def start_logging():
+    setup_logging()
+
+@app.on_event("startup")
+async def start_chunk_workers():
+    # Spawn the long-document workers now, so loading spaCy in them is not
+    # paid by the first long resume
+    resume_analyzer.chunked_processor.start()
+
+@app.on_event("shutdown")
+async def stop_prediction_batcher():
+    await prediction_batcher.stop()
+    resume_analyzer.chunked_processor.close()
+    decision_audit.close()
+    stop_logging()
+
+@app.get("/api/metrics/inference")
+async def get_inference_metrics():
+    """Micro-batching queue state and batch-size / queue-wait histograms."""
+    return prediction_batcher.stats()
 
 @app.post("/api/analyze-resume")
 async def analyze_resume(
     file: UploadFile = File(...),
     gender: str = None,
-    age: int = None
+    age: int = None,
+    selection: FieldSelection = Depends(field_selection)
 ):
-    """Analyze a resume file and return the results."""
+    """
+    Analyze a resume file and return the results.
+    
+    The full analysis is always saved; ``fields``/``view`` only trim the
+    response.
+    """
     try:
         # Read resume content
-        content = await file.read()
-        content = content.decode('utf-8')
+        with stage("decode"):
+            content = await file.read()
+            content = content.decode('utf-8')
         
         # Save resume file
         filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
-        save_resume(filename, content)
+        with stage("save"):
+            save_resume(filename, content)
         
-        # Extract features
-        features = resume_analyzer.extract_features(content)
+        # Extract features in the threadpool; spaCy would block the event loop
+        features = await run_in_threadpool(resume_analyzer.extract_features, content)
         features["protected_attributes"] = {
             "gender": gender,
             "age": age
         }
         
         # Predict
-        decision, confidence, feature_importance = resume_analyzer.predict(content)
-        
-        # Bias detection
-        bias_metrics = bias_detector.detect_bias(
-            features=pd.DataFrame([features]),
-            predictions=np.array([1 if decision == "shortlist" else 0]),
-            protected_attributes={"gender": gender, "age": age}
+        with stage("predict"):
+            decision, confidence, feature_importance, model_version = await prediction_batcher.predict(
+                content, {"gender": gender, "age": age}
+            )
+        model_logger.info(
+            "%s: %s (confidence %.3f, model %s)", filename, decision, confidence, model_version,
+            extra={"fields": {
+                "resume": filename,
+                "decision": decision,
+                "confidence": confidence,
+                "model_version": model_version
+            }}
         )
+        # Bias detection
+        with stage("bias"):
+            bias_metrics = bias_detector.detect_bias(
+                features=pd.DataFrame([features]),
+                predictions=np.array([1 if decision == "shortlist" else 0]),
+                protected_attributes={"gender": gender, "age": age}
+            )
         
         # Prepare analysis result
         analysis_result = {
@@ -64,6 +124,7 @@ async def analyze_resume(
             "decision": decision,
             "confidence": confidence,
             "feature_importance": feature_importance,
+            "model_version": model_version,
             "bias_metrics": bias_metrics,
             "protected_attributes": {"gender": gender, "age": age},
             "analyzed_at": datetime.utcnow().isoformat()
@@ -71,37 +132,65 @@ async def analyze_resume(
         
         # Save analysis
         analysis_filename = filename.replace('.txt', '_analysis.json')
-        save_analysis(analysis_filename, analysis_result)
+        with stage("file_write"):
+            save_analysis(analysis_filename, analysis_result)
+        
+        # Audited once the analysis is stored, so every entry has a saved decision
+        decision_audit.record(
+            content, model_version, shortlist_probability(decision, confidence), decision,
+            {"gender": gender, "age": age}, resume=filename
+        )
         
-        return analysis_result
+        return selection.respond(analysis_result, ANALYSIS_SUMMARY)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/analysis/{filename}")
-async def get_analysis(filename: str):
-    """Get analysis results for a specific resume."""
+async def get_analysis(
+    filename: str,
+    request: Request,
+    selection: FieldSelection = Depends(field_selection)
+):
+    """
+    Get analysis results for a specific resume.
+    
+    Responses carry a strong ETag and are served from the response cache
+    while the file's mtime and size are unchanged; each field selection
+    is cached separately.
+    """
     try:
         analysis_path = os.path.join(
-            os.path.dirname(__file__),
-            '../../analysis',
+            init_db.ANALYSIS_DIR,
             filename.replace('.txt', '_analysis.json')
         )
         
-        if not os.path.exists(analysis_path):
+        try:
+            stat = os.stat(analysis_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Analysis not found")
-            
-        with open(analysis_path, 'r') as f:
-            return json.load(f)
-            
+        
+        return response_cache.respond(
+            request,
+            ("analysis_file", os.path.normpath(analysis_path), selection),
+            (stat.st_mtime_ns, stat.st_size),
+            lambda: selection.apply(_load_analysis(analysis_path), ANALYSIS_SUMMARY)
+        )
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _load_analysis(path: str):
+    with open(path, 'r') as f:
+        return json.load(f)
+
 @app.get("/api/resumes")
-async def list_resumes():
+async def list_resumes(selection: FieldSelection = Depends(field_selection)):
     """List all analyzed resumes."""
     try:
-        analysis_dir = os.path.join(os.path.dirname(__file__), '../../analysis')
+        analysis_dir = init_db.ANALYSIS_DIR
         resumes = []
         
         for filename in os.listdir(analysis_dir):
@@ -115,7 +204,7 @@ async def list_resumes():
                         "analyzed_at": analysis["analyzed_at"]
                     })
         
-        return resumes
+        return selection.respond(resumes, LIST_SUMMARY)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Adaptive micro-batching of concurrent prediction requests.
+"""
+import asyncio
+import time
+from typing import Dict, List, Tuple, Any, Optional
+
+from ..core.config import settings
+from ..core.logging import logger
+from ..core.metrics import histogram
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent ``predict`` calls into batched model passes.
+
+    Requests are queued and a single worker task drains the queue, scoring
+    each batch with ``ResumeAnalyzer.predict_batch`` in a worker thread so
+    the event loop stays responsive. While a batch is being scored new
+    requests accumulate, so batches grow with load on their own.
+
+    On top of that the worker may hold a batch open for a short window to
+    let more requests join. The window scales with a moving average of the
+    queue depth seen by arriving requests, counting requests still being
+    scored: a lone request is dispatched immediately, and the window only
+    approaches ``max_wait_ms`` when a full batch is regularly in flight.
+
+    Args:
+        analyzer: ResumeAnalyzer that scores the batches
+        max_batch_size: Largest batch sent to the model
+        max_wait_ms: Longest a batch is held open for more requests
+    """
+
+    _DEPTH_SMOOTHING = 0.2
+
+    def __init__(
+        self,
+        analyzer: Any,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size or settings.BATCH_MAX_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.BATCH_MAX_WAIT_MS) / 1000
+        self.depth_average = 0.0
+        self._in_flight = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.batch_sizes = histogram(
+            "inference_batch_size",
+            "Resumes scored per model pass",
+            (1, 2, 4, 8, 16, 32, 64, 128)
+        )
+        self.queue_waits = histogram(
+            "inference_queue_wait_seconds",
+            "Time a prediction request waited before its batch was scored",
+            (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+        )
+
+    async def predict(
+        self,
+        text: str,
+        protected_attributes: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, float, Dict[str, float], str]:
+        """
+        Score one resume as part of the next batch.
+
+        Returns:
+            The same (decision, confidence, feature importance, version)
+            tuple as ``ResumeAnalyzer.predict``
+        """
+        if not settings.BATCHING_ENABLED:
+            return self.analyzer.predict(text, protected_attributes)
+
+        self._ensure_worker()
+        self._in_flight += 1
+        self.depth_average += self._DEPTH_SMOOTHING * (self._in_flight - self.depth_average)
+        try:
+            future = self._loop.create_future()
+            await self._queue.put((text, protected_attributes, future, time.perf_counter()))
+            return await future
+        finally:
+            self._in_flight -= 1
+
+    def window(self) -> float:
+        """Seconds the next batch may be held open, from the average queue depth."""
+        if self.max_batch_size <= 1:
+            return 0.0
+        load = (self.depth_average - 1) / (self.max_batch_size - 1)
+        return self.max_wait * min(1.0, max(0.0, load))
+
+    def stats(self) -> Dict[str, Any]:
+        """Current queue state and batching histograms."""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self._in_flight,
+            "depth_average": self.depth_average,
+            "window_ms": self.window() * 1000,
+            "max_batch_size": self.max_batch_size,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_seconds": self.queue_waits.snapshot()
+        }
+
+    async def stop(self):
+        """Cancel the worker; queued requests fail with CancelledError."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, future, _ = self._queue.get_nowait()
+                future.cancel()
+        self._worker = None
+        self._queue = None
+
+    def _ensure_worker(self):
+        """Start the worker on the running loop the first time it is needed."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _collect(self) -> List[Tuple[str, Any, asyncio.Future, float]]:
+        """Wait for one request, then gather more until the batch is full or the window closes."""
+        batch = [await self._queue.get()]
+        self._drain(batch)
+
+        deadline = self._loop.time() + self.window()
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+            self._drain(batch)
+
+        return batch
+
+    def _drain(self, batch: List):
+        """Move already-queued requests into ``batch`` without waiting."""
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    async def _run(self):
+        """Score batches until cancelled."""
+        while True:
+            batch = await self._collect()
+            batch = [item for item in batch if not item[2].cancelled()]
+            if not batch:
+                continue
+
+            dispatched = time.perf_counter()
+            self.batch_sizes.observe(len(batch))
+            for _, _, _, enqueued in batch:
+                self.queue_waits.observe(dispatched - enqueued)
+
+            texts = [item[0] for item in batch]
+            attributes = [item[1] for item in batch]
+            try:
+                results = await self._loop.run_in_executor(
+                    None, self.analyzer.predict_batch, texts, attributes
+                )
+            except Exception as e:
+                logger.error(f"Batched prediction of {len(batch)} resumes failed: {str(e)}")
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, _, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
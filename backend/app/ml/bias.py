@@ -2,19 +2,18 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 from pathlib import Path
-import json
 import logging
 
 from ..core.config import settings
 from ..core.logging import logger, bias_logger
+from .fairness import age_groups, fairness_metrics, metric_intervals, intersectional_subgroups
+from .mitigation import reweighing_weights, GroupThresholdPostprocessor
+from .fair_classifier import FairLogisticRegression
 
 # Try to import AIF360 components, but don't fail if not available
 try:
     from aif360.datasets import BinaryLabelDataset
-    from aif360.metrics import BinaryLabelDatasetMetric
-    from aif360.algorithms.preprocessing import Reweighing
     from aif360.algorithms.inprocessing import PrejudiceRemover
-    from aif360.algorithms.postprocessing import EqOddsPostprocessing
     AIF360_AVAILABLE = True
 except ImportError:
     logger.warning("AIF360 not available. Bias detection features will be limited.")
@@ -28,8 +27,12 @@ class BiasDetector:
         self.mitigation_techniques = {
             'reweighing': self._apply_reweighing,
             'prejudice_remover': self._apply_prejudice_remover,
-            'equalized_odds': self._apply_equalized_odds
+            'fairness_regularized': self._apply_fairness_regularized,
+            'equalized_odds': self._apply_equalized_odds,
+            'demographic_parity': self._apply_demographic_parity
         }
+        self.postprocessor = None
+        self.fair_classifier = None
         
         if not AIF360_AVAILABLE:
             logger.warning("AIF360 is not available. Some bias detection features will be disabled.")
@@ -54,34 +57,193 @@ class BiasDetector:
     
     def compute_metrics(
         self,
-        dataset: Any,
-        privileged_groups: List[Dict],
-        unprivileged_groups: List[Dict]
+        predictions: np.ndarray,
+        groups: Any,
+        privileged: Any,
+        labels: Optional[np.ndarray] = None
     ) -> Dict[str, float]:
-        """Compute fairness metrics for the dataset."""
-        if not AIF360_AVAILABLE:
-            return {
-                'demographic_parity': 0.0,
-                'equal_opportunity': 0.0,
-                'disparate_impact': 1.0
-            }
+        """
+        Compute fairness metrics directly from decision arrays.
+        
+        Args:
+            predictions: Array of binary predictions (1 for shortlist, 0 for reject)
+            groups: Protected attribute value per prediction
+            privileged: Privileged attribute value, or a list of values
+            labels: Optional ground-truth labels for equal opportunity and
+                average odds
             
-        metrics = BinaryLabelDatasetMetric(
-            dataset,
-            unprivileged_groups=unprivileged_groups,
-            privileged_groups=privileged_groups
+        Returns:
+            Dictionary containing fairness metrics
+        """
+        results = fairness_metrics(predictions, groups, privileged, y_true=labels)
+        
+        # Log metrics
+        bias_logger.info("Fairness metrics", extra={"fields": {"metrics": results}})
+        
+        return results
+    
+    def compute_metric_intervals(
+        self,
+        predictions: np.ndarray,
+        groups: Any,
+        privileged: Any,
+        labels: Optional[np.ndarray] = None,
+        method: Optional[str] = None,
+        n_jobs: int = -1
+    ) -> Dict[str, Any]:
+        """
+        Compute fairness metrics with confidence intervals and threshold alerts.
+        
+        Args:
+            predictions: Array of binary predictions (1 for shortlist, 0 for reject)
+            groups: Protected attribute value per prediction
+            privileged: Privileged attribute value, or a list of values
+            labels: Optional ground-truth labels
+            method: 'bootstrap' or 'analytical'; defaults to settings
+            n_jobs: Cores used for bootstrap resampling
+            
+        Returns:
+            Dictionary with per-group intervals and the metrics whose
+            interval lies entirely outside its bias threshold
+        """
+        intervals = metric_intervals(
+            predictions,
+            groups,
+            privileged,
+            y_true=labels,
+            method=method or settings.BIAS_INTERVAL_METHOD,
+            confidence=settings.BIAS_CONFIDENCE_LEVEL,
+            n_resamples=settings.BIAS_BOOTSTRAP_RESAMPLES,
+            n_jobs=n_jobs
         )
         
-        results = {
-            'demographic_parity': metrics.statistical_parity_difference(),
-            'equal_opportunity': metrics.equal_opportunity_difference(),
-            'disparate_impact': metrics.disparate_impact()
+        alerts = {
+            group: [
+                name for name, interval in group_intervals.items()
+                if self._interval_breaches_threshold(name, interval)
+            ]
+            for group, group_intervals in intervals.items()
         }
+        alerts = {group: names for group, names in alerts.items() if names}
         
-        # Log metrics
-        bias_logger.info(f"Fairness Metrics: {json.dumps(results, indent=2)}")
+        if alerts:
+            bias_logger.warning("Fairness thresholds breached", extra={"fields": {"alerts": alerts}})
         
-        return results
+        return {
+            "intervals": intervals,
+            "alerts": alerts
+        }
+    
+    def _interval_breaches_threshold(self, metric: str, interval: Dict[str, float]) -> bool:
+        """
+        Check whether a whole confidence interval lies outside the threshold.
+        
+        Disparate impact is a ratio and must stay within
+        [threshold, 1 / threshold]. The difference metrics must stay within
+        +/- (1 - threshold), so the same 0.8 setting reads as the
+        four-fifths rule for both kinds.
+        """
+        threshold = settings.BIAS_THRESHOLDS.get(metric)
+        if threshold is None:
+            return False
+        
+        lower, upper = interval["lower"], interval["upper"]
+        if np.isnan(lower) or np.isnan(upper):
+            return False
+        
+        if metric == "disparate_impact":
+            return upper < threshold or lower > 1 / threshold
+        
+        tolerance = 1 - threshold
+        return lower > tolerance or upper < -tolerance
+    
+    def summarize_attribute_intervals(
+        self,
+        predictions: np.ndarray,
+        protected_attributes: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Compute interval summaries for each configured protected attribute.
+        
+        Args:
+            predictions: Array of binary predictions, one per decision
+            protected_attributes: Protected attribute dicts, one per decision
+            
+        Returns:
+            Dictionary of attribute name to interval summary
+        """
+        summaries = {}
+        
+        for attr, config in self.protected_attributes.items():
+            if "privileged" not in config:
+                continue
+            
+            values = np.array(
+                [attributes.get(attr) if attributes else None for attributes in protected_attributes],
+                dtype=object
+            )
+            if attr == "age":
+                values = self._get_age_groups(values)
+            
+            known = pd.notna(values)
+            if not known.any():
+                continue
+            
+            summaries[attr] = self.compute_metric_intervals(
+                predictions[known], values[known], config["privileged"]
+            )
+        
+        return summaries
+    
+    def detect_intersectional_bias(
+        self,
+        predictions: np.ndarray,
+        protected_attributes: pd.DataFrame,
+        labels: Optional[np.ndarray] = None,
+        min_support: Optional[int] = None,
+        top_k: Optional[int] = None,
+        metric: str = 'demographic_parity'
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the most disparate intersections of protected attributes.
+        
+        Args:
+            predictions: Array of binary predictions (1 for shortlist, 0 for reject)
+            protected_attributes: One column per protected attribute, one row
+                per prediction
+            labels: Optional ground-truth labels
+            min_support: Minimum subgroup size; defaults to settings
+            top_k: Number of subgroups to return; defaults to settings
+            metric: Metric used to rank subgroups
+            
+        Returns:
+            Subgroups ranked from most to least disparate
+        """
+        attributes = {}
+        for attr in self.protected_attributes:
+            if attr not in protected_attributes:
+                continue
+            values = protected_attributes[attr]
+            if attr == "age":
+                values = self._get_age_groups(values)
+            attributes[attr] = values
+        
+        if not attributes:
+            return []
+        
+        subgroups = intersectional_subgroups(
+            attributes,
+            predictions,
+            y_true=labels,
+            min_support=min_support or settings.INTERSECTIONAL_MIN_SUPPORT,
+            metric=metric,
+            top_k=top_k or settings.INTERSECTIONAL_TOP_K
+        )
+        
+        if subgroups:
+            bias_logger.info("Most disparate subgroup", extra={"fields": {"subgroup": subgroups[0]}})
+        
+        return subgroups
     
     def detect_bias(
         self,
@@ -192,16 +354,11 @@ class BiasDetector:
     
     def _get_age_group(self, age: int) -> str:
         """Convert age to age group."""
-        if age < 25:
-            return "18-24"
-        elif age < 35:
-            return "25-34"
-        elif age < 45:
-            return "35-44"
-        elif age < 55:
-            return "45-54"
-        else:
-            return "55+"
+        return age_groups([age])[0]
+    
+    def _get_age_groups(self, ages: Any) -> np.ndarray:
+        """Vectorized version of _get_age_group; missing ages stay missing."""
+        return age_groups(ages)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get the latest bias metrics."""
@@ -213,69 +370,171 @@ class BiasDetector:
         labels: np.ndarray,
         protected_attributes: Dict[str, Any],
         technique: str = 'reweighing'
-    ) -> Tuple[pd.DataFrame, np.ndarray]:
-        """Apply bias mitigation technique."""
+    ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """
+        Apply bias mitigation technique.
+        
+        Returns:
+            Mitigated features, labels and per-row sample weights
+        """
         if technique not in self.mitigation_techniques:
             raise ValueError(f"Unknown mitigation technique: {technique}")
         
-        # Create dataset
-        dataset = self.create_dataset(
+        # Apply mitigation
+        mitigated_features, mitigated_labels, sample_weight = self.mitigation_techniques[technique](
             features,
             labels,
-            list(protected_attributes.keys())
-        )
-        
-        # Apply mitigation
-        mitigated_features, mitigated_labels = self.mitigation_techniques[technique](
-            dataset,
             protected_attributes
         )
         
         bias_logger.info(f"Applied bias mitigation technique: {technique}")
         
-        return mitigated_features, mitigated_labels
+        return mitigated_features, mitigated_labels, sample_weight
+    
+    def compute_sample_weights(
+        self,
+        labels: np.ndarray,
+        protected_attributes: pd.DataFrame
+    ) -> np.ndarray:
+        """
+        Compute reweighing sample weights for training.
+        
+        Args:
+            labels: Training labels (1 for shortlist, 0 for reject)
+            protected_attributes: One column per protected attribute, one row
+                per training example
+            
+        Returns:
+            Array of weights to pass as ``ResumeAnalyzer.train(sample_weight=...)``
+        """
+        columns = protected_attributes.copy()
+        if "age" in columns:
+            columns["age"] = self._get_age_groups(columns["age"])
+        
+        return reweighing_weights(self._joint_groups(columns, list(columns.columns)), labels)
+    
+    def _joint_groups(self, features: pd.DataFrame, attributes: List[str]) -> np.ndarray:
+        """Encode the combination of protected attribute columns as one group id."""
+        if len(attributes) == 1:
+            return features[attributes[0]].to_numpy()
+        return features.groupby(attributes, dropna=False, sort=False).ngroup().to_numpy()
     
     def _apply_reweighing(
         self,
-        dataset: BinaryLabelDataset,
+        features: pd.DataFrame,
+        labels: np.ndarray,
         protected_attributes: Dict[str, Any]
-    ) -> Tuple[pd.DataFrame, np.ndarray]:
+    ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
         """Apply reweighing preprocessing technique."""
-        privileged_groups = [{attr: 1} for attr in protected_attributes]
-        unprivileged_groups = [{attr: 0} for attr in protected_attributes]
-        
-        rw = Reweighing(
-            unprivileged_groups=unprivileged_groups,
-            privileged_groups=privileged_groups
-        )
-        transformed_dataset = rw.fit_transform(dataset)
+        sample_weight = self.compute_sample_weights(labels, features[list(protected_attributes)])
         
-        return transformed_dataset.features, transformed_dataset.labels
+        return features, np.asarray(labels), sample_weight
     
     def _apply_prejudice_remover(
         self,
-        dataset: BinaryLabelDataset,
+        features: pd.DataFrame,
+        labels: np.ndarray,
         protected_attributes: Dict[str, Any]
-    ) -> Tuple[pd.DataFrame, np.ndarray]:
+    ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
         """Apply prejudice remover inprocessing technique."""
+        dataset = self._require_dataset(features, labels, protected_attributes)
         pr = PrejudiceRemover(eta=0.1)
         transformed_dataset = pr.fit_transform(dataset)
         
-        return transformed_dataset.features, transformed_dataset.labels
+        return (
+            transformed_dataset.features,
+            transformed_dataset.labels,
+            transformed_dataset.instance_weights
+        )
+    
+    def _apply_fairness_regularized(
+        self,
+        features: pd.DataFrame,
+        labels: np.ndarray,
+        protected_attributes: Dict[str, Any]
+    ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """
+        Apply the native fairness-regularized logistic model (inprocessing).
+        
+        Trains on the non-protected columns with a penalty on the covariance
+        between scores and the protected group, and returns its predictions
+        as the mitigated labels. The fitted model is kept on
+        ``self.fair_classifier``.
+        """
+        attributes = list(protected_attributes)
+        groups = self._joint_groups(features, attributes)
+        
+        self.fair_classifier = FairLogisticRegression(eta=settings.FAIRNESS_PENALTY)
+        X = features.drop(columns=attributes)
+        self.fair_classifier.fit(X.to_numpy(dtype=np.float64), labels, sensitive=groups)
+        
+        predictions = self.fair_classifier.predict(X.to_numpy(dtype=np.float64))
+        return features, predictions, np.ones(len(predictions))
     
     def _apply_equalized_odds(
         self,
-        dataset: BinaryLabelDataset,
+        features: pd.DataFrame,
+        labels: np.ndarray,
         protected_attributes: Dict[str, Any]
-    ) -> Tuple[pd.DataFrame, np.ndarray]:
+    ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
         """Apply equalized odds postprocessing technique."""
-        privileged_groups = [{attr: 1} for attr in protected_attributes]
-        unprivileged_groups = [{attr: 0} for attr in protected_attributes]
+        return self._apply_group_thresholds(features, labels, protected_attributes, 'equalized_odds')
+    
+    def _apply_demographic_parity(
+        self,
+        features: pd.DataFrame,
+        labels: np.ndarray,
+        protected_attributes: Dict[str, Any]
+    ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """Apply demographic parity postprocessing technique."""
+        return self._apply_group_thresholds(features, labels, protected_attributes, 'demographic_parity')
+    
+    def _apply_group_thresholds(
+        self,
+        features: pd.DataFrame,
+        labels: np.ndarray,
+        protected_attributes: Dict[str, Any],
+        constraint: str
+    ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """
+        Fit per-group decision thresholds on the model scores.
+        
+        ``features`` must hold a 'score' column with the model's shortlist
+        probability and a column for the one protected attribute. The fitted post-processor is kept on
+        ``self.postprocessor`` so it can be attached to the model; the
+        returned labels are the post-processed decisions.
+        """
+        if "score" not in features:
+            raise ValueError("Threshold post-processing requires a 'score' column")
+        if len(protected_attributes) != 1:
+            raise ValueError("Threshold post-processing supports a single protected attribute")
         
-        eqo = EqOddsPostprocessing(
-            unprivileged_groups=unprivileged_groups,
-            privileged_groups=privileged_groups
+        attribute = next(iter(protected_attributes))
+        groups = features[attribute].to_numpy()
+        
+        self.postprocessor = GroupThresholdPostprocessor(attribute, constraint).fit(
+            features["score"].to_numpy(), groups, labels
+        )
+        bias_logger.info(
+            "Fitted %s thresholds", constraint,
+            extra={"fields": {"thresholds": self.postprocessor.thresholds}}
         )
-        transformed_dataset = eqo.fit_transform(dataset)
         
-        return transformed_dataset.features, transformed_dataset.labels 
\ No newline at end of file
+        decisions = self.postprocessor.predict(features["score"].to_numpy(), groups)
+        return features, decisions, np.ones(len(decisions))
+    
+    def _require_dataset(
+        self,
+        features: pd.DataFrame,
+        labels: np.ndarray,
+        protected_attributes: Dict[str, Any]
+    ) -> Any:
+        """Build an AIF360 dataset for the techniques that still need one."""
+        if not AIF360_AVAILABLE:
+            raise RuntimeError("This mitigation technique requires AIF360")
+        
+        return self.create_dataset(
+            features.assign(decision=labels),
+            labels,
+            list(protected_attributes.keys())
+        ) 
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+Chunked, parallel spaCy processing for very long resumes.
+"""
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+from typing import Dict, List, Tuple, Any, Optional, Sequence
+
+from ..core.logging import logger
+from .preprocessing import normalize_text
+
+
+SECTION_BREAK = re.compile(r'\n[ \t]*\n\s*')
+SENTENCE_END = re.compile(r'(?<=[.!?;])\s+')
+WHITESPACE = re.compile(r'\s+')
+
+
+def _last_boundary(pattern: re.Pattern, text: str, start: int, stop: int) -> Optional[int]:
+    """End offset of the last ``pattern`` match inside ``text[start:stop]``."""
+    end = None
+    for match in pattern.finditer(text, start, stop):
+        if match.end() < stop:
+            end = match.end()
+    return end
+
+
+def split_into_chunks(text: str, max_chars: int) -> List[str]:
+    """
+    Split a document into consecutive chunks of at most ``max_chars``.
+
+    Each cut is made at the last section break (a blank line) in the
+    window when that keeps the chunk at least half full, otherwise at the
+    last sentence end, then the last whitespace, and only as a last resort
+    mid-word. Chunks are exact substrings, so joining them gives the
+    original text back.
+    """
+    chunks = []
+    start = 0
+    while len(text) - start > max_chars:
+        stop = start + max_chars
+        cut = _last_boundary(SECTION_BREAK, text, start, stop)
+        if cut is None or cut - start < max_chars // 2:
+            cut = (
+                _last_boundary(SENTENCE_END, text, start, stop)
+                or _last_boundary(WHITESPACE, text, start, stop)
+                or stop
+            )
+        chunks.append(text[start:cut])
+        start = cut
+    if start < len(text):
+        chunks.append(text[start:])
+    return chunks
+
+
+def process_chunk(
+    nlp: Any,
+    chunk: str,
+    disable: Sequence[str],
+    with_entities: bool
+) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Lemmatize one chunk and optionally extract its entities.
+
+    Lemmas come from the normalized chunk, as in ``preprocess_text``;
+    entities come from the raw chunk, as in ``extract_features``.
+    """
+    doc = nlp(normalize_text(chunk), disable=list(disable))
+    lemmatized = ' '.join([token.lemma_ for token in doc])
+    entities = [(ent.label_, ent.text) for ent in nlp(chunk).ents] if with_entities else []
+    return lemmatized, entities
+
+
+# Worker-process state, set up once per process by _init_worker
+_worker_nlp = None
+_worker_barrier = None
+
+# Longest a warm-up task waits for the other workers to load the model
+WARMUP_TIMEOUT_SECONDS = 300
+
+
+def _init_worker(model_name: str, barrier: Any):
+    global _worker_nlp, _worker_barrier
+    import spacy
+    _worker_nlp = spacy.load(model_name)
+    _worker_barrier = barrier
+
+
+def _process_chunk_in_worker(chunk: str, disable: Sequence[str], with_entities: bool):
+    return process_chunk(_worker_nlp, chunk, disable, with_entities)
+
+
+def _warm_worker():
+    """
+    Warm-up task, one per worker.
+
+    Waiting at the barrier until every worker holds one keeps a fast
+    worker from taking several, so all warm-up tasks are done only once
+    every worker has loaded the model.
+    """
+    try:
+        _worker_barrier.wait(WARMUP_TIMEOUT_SECONDS)
+    except threading.BrokenBarrierError:
+        pass
+
+
+class ChunkedProcessor:
+    """
+    Processes long documents as chunks across a persistent process pool.
+
+    Worker processes are started with the ``spawn`` method, each loading
+    the spaCy model once, and are reused across documents. Call
+    :meth:`start` at application startup so they are ready before the
+    first long document; otherwise the first document starts them. The
+    per-document budget only starts once every worker has loaded the
+    model. Chunks are submitted in document order and collected against
+    that deadline: once the budget is spent the remaining chunks are cancelled
+    and the result is marked truncated, so a single huge CV cannot hold a
+    request for longer than the budget. Chunks already handed to a worker
+    cannot be cancelled; they finish in the background and are discarded.
+
+    Args:
+        nlp: In-process pipeline, used when ``max_workers`` is 1 or less
+        model_name: spaCy model the worker processes load
+        max_chars: Largest chunk, in characters
+        max_workers: Worker processes; 1 or less processes chunks in-process
+    """
+
+    def __init__(self, nlp: Any, model_name: str, max_chars: int, max_workers: int):
+        self.nlp = nlp
+        self.model_name = model_name
+        self.max_chars = max_chars
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._warmup: List[Any] = []
+        self._pool_lock = threading.Lock()
+
+    def start(self):
+        """Start the worker processes in the background, without waiting for them."""
+        if self.max_workers > 1:
+            self._get_pool()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until every worker has loaded the model; False on timeout."""
+        if self.max_workers <= 1:
+            return True
+        self._get_pool()
+        return not wait(self._warmup, timeout).not_done
+
+    def process(
+        self,
+        text: str,
+        disable: Sequence[str] = (),
+        with_entities: bool = False,
+        budget_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Lemmatize a long document chunk by chunk and merge the results.
+
+        Args:
+            text: Raw document
+            disable: Pipeline components to skip when lemmatizing
+            with_entities: Also run NER on the raw chunks
+            budget_seconds: Hard time limit for the whole document, not
+                counting worker start-up; None for no limit
+
+        Returns:
+            Dictionary with the merged lemmatized text, entities as
+            (label, text) pairs in document order, chunk counts, whether
+            the budget truncated the document, and elapsed seconds
+        """
+        chunks = split_into_chunks(text, self.max_chars)
+
+        # Spawning workers and loading the model is not charged to the document
+        self.wait_ready()
+        start = time.monotonic()
+        deadline = start + budget_seconds if budget_seconds is not None else None
+
+        if self.max_workers > 1:
+            try:
+                results = self._process_in_pool(chunks, disable, with_entities, deadline)
+            except BrokenProcessPool:
+                logger.warning("Chunk worker pool broke; processing in-process")
+                self.close()
+                results = self._process_in_process(chunks, disable, with_entities, deadline)
+        else:
+            results = self._process_in_process(chunks, disable, with_entities, deadline)
+
+        truncated = len(results) < len(chunks)
+        elapsed = time.monotonic() - start
+        if truncated:
+            logger.warning(
+                f"Long document truncated by {budget_seconds}s budget: "
+                f"{len(results)}/{len(chunks)} chunks processed"
+            )
+
+        return {
+            'lemmatized': ' '.join(lemmas for lemmas, _ in results if lemmas),
+            'entities': [entity for _, entities in results for entity in entities],
+            'chunks': len(chunks),
+            'processed_chunks': len(results),
+            'truncated': truncated,
+            'seconds': elapsed
+        }
+
+    def _process_in_process(self, chunks, disable, with_entities, deadline) -> List[Tuple[str, List]]:
+        results = []
+        for chunk in chunks:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            results.append(process_chunk(self.nlp, chunk, disable, with_entities))
+        return results
+
+    def _process_in_pool(self, chunks, disable, with_entities, deadline) -> List[Tuple[str, List]]:
+        pool = self._get_pool()
+        futures = [
+            pool.submit(_process_chunk_in_worker, chunk, list(disable), with_entities)
+            for chunk in chunks
+        ]
+
+        results = []
+        try:
+            for future in futures:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                results.append(future.result(timeout=timeout))
+        except FutureTimeoutError:
+            pass
+        finally:
+            for future in futures[len(results):]:
+                future.cancel()
+        return results
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                context = multiprocessing.get_context('spawn')
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.model_name, context.Barrier(self.max_workers))
+                )
+                self._warmup = [self._pool.submit(_warm_worker) for _ in range(self.max_workers)]
+            return self._pool
+
+    def close(self):
+        """Shut the worker pool down; it is restarted on next use."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                self._warmup = []
@@ -0,0 +1,146 @@
+"""
+Array-compiled random forest evaluator for low-latency inference.
+"""
+import numpy as np
+from scipy import sparse
+from sklearn.ensemble import RandomForestClassifier
+from typing import Any, Optional
+
+
+class CompiledForest:
+    """
+    A fitted RandomForestClassifier flattened into contiguous node arrays.
+
+    ``RandomForestClassifier.predict_proba`` validates its input and
+    dispatches every tree through joblib, which for a single resume costs
+    far more than the traversal itself. Here all trees share one set of
+    node arrays and are walked together, one vectorized step per tree
+    level, so a prediction is a handful of NumPy operations.
+
+    Results are bit-identical to scikit-learn: inputs are compared as
+    float32 against the float64 split thresholds, leaves carry the same
+    class fractions as ``tree_.value``, per-tree probabilities are summed
+    in estimator order starting from zero, and the sum is divided by the
+    number of trees.
+
+    Args:
+        forest: Fitted single-output RandomForestClassifier
+        chunk_size: Rows evaluated at once; bounds the dense scratch buffer
+    """
+
+    _COMPACT_EVERY = 8
+
+    def __init__(self, forest: RandomForestClassifier, chunk_size: int = 256):
+        if forest.n_outputs_ != 1:
+            raise ValueError("Only single-output forests can be compiled")
+
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        feature, threshold, left, right, missing_left, value = [], [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+
+            # Leaves point back at themselves, so walking past one is a no-op
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+            missing_left.append(
+                tree.missing_go_to_left.astype(bool)
+                if hasattr(tree, 'missing_go_to_left')
+                else np.zeros(tree.node_count, dtype=bool)
+            )
+            value.append(tree.value[:, 0, :forest.n_classes_])
+
+        self.feature = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold).astype(np.float64)
+        self.left = np.concatenate(left).astype(np.intp)
+        self.right = np.concatenate(right).astype(np.intp)
+        self.missing_left = np.concatenate(missing_left)
+        self.value = np.ascontiguousarray(np.concatenate(value), dtype=np.float64)
+        self.roots = offsets.astype(np.intp)
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        self.n_estimators = len(trees)
+        self.n_features_in_ = forest.n_features_in_
+        self.classes_ = forest.classes_
+        self.chunk_size = chunk_size
+
+    def _dense(self, X: Any) -> np.ndarray:
+        """Input rows as a float32 array, the dtype scikit-learn's trees compare."""
+        if sparse.issparse(X):
+            return X.astype(np.float32).toarray()
+        return np.atleast_2d(np.asarray(X, dtype=np.float32))
+
+    def apply(self, X: Any) -> np.ndarray:
+        """
+        Leaf reached in every tree.
+
+        All (tree, row) pairs advance one level per step. Pairs that have
+        reached a leaf are dropped every few steps, so deep outlier trees
+        do not keep the whole forest walking.
+
+        Returns:
+            Global node indices of shape (n_estimators, n_samples)
+        """
+        X = self._dense(X)
+        n_samples, n_features = X.shape
+        values = X.ravel()
+        has_missing = np.isnan(values).any()
+
+        # Flat offset of each pair's row in ``values``, and its current node
+        row_offset = np.tile(np.arange(n_samples) * n_features, self.n_estimators)
+        node = np.repeat(self.roots, n_samples)
+        leaves = node.copy()
+        pending = np.arange(node.size)
+
+        for depth in range(1, self.max_depth + 1):
+            x = values[row_offset + self.feature[node]]
+            go_left = x <= self.threshold[node]
+            if has_missing:
+                go_left = np.where(np.isnan(x), self.missing_left[node], go_left)
+            next_node = np.where(go_left, self.left[node], self.right[node])
+
+            if depth % self._COMPACT_EVERY == 0:
+                moving = next_node != node
+                if not moving.all():
+                    leaves[pending] = next_node
+                    pending, next_node, row_offset = (
+                        pending[moving], next_node[moving], row_offset[moving]
+                    )
+            node = next_node
+            if pending.size == 0:
+                break
+
+        leaves[pending] = node
+        return leaves.reshape(self.n_estimators, n_samples)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Class probabilities, identical to the source forest's."""
+        if not sparse.issparse(X):
+            X = np.atleast_2d(X)
+        n_samples = X.shape[0]
+        proba = np.empty((n_samples, len(self.classes_)), dtype=np.float64)
+
+        for start in range(0, n_samples, self.chunk_size):
+            stop = min(start + self.chunk_size, n_samples)
+            per_tree = self.value[self.apply(X[start:stop])]
+
+            # A running sum is sequential in tree order, as the forest adds them
+            proba[start:stop] = np.cumsum(per_tree, axis=0)[-1] / self.n_estimators
+
+        return proba
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Most probable class per row."""
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+
+def compile_classifier(classifier: Any) -> Optional[CompiledForest]:
+    """Compiled evaluator for a classifier, or None when it has no compiled form."""
+    if isinstance(classifier, RandomForestClassifier) and hasattr(classifier, 'estimators_'):
+        return CompiledForest(classifier)
+    return None
@@ -0,0 +1,496 @@
+"""
+Native fairness metrics computed from group-wise confusion counts.
+
+Every metric here is derived from a ``(n_groups, 4)`` table of
+``[tn, fp, fn, tp]`` counts built with a single ``np.bincount`` pass, so
+evaluating millions of decisions never materializes an AIF360 dataset.
+The count helpers broadcast over leading axes, which lets callers score
+many resampled or subgroup tables in one vectorized call.
+"""
+import warnings
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Any, Optional
+
+# Column layout of a confusion-count table
+TN, FP, FN, TP = 0, 1, 2, 3
+
+# Age bins used wherever ages are grouped
+AGE_GROUP_BOUNDS = (25, 35, 45, 55)
+AGE_GROUPS = ("18-24", "25-34", "35-44", "45-54", "55+")
+
+
+def age_groups(ages: Any) -> np.ndarray:
+    """Age group label per age; missing or non-numeric ages map to None."""
+    try:
+        ages = np.asarray(ages, dtype=float)
+    except (TypeError, ValueError):
+        ages = pd.to_numeric(pd.Series(ages), errors='coerce').to_numpy(dtype=float)
+    labels = np.array(AGE_GROUPS + (None,), dtype=object)
+    bins = np.digitize(ages, AGE_GROUP_BOUNDS)
+    bins[np.isnan(ages)] = len(AGE_GROUPS)
+    return labels[bins]
+
+
+def encode_groups(groups: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Dictionary-encode group labels into dense integer codes.
+
+    Returns the codes and the array of unique labels they index into.
+    Missing values are encoded as -1.
+    """
+    codes, uniques = pd.factorize(np.asarray(groups), sort=True)
+    return codes.astype(np.int64, copy=False), np.asarray(uniques)
+
+
+def confusion_counts(
+    codes: np.ndarray,
+    y_pred: np.ndarray,
+    y_true: Optional[np.ndarray] = None,
+    n_groups: Optional[int] = None
+) -> np.ndarray:
+    """Count ``[tn, fp, fn, tp]`` per group in one bincount pass.
+
+    Rows with a negative group code are ignored. When ``y_true`` is not
+    given the predictions are treated as the labels, so only selection
+    rates are meaningful.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    y_pred = np.asarray(y_pred).astype(np.int64, copy=False)
+    y_true = y_pred if y_true is None else np.asarray(y_true).astype(np.int64, copy=False)
+
+    if n_groups is None:
+        n_groups = int(codes.max()) + 1 if codes.size else 0
+
+    valid = codes >= 0
+    if not valid.all():
+        codes, y_pred, y_true = codes[valid], y_pred[valid], y_true[valid]
+
+    keys = codes * 4 + y_true * 2 + y_pred
+    return np.bincount(keys, minlength=n_groups * 4).reshape(n_groups, 4)
+
+
+def group_rates(counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """Selection rate, TPR and FPR for count tables of shape ``(..., 4)``."""
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum(axis=-1)
+    positives = counts[..., FN] + counts[..., TP]
+    negatives = counts[..., TN] + counts[..., FP]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'selection_rate': (counts[..., FP] + counts[..., TP]) / total,
+            'tpr': counts[..., TP] / positives,
+            'fpr': counts[..., FP] / negatives
+        }
+
+
+def metrics_from_counts(
+    unprivileged: np.ndarray,
+    privileged: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Compare unprivileged against privileged count tables.
+
+    Definitions follow AIF360: every metric is ``unprivileged - privileged``
+    except disparate impact, which is the ratio of selection rates.
+    """
+    unpriv = group_rates(unprivileged)
+    priv = group_rates(privileged)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'demographic_parity': unpriv['selection_rate'] - priv['selection_rate'],
+            'disparate_impact': unpriv['selection_rate'] / priv['selection_rate'],
+            'equal_opportunity': unpriv['tpr'] - priv['tpr'],
+            'average_odds': 0.5 * (
+                (unpriv['fpr'] - priv['fpr']) + (unpriv['tpr'] - priv['tpr'])
+            )
+        }
+
+
+def _privileged_mask(uniques: np.ndarray, privileged: Any) -> np.ndarray:
+    """Boolean mask over ``uniques`` marking the privileged labels."""
+    if isinstance(privileged, (list, tuple, set, np.ndarray)):
+        privileged = list(privileged)
+    else:
+        privileged = [privileged]
+    return np.isin(uniques, privileged)
+
+
+def _to_floats(metrics: Dict[str, np.ndarray], has_labels: bool) -> Dict[str, float]:
+    """Convert scalar metric arrays to plain floats for logging and JSON."""
+    keys = ['demographic_parity', 'disparate_impact']
+    if has_labels:
+        keys += ['equal_opportunity', 'average_odds']
+    return {key: float(metrics[key]) for key in keys}
+
+
+def fairness_metrics(
+    y_pred: np.ndarray,
+    groups: Any,
+    privileged: Any,
+    y_true: Optional[np.ndarray] = None
+) -> Dict[str, float]:
+    """
+    Compute fairness metrics for privileged vs. all other groups.
+
+    Args:
+        y_pred: Binary predictions (1 for shortlist, 0 for reject)
+        groups: Group label per row, any hashable encoding
+        privileged: Privileged label, or a list of labels
+        y_true: Optional ground-truth labels; required for equal
+            opportunity and average odds
+
+    Returns:
+        Dictionary of metric name to value, matching AIF360's
+        statistical parity difference, disparate impact, equal
+        opportunity difference and average odds difference
+    """
+    codes, uniques = encode_groups(groups)
+    counts = confusion_counts(codes, y_pred, y_true, n_groups=len(uniques))
+    mask = _privileged_mask(uniques, privileged)
+
+    metrics = metrics_from_counts(counts[~mask].sum(axis=0), counts[mask].sum(axis=0))
+    return _to_floats(metrics, y_true is not None)
+
+
+def per_group_metrics(
+    y_pred: np.ndarray,
+    groups: Any,
+    privileged: Any,
+    y_true: Optional[np.ndarray] = None
+) -> Dict[str, Dict[str, float]]:
+    """Compute fairness metrics for each unprivileged group separately.
+
+    Each group is compared against the pooled privileged groups, so a
+    disparity confined to one group is not averaged away.
+    """
+    codes, uniques = encode_groups(groups)
+    counts = confusion_counts(codes, y_pred, y_true, n_groups=len(uniques))
+    mask = _privileged_mask(uniques, privileged)
+
+    metrics = metrics_from_counts(counts[~mask], counts[mask].sum(axis=0))
+    results = {}
+    for i, label in enumerate(uniques[~mask]):
+        results[str(label)] = _to_floats(
+            {key: value[i] for key, value in metrics.items()},
+            y_true is not None
+        )
+        results[str(label)]['total'] = int(counts[~mask][i].sum())
+    return results
+
+
+METRIC_NAMES = ['demographic_parity', 'disparate_impact', 'equal_opportunity', 'average_odds']
+
+
+def _bootstrap_chunk(
+    counts: np.ndarray,
+    mask: np.ndarray,
+    n_resamples: int,
+    seed: np.random.SeedSequence
+) -> Dict[str, np.ndarray]:
+    """Resample per-group count tables and score every replicate.
+
+    Each group keeps its observed size and draws a multinomial over its
+    four confusion cells, which is equivalent to a stratified row
+    bootstrap without touching the rows.
+    """
+    rng = np.random.default_rng(seed)
+    sizes = counts.sum(axis=1)
+    probabilities = counts / np.maximum(sizes, 1)[:, None]
+
+    # (n_resamples, n_groups, 4)
+    resampled = rng.multinomial(sizes, probabilities, size=(n_resamples, len(counts)))
+    privileged = resampled[:, mask].sum(axis=1)
+
+    overall = metrics_from_counts(resampled[:, ~mask].sum(axis=1), privileged)
+    groups = metrics_from_counts(resampled[:, ~mask], privileged[:, None, :])
+    return {
+        name: np.concatenate([overall[name][:, None], groups[name]], axis=1)
+        for name in METRIC_NAMES
+    }
+
+
+def bootstrap_intervals(
+    counts: np.ndarray,
+    mask: np.ndarray,
+    n_resamples: int = 2000,
+    confidence: float = 0.95,
+    n_jobs: int = -1,
+    seed: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """Percentile bootstrap intervals from a per-group count table.
+
+    Resamples are split into chunks and scored across cores with joblib.
+
+    Returns:
+        Dictionary of metric name to a ``(2, 1 + n_unprivileged)`` array of
+        lower/upper bounds; column 0 is the pooled comparison and the
+        remaining columns follow the unprivileged groups in order.
+    """
+    from joblib import Parallel, delayed, effective_n_jobs
+
+    n_chunks = max(1, min(effective_n_jobs(n_jobs), n_resamples // 250 or 1))
+    chunk_sizes = [len(chunk) for chunk in np.array_split(np.arange(n_resamples), n_chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    if n_chunks == 1:
+        chunks = [_bootstrap_chunk(counts, mask, chunk_sizes[0], seeds[0])]
+    else:
+        chunks = Parallel(n_jobs=n_chunks)(
+            delayed(_bootstrap_chunk)(counts, mask, size, chunk_seed)
+            for size, chunk_seed in zip(chunk_sizes, seeds)
+        )
+
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for name in METRIC_NAMES:
+        replicates = np.concatenate([chunk[name] for chunk in chunks], axis=0)
+        replicates[~np.isfinite(replicates)] = np.nan
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            intervals[name] = np.nanquantile(replicates, [alpha, 1 - alpha], axis=0)
+    return intervals
+
+
+def analytical_intervals(
+    counts: np.ndarray,
+    mask: np.ndarray,
+    confidence: float = 0.95
+) -> Dict[str, np.ndarray]:
+    """Normal-approximation intervals from a per-group count table.
+
+    Differences use Wald standard errors; disparate impact uses the delta
+    method on the log ratio. Same layout as :func:`bootstrap_intervals`.
+    """
+    from statistics import NormalDist
+
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    counts = counts.astype(np.float64)
+    privileged = counts[mask].sum(axis=0)
+    unprivileged = np.vstack([counts[~mask].sum(axis=0), counts[~mask]])
+
+    def proportion(successes, totals):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p = successes / totals
+            return p, p * (1 - p) / totals
+
+    def cells(table, numerator, denominator):
+        return proportion(
+            table[..., numerator].sum(axis=-1), table[..., denominator].sum(axis=-1)
+        )
+
+    selection = ([FP, TP], [TN, FP, FN, TP])
+    tpr = ([TP], [FN, TP])
+    fpr = ([FP], [TN, FP])
+
+    sel_u, sel_u_var = cells(unprivileged, *selection)
+    sel_p, sel_p_var = cells(privileged, *selection)
+    tpr_u, tpr_u_var = cells(unprivileged, *tpr)
+    tpr_p, tpr_p_var = cells(privileged, *tpr)
+    fpr_u, fpr_u_var = cells(unprivileged, *fpr)
+    fpr_p, fpr_p_var = cells(privileged, *fpr)
+
+    def around(estimate, variance):
+        margin = z * np.sqrt(variance)
+        return np.vstack([estimate - margin, estimate + margin])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_di = np.log(sel_u / sel_p)
+        log_di_var = sel_u_var / sel_u ** 2 + sel_p_var / sel_p ** 2
+        odds = 0.5 * ((fpr_u - fpr_p) + (tpr_u - tpr_p))
+        odds_var = 0.25 * (fpr_u_var + fpr_p_var + tpr_u_var + tpr_p_var)
+
+        return {
+            'demographic_parity': around(sel_u - sel_p, sel_u_var + sel_p_var),
+            'disparate_impact': np.exp(around(log_di, log_di_var)),
+            'equal_opportunity': around(tpr_u - tpr_p, tpr_u_var + tpr_p_var),
+            'average_odds': around(odds, odds_var)
+        }
+
+
+def metric_intervals(
+    y_pred: np.ndarray,
+    groups: Any,
+    privileged: Any,
+    y_true: Optional[np.ndarray] = None,
+    method: str = 'bootstrap',
+    confidence: float = 0.95,
+    n_resamples: int = 2000,
+    n_jobs: int = -1,
+    seed: Optional[int] = None
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Point estimates with confidence intervals for every fairness metric.
+
+    Args:
+        y_pred: Binary predictions (1 for shortlist, 0 for reject)
+        groups: Group label per row, any hashable encoding
+        privileged: Privileged label, or a list of labels
+        y_true: Optional ground-truth labels
+        method: 'bootstrap' or 'analytical'
+        confidence: Two-sided confidence level
+        n_resamples: Bootstrap replicates
+        n_jobs: Cores used for bootstrap resampling
+        seed: Seed for reproducible resampling
+
+    Returns:
+        Dictionary keyed by 'overall' and each unprivileged group label,
+        mapping metric name to ``{'estimate', 'lower', 'upper'}``
+    """
+    codes, uniques = encode_groups(groups)
+    counts = confusion_counts(codes, y_pred, y_true, n_groups=len(uniques))
+    mask = _privileged_mask(uniques, privileged)
+
+    if method == 'bootstrap':
+        bounds = bootstrap_intervals(counts, mask, n_resamples, confidence, n_jobs, seed)
+    elif method == 'analytical':
+        bounds = analytical_intervals(counts, mask, confidence)
+    else:
+        raise ValueError(f"Unknown interval method: {method}")
+
+    privileged_counts = counts[mask].sum(axis=0)
+    estimates = metrics_from_counts(
+        np.vstack([counts[~mask].sum(axis=0), counts[~mask]]), privileged_counts
+    )
+
+    names = METRIC_NAMES if y_true is not None else METRIC_NAMES[:2]
+    labels = ['overall'] + [str(label) for label in uniques[~mask]]
+    return {
+        label: {
+            name: {
+                'estimate': float(estimates[name][i]),
+                'lower': float(bounds[name][0, i]),
+                'upper': float(bounds[name][1, i])
+            }
+            for name in names
+        }
+        for i, label in enumerate(labels)
+    }
+
+
+def _plain(value: Any) -> Any:
+    """Unwrap NumPy scalars so subgroup labels serialize as JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _severity(metrics: Dict[str, np.ndarray], metric: str) -> np.ndarray:
+    """Distance of a metric from parity, used to rank subgroups."""
+    values = metrics[metric]
+    if metric == 'disparate_impact':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.log(values)
+    return np.nan_to_num(np.abs(values), nan=0.0, posinf=np.inf)
+
+
+def intersectional_subgroups(
+    attributes: Dict[str, Any],
+    y_pred: np.ndarray,
+    y_true: Optional[np.ndarray] = None,
+    min_support: int = 30,
+    max_order: Optional[int] = None,
+    metric: str = 'demographic_parity',
+    top_k: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Rank attribute-combination subgroups by disparity against everyone else.
+
+    All attributes are dictionary-encoded once and the rows are reduced in
+    a single pass to a table of occupied joint cells. Every subgroup of
+    every order is then a marginal of that table, so enumerating
+    combinations never rescans the rows. Subgroups below ``min_support``
+    are dropped, and a combination is skipped entirely when one of its
+    lower-order parents had no subgroup left (support only shrinks as
+    attributes are added).
+
+    Args:
+        attributes: Attribute name to per-row values
+        y_pred: Binary predictions (1 for shortlist, 0 for reject)
+        y_true: Optional ground-truth labels
+        min_support: Minimum rows for a subgroup to be reported
+        max_order: Largest number of attributes combined; defaults to all
+        metric: Metric used for ranking
+        top_k: Number of subgroups to return
+
+    Returns:
+        Subgroups ordered from most to least disparate, each with its
+        attribute values, size and metrics
+    """
+    names = list(attributes)
+    max_order = len(names) if max_order is None else min(max_order, len(names))
+
+    # Dictionary-encode each attribute; missing values get their own slot
+    codes, uniques = [], []
+    for name in names:
+        attr_codes, attr_uniques = encode_groups(attributes[name])
+        attr_codes[attr_codes < 0] = len(attr_uniques)
+        codes.append(attr_codes)
+        uniques.append(attr_uniques)
+    radices = np.array([len(u) + 1 for u in uniques], dtype=np.int64)
+
+    # Single pass over the rows: joint cell id per row, then counts per cell
+    joint = np.zeros(len(codes[0]), dtype=np.int64)
+    for attr_codes, radix in zip(codes, radices):
+        joint = joint * radix + attr_codes
+    cell_ids, cells = pd.factorize(joint)
+    cell_counts = confusion_counts(cell_ids, y_pred, y_true, n_groups=len(cells))
+
+    # Decode occupied cells back to per-attribute codes, shape (n_cells, n_attrs)
+    cell_codes = np.empty((len(cells), len(names)), dtype=np.int64)
+    remainder = np.asarray(cells, dtype=np.int64)
+    for i in range(len(names) - 1, -1, -1):
+        cell_codes[:, i] = remainder % radices[i]
+        remainder = remainder // radices[i]
+
+    total = cell_counts.sum(axis=0)
+    alive = {(): True}
+    candidates = []
+
+    for order in range(1, max_order + 1):
+        for combo in combinations(range(len(names)), order):
+            if not all(alive.get(parent, False) for parent in combinations(combo, order - 1)):
+                alive[combo] = False
+                continue
+
+            present = (cell_codes[:, combo] < radices[list(combo)] - 1).all(axis=1)
+            sub_key = np.zeros(int(present.sum()), dtype=np.int64)
+            for i in combo:
+                sub_key = sub_key * radices[i] + cell_codes[present, i]
+            sub_ids, sub_cells = pd.factorize(sub_key)
+            counts = np.stack([
+                np.bincount(sub_ids, weights=cell_counts[present, column], minlength=len(sub_cells))
+                for column in range(4)
+            ], axis=1)
+
+            supported = counts.sum(axis=1) >= min_support
+            alive[combo] = bool(supported.any())
+            if not alive[combo]:
+                continue
+
+            counts = counts[supported]
+            metrics = metrics_from_counts(counts, total - counts)
+            severity = _severity(metrics, metric)
+            first_rows = np.flatnonzero(present)[
+                np.unique(sub_ids, return_index=True)[1]
+            ][supported]
+
+            for j, row in enumerate(first_rows):
+                candidates.append((severity[j], combo, row, counts[j], {
+                    key: value[j] for key, value in metrics.items()
+                }))
+
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+    results = []
+    for severity, combo, row, counts, metrics in candidates[:top_k]:
+        result = {
+            'subgroup': {
+                names[i]: _plain(uniques[i][cell_codes[row, i]])
+                for i in combo
+            },
+            'size': int(counts.sum()),
+            'selection_rate': float((counts[FP] + counts[TP]) / counts.sum())
+        }
+        result.update(_to_floats(metrics, y_true is not None))
+        results.append(result)
+    return results
@@ -0,0 +1,175 @@
+"""
+Native bias mitigation algorithms that work directly on arrays.
+"""
+import numpy as np
+from typing import Dict, Any, Optional
+
+from .fairness import encode_groups
+
+
+def reweighing_weights(
+    groups: Any,
+    labels: np.ndarray,
+    base_weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Compute reweighing sample weights from a group/label contingency table.
+
+    Each row gets ``P(group) * P(label) / P(group, label)`` so that group
+    membership and label are independent under the weighted distribution
+    (Kamiran & Calders). This is the same weighting AIF360's ``Reweighing``
+    applies, generalized to any number of groups, and needs a single
+    bincount pass.
+
+    Args:
+        groups: Group label per row, any hashable encoding
+        labels: Binary labels (1 for shortlist, 0 for reject)
+        base_weights: Optional existing instance weights to reweigh
+
+    Returns:
+        Array of sample weights, one per row
+    """
+    codes, uniques = encode_groups(groups)
+    codes[codes < 0] = len(uniques)  # missing values form their own group
+    labels = np.asarray(labels).astype(np.int64, copy=False)
+    weights = np.ones(len(labels)) if base_weights is None else np.asarray(base_weights, dtype=np.float64)
+
+    cells = codes * 2 + labels
+    joint = np.bincount(cells, weights=weights, minlength=(len(uniques) + 1) * 2).reshape(-1, 2)
+    total = joint.sum()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table = np.outer(joint.sum(axis=1), joint.sum(axis=0)) / (total * joint)
+    table[~np.isfinite(table)] = 1.0
+
+    return weights * table[codes, labels]
+
+
+class GroupThresholdPostprocessor:
+    """
+    Per-group decision thresholds that equalize outcomes across groups.
+
+    Fitting sorts each group's scores once and reads selection rate, TPR
+    and FPR for every candidate cut from cumulative sums, so it runs in
+    O(n log n). Applying the thresholds is a dict lookup per decision.
+    """
+
+    CONSTRAINTS = ('equalized_odds', 'demographic_parity')
+
+    def __init__(
+        self,
+        attribute: str,
+        constraint: str = 'equalized_odds',
+        default_threshold: float = 0.5
+    ):
+        if constraint not in self.CONSTRAINTS:
+            raise ValueError(f"Unknown threshold constraint: {constraint}")
+        self.attribute = attribute
+        self.constraint = constraint
+        self.default_threshold = default_threshold
+        self.thresholds: Dict[str, float] = {}
+
+    def fit(
+        self,
+        scores: np.ndarray,
+        groups: Any,
+        labels: Optional[np.ndarray] = None
+    ) -> 'GroupThresholdPostprocessor':
+        """
+        Choose one threshold per group.
+
+        Targets are the overall rates at the default threshold: the
+        selection rate for demographic parity, or the (TPR, FPR) pair for
+        equalized odds. Each group gets the cut whose rates are closest to
+        the target.
+        """
+        if self.constraint == 'equalized_odds' and labels is None:
+            raise ValueError("Equalized odds thresholds require labels")
+
+        scores = np.asarray(scores, dtype=np.float64)
+        labels = np.zeros(len(scores), dtype=np.int64) if labels is None else np.asarray(labels).astype(np.int64)
+        codes, uniques = encode_groups(groups)
+
+        selected = scores > self.default_threshold
+        target = {
+            'selection_rate': selected.mean(),
+            'tpr': selected[labels == 1].mean() if (labels == 1).any() else 0.0,
+            'fpr': selected[labels == 0].mean() if (labels == 0).any() else 0.0
+        }
+
+        # One sort: by group, then by descending score within each group
+        order = np.lexsort((-scores, codes))
+        codes, scores, labels = codes[order], scores[order], labels[order]
+        boundaries = np.flatnonzero(np.diff(codes)) + 1
+
+        self.thresholds = {}
+        for group_codes, group_scores, group_labels in zip(
+            np.split(codes, boundaries),
+            np.split(scores, boundaries),
+            np.split(labels, boundaries)
+        ):
+            if group_codes.size == 0 or group_codes[0] < 0:
+                continue
+            label = str(uniques[group_codes[0]])
+            self.thresholds[label] = self._best_threshold(group_scores, group_labels, target)
+
+        return self
+
+    def _best_threshold(
+        self,
+        scores: np.ndarray,
+        labels: np.ndarray,
+        target: Dict[str, float]
+    ) -> float:
+        """Pick the cut on descending ``scores`` closest to ``target``."""
+        # Last index of each run of tied scores: cutting there selects every
+        # row scoring strictly above the next distinct value
+        run_ends = np.append(np.flatnonzero(np.diff(scores)), len(scores) - 1)
+        n_selected = np.concatenate([[0], run_ends + 1])
+        true_positives = np.concatenate([[0], np.cumsum(labels)[run_ends]])
+        false_positives = n_selected - true_positives
+
+        # Threshold that selects exactly n_selected rows with ``score > t``
+        candidates = np.concatenate([
+            scores[[0]],
+            scores[np.minimum(run_ends + 1, len(scores) - 1)]
+        ])
+        candidates[-1] = np.nextafter(scores[-1], -np.inf)
+
+        positives = max(int(labels.sum()), 1)
+        negatives = max(int(len(labels) - labels.sum()), 1)
+
+        if self.constraint == 'demographic_parity':
+            distance = np.abs(n_selected / len(scores) - target['selection_rate'])
+        else:
+            distance = (
+                np.abs(true_positives / positives - target['tpr'])
+                + np.abs(false_positives / negatives - target['fpr'])
+            )
+
+        return float(candidates[np.argmin(distance)])
+
+    def threshold_for(self, group: Any) -> float:
+        """Decision threshold for one group; unseen groups use the default."""
+        return self.thresholds.get(str(group), self.default_threshold)
+
+    def predict(self, scores: np.ndarray, groups: Any) -> np.ndarray:
+        """Apply the per-group thresholds to an array of scores."""
+        thresholds = np.array([self.threshold_for(group) for group in groups], dtype=np.float64)
+        return (np.asarray(scores) > thresholds).astype(np.int64)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for storage next to the model files."""
+        return {
+            'attribute': self.attribute,
+            'constraint': self.constraint,
+            'default_threshold': self.default_threshold,
+            'thresholds': self.thresholds
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GroupThresholdPostprocessor':
+        """Restore a post-processor saved with :meth:`to_dict`."""
+        postprocessor = cls(data['attribute'], data['constraint'], data['default_threshold'])
+        postprocessor.thresholds = dict(data['thresholds'])
+        return postprocessor
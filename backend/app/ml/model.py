@@ -1,21 +1,32 @@
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 import pandas as pd
 import nltk
 import spacy
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional, Iterable
 import joblib
 from pathlib import Path
+from dataclasses import replace
 import shap
 import json
-import re
 import os
+import time
+import threading
 
 from ..core.config import settings
 from ..core.logging import logger, model_logger, bias_logger
+from ..core.metrics import stage
+from .mitigation import GroupThresholdPostprocessor
+from .fair_classifier import FairLogisticRegression
+from .preprocessing import LemmaCache, LemmaMemo, normalize_text
+from .registry import ModelBundle, ModelRegistry, new_version, compute_feature_importance
+from .compiled_forest import compile_classifier
+from .chunking import ChunkedProcessor
+from .sections import SKILLS, parse_resume
 
 # Download required NLTK data
 nltk.download('punkt')
@@ -23,24 +34,88 @@ nltk.download('stopwords')
 nltk.download('wordnet')
 
 # Load spaCy model
+SPACY_MODEL = 'en_core_web_sm'
 try:
-    nlp = spacy.load('en_core_web_sm')
+    nlp = spacy.load(SPACY_MODEL)
 except OSError:
     print("Downloading spaCy model...")
-    spacy.cli.download('en_core_web_sm')
-    nlp = spacy.load('en_core_web_sm')
+    spacy.cli.download(SPACY_MODEL)
+    nlp = spacy.load(SPACY_MODEL)
+
+# Pipeline components that lemmas depend on; everything else is skipped in fast mode
+LEMMA_COMPONENTS = ('tok2vec', 'tagger', 'morphologizer', 'attribute_ruler', 'lemmatizer')
 
 class ResumeAnalyzer:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
+    CLASSIFIERS = ('random_forest', 'fair_logistic')
+    PREPROCESS_MODES = ('full', 'fast')
+    ENTITY_EXTRACTION_MODES = ('rules', 'statistical', 'both')
+    
+    def __init__(self, classifier: Optional[str] = None, registry: Optional[ModelRegistry] = None):
+        self.classifier_type = classifier or settings.CLASSIFIER
+        if self.classifier_type not in self.CLASSIFIERS:
+            raise ValueError(f"Unknown classifier: {self.classifier_type}")
+        
+        if settings.PREPROCESS_MODE not in self.PREPROCESS_MODES:
+            raise ValueError(f"Unknown preprocessing mode: {settings.PREPROCESS_MODE}")
+        if settings.ENTITY_EXTRACTION not in self.ENTITY_EXTRACTION_MODES:
+            raise ValueError(f"Unknown entity extraction mode: {settings.ENTITY_EXTRACTION}")
+        
+        self.registry = registry or ModelRegistry()
+        self.lemma_memo = LemmaMemo(settings.LEMMA_MEMO_SIZE)
+        self.chunked_processor = ChunkedProcessor(
+            nlp, SPACY_MODEL, settings.CHUNK_MAX_CHARS, settings.CHUNK_WORKERS
+        )
+        self.bundle: Optional[ModelBundle] = None
+        # Optional ShadowEvaluator handed every live prediction (see app.ml.shadow)
+        self.shadow = None
+        self.explainer = None
+        self.swap_status: Dict[str, Any] = {"state": "idle"}
+        self._swap_lock = threading.Lock()
+        
+        # Serve the registry's active version; the sample-data bootstrap model
+        # is only the fallback when there is none or it cannot be loaded
+        if self.registry.active_version() is not None:
+            try:
+                self.load_model()
+            except Exception:
+                logger.warning("Falling back to the bootstrap model")
+        if self.bundle is None:
+            self._initialize_with_sample_data()
+    
+    # The active bundle is replaced as a whole; these read through to it
+    @property
+    def vectorizer(self):
+        return self.bundle.vectorizer
+    
+    @property
+    def classifier(self):
+        return self.bundle.classifier
+    
+    @property
+    def postprocessor(self):
+        return self.bundle.postprocessor
+    
+    @property
+    def feature_names(self):
+        return self.bundle.feature_names
+    
+    @property
+    def model_version(self) -> str:
+        return self.bundle.version
+    
+    def _build_vectorizer(self):
+        """Create an unfitted TF-IDF vectorizer."""
+        return TfidfVectorizer(
             max_features=1000,
             stop_words='english',
             ngram_range=(1, 2)
         )
-        self.classifier = RandomForestClassifier(n_estimators=100, random_state=42)
-        
-        # Initialize with sample data to fit the vectorizer
-        self._initialize_with_sample_data()
+    
+    def _build_classifier(self):
+        """Create an unfitted classifier of the configured type."""
+        if self.classifier_type == 'fair_logistic':
+            return FairLogisticRegression(eta=settings.FAIRNESS_PENALTY)
+        return RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=settings.N_JOBS)
     
     def _initialize_with_sample_data(self):
         """Initialize the model with sample resumes to fit the vectorizer."""
@@ -63,141 +138,609 @@ class ResumeAnalyzer:
         ]
         
         # Fit the vectorizer with sample data
-        self.vectorizer.fit(sample_resumes)
+        vectorizer = self._build_vectorizer()
+        vectorizer.fit(sample_resumes)
         
         # Create dummy labels for initial training
         dummy_labels = np.array([1, 1, 0])  # 1 for shortlist, 0 for reject
-        X = self.vectorizer.transform(sample_resumes)
-        self.classifier.fit(X, dummy_labels)
+        X = vectorizer.transform(sample_resumes)
+        classifier = self._build_classifier()
+        classifier.fit(X, dummy_labels)
+        
+        # The bootstrap model is never persisted to the registry
+        self._activate(self._make_bundle(vectorizer, classifier, self.classifier_type))
+    
+    def _normalize_text(self, text):
+        """Lowercase and strip special characters and extra whitespace."""
+        return normalize_text(text)
     
     def preprocess_text(self, text):
         """Clean and preprocess the resume text."""
-        # Convert to lowercase
-        text = text.lower()
+        if len(text) > settings.LONG_DOCUMENT_CHARS:
+            return self._process_long_document(
+                text, settings.LONG_DOCUMENT_BUDGET_SECONDS
+            )['lemmatized']
         
-        # Remove special characters and extra whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = self._normalize_text(text)
         
         # Lemmatize using spaCy
-        doc = nlp(text)
-        lemmatized = ' '.join([token.lemma_ for token in doc])
+        return self._lemmatize([text], n_process=1)[0]
+    
+    def _lemmatize(self, texts: List[str], n_process: int) -> List[str]:
+        """
+        Lemmatize normalized texts according to ``settings.PREPROCESS_MODE``.
+        
+        "full" runs the whole spaCy pipeline. "fast" answers documents whose
+        tokens are all in the lemma memo straight from the tokenizer, and
+        sends the rest through a pipeline trimmed to the components lemmas
+        depend on (the parser and NER are skipped).
+        """
+        if settings.PREPROCESS_MODE != 'fast':
+            docs = nlp.pipe(texts, n_process=n_process, batch_size=settings.PREPROCESS_BATCH_SIZE)
+            return [' '.join([token.lemma_ for token in doc]) for doc in docs]
+        
+        results: List[Optional[str]] = [None] * len(texts)
+        pending, pending_docs = [], []
+        for i, text in enumerate(texts):
+            doc = nlp.tokenizer(text)
+            lemmas = self.lemma_memo.lookup([token.text for token in doc])
+            if lemmas is None:
+                pending.append(i)
+                pending_docs.append(doc)
+            else:
+                results[i] = ' '.join(lemmas)
         
-        return lemmatized
+        if pending:
+            docs = nlp.pipe(
+                pending_docs,
+                disable=self._lemma_disabled_components(),
+                n_process=n_process,
+                batch_size=settings.PREPROCESS_BATCH_SIZE
+            )
+            for i, doc in zip(pending, docs):
+                lemmas = [token.lemma_ for token in doc]
+                self.lemma_memo.record([token.text for token in doc], lemmas)
+                results[i] = ' '.join(lemmas)
+        
+        return results
+    
+    def _lemma_disabled_components(self) -> List[str]:
+        """Pipeline components skipped when only lemmas are needed."""
+        if settings.PREPROCESS_MODE != 'fast':
+            return []
+        return [name for name in nlp.pipe_names if name not in LEMMA_COMPONENTS]
+    
+    def _process_long_document(
+        self,
+        text: str,
+        budget_seconds: Optional[float],
+        with_entities: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Process a document too long for one spaCy pass in parallel chunks.
+        
+        Args:
+            text: Raw document
+            budget_seconds: Hard time limit for the document; None for no limit
+            with_entities: Also extract named entities
+        """
+        return self.chunked_processor.process(
+            text,
+            disable=self._lemma_disabled_components(),
+            with_entities=with_entities,
+            budget_seconds=budget_seconds
+        )
+    
+    def preprocess_batch(
+        self,
+        texts: List[str],
+        n_process: Optional[int] = None,
+        use_cache: bool = True,
+        budget_seconds: Optional[float] = None
+    ) -> List[str]:
+        """
+        Preprocess many resumes at once.
+        
+        Cached results are looked up by document hash first; only the misses
+        go through spaCy, streamed with ``nlp.pipe`` across ``n_process``
+        worker processes.
+        
+        Args:
+            texts: Raw resume texts
+            n_process: spaCy worker processes; defaults to settings
+            use_cache: Read and write the on-disk lemma cache
+            budget_seconds: Time limit per long document; None, as in
+                training, processes every chunk
+            
+        Returns:
+            Lemmatized texts in input order
+        """
+        cache = self._get_lemma_cache() if use_cache else None
+        keys = [cache.key(text) for text in texts] if cache is not None else []
+        cached = cache.get_many(set(keys)) if cache is not None else {}
+        
+        results = [cached.get(key) for key in keys] if cache is not None else [None] * len(texts)
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        if missing:
+            long_documents = [i for i in missing if len(texts[i]) > settings.LONG_DOCUMENT_CHARS]
+            truncated = set()
+            for i in long_documents:
+                processed = self._process_long_document(texts[i], budget_seconds)
+                results[i] = processed['lemmatized']
+                if processed['truncated']:
+                    truncated.add(i)
+            
+            short_documents = [i for i in missing if len(texts[i]) <= settings.LONG_DOCUMENT_CHARS]
+            n_process = n_process or settings.PREPROCESS_N_PROCESS
+            lemmatized = self._lemmatize(
+                [self._normalize_text(texts[i]) for i in short_documents],
+                n_process=n_process if len(short_documents) >= settings.PREPROCESS_BATCH_SIZE else 1
+            )
+            for i, result in zip(short_documents, lemmatized):
+                results[i] = result
+            
+            if cache is not None:
+                # Lemmas cut short by the budget would be served to later, unbudgeted callers
+                cache.put_many({keys[i]: results[i] for i in missing if i not in truncated})
+        
+        logger.debug("Preprocessed %d resumes (%d from cache)", len(texts), len(texts) - len(missing))
+        
+        return results
+    
+    def _get_lemma_cache(self) -> LemmaCache:
+        """Open the lemma cache lazily, once per analyzer."""
+        if getattr(self, '_lemma_cache', None) is None:
+            self._lemma_cache = LemmaCache(
+                settings.PREPROCESS_CACHE_PATH,
+                namespace=f"{nlp.meta['name']}-{nlp.meta['version']}-{settings.PREPROCESS_MODE}"
+            )
+        return self._lemma_cache
     
     def extract_features(self, text):
-        """Extract features from resume text."""
-        processed_text = self.preprocess_text(text)
+        """
+        Extract features from resume text.
+        
+        Sections, skills, experience and pattern entities come from the
+        rule-based parser in one pass over the text; spaCy NER only runs
+        when ``settings.ENTITY_EXTRACTION`` asks for statistical entities.
+        
+        ``entities`` (the last entity per label) and ``experience`` (whole
+        years) keep their original shape for API clients; every entity
+        per label in document order is in ``entity_lists`` and fractional
+        years in ``experience_years``.
+        """
+        with stage("preprocess"):
+            statistical = settings.ENTITY_EXTRACTION != 'rules'
+            parsed = parse_resume(text)
+            entities = {} if settings.ENTITY_EXTRACTION == 'statistical' else parsed['entities']
+            
+            long_document = None
+            if len(text) > settings.LONG_DOCUMENT_CHARS:
+                # Lemmas (and entities) from one chunked pass within the latency budget
+                long_document = self._process_long_document(
+                    text, settings.LONG_DOCUMENT_BUDGET_SECONDS, with_entities=statistical
+                )
+                processed_text = long_document['lemmatized']
+                statistical_entities = long_document['entities']
+            else:
+                processed_text = self.preprocess_text(text)
+                statistical_entities = [(ent.label_, ent.text) for ent in nlp(text).ents] if statistical else []
+            
+            for label, entity in statistical_entities:
+                entities.setdefault(label, []).append(entity)
         
         # Get TF-IDF features
-        features = self.vectorizer.transform([processed_text])
+        with stage("vectorize"):
+            features = self.vectorizer.transform([processed_text]).toarray()[0].tolist()
         
-        # Extract named entities using spaCy
-        doc = nlp(text)
-        entities = {ent.label_: ent.text for ent in doc.ents}
+        experience_years = self._extract_experience(text, parsed)
+        result = {
+            'tfidf_features': features,
+            'entities': {label: values[-1] for label, values in entities.items()},
+            'entity_lists': entities,
+            'skills': self._extract_skills(text, parsed),
+            'experience': int(experience_years),
+            'experience_years': experience_years,
+            'sections': parsed['sections']
+        }
+        if long_document is not None:
+            result['long_document'] = {
+                key: long_document[key] for key in ('chunks', 'processed_chunks', 'truncated')
+            }
         
-        # Extract skills (simple keyword matching)
-        skills = self._extract_skills(text)
+        return result
+    
+    def _extract_skills(self, text, parsed: Optional[Dict[str, Any]] = None):
+        """
+        Extract known skills from resume text.
         
-        # Extract experience (simple pattern matching)
-        experience = self._extract_experience(text)
+        Skills are matched as whole words by the pattern layer, so "go" no
+        longer matches inside "good" nor "java" inside "javascript".
+        """
+        parsed = parsed or parse_resume(text)
+        found = {skill.lower() for skill in parsed['entities'].get('SKILL', [])}
+        return [skill for skill in SKILLS if skill in found]
+    
+    def _extract_experience(self, text, parsed: Optional[Dict[str, Any]] = None):
+        """
+        Extract years of experience from resume text.
         
-        return {
-            'tfidf_features': features.toarray()[0].tolist(),
-            'entities': entities,
-            'skills': skills,
-            'experience': experience
-        }
+        Uses the larger of the years covered by the experience section's
+        date ranges and any "N years of experience" statement.
+        """
+        parsed = parsed or parse_resume(text)
+        return max(parsed['experience_years'], parsed['stated_experience_years'])
     
-    def _extract_skills(self, text):
-        """Extract skills from resume text."""
-        # Common programming languages and technologies
-        skills_list = [
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby',
-            'php', 'swift', 'kotlin', 'go', 'rust', 'sql', 'nosql', 'mongodb',
-            'postgresql', 'mysql', 'redis', 'react', 'angular', 'vue', 'node.js',
-            'django', 'flask', 'spring', 'tensorflow', 'pytorch', 'scikit-learn',
-            'pandas', 'numpy', 'aws', 'azure', 'gcp', 'docker', 'kubernetes'
-        ]
+    def predict(self, text, protected_attributes: Optional[Dict[str, Any]] = None):
+        """
+        Predict whether to shortlist the resume.
+        
+        When group thresholds have been fitted, the candidate's value for the
+        post-processor's protected attribute selects the decision threshold.
         
-        found_skills = []
-        for skill in skills_list:
-            if skill.lower() in text.lower():
-                found_skills.append(skill)
+        Returns:
+            Decision, confidence, feature importance and the version of the
+            model that produced them
+        """
+        # Read the bundle once so a concurrent swap cannot mix models
+        bundle = self.bundle
         
-        return found_skills
+        processed_text = self.preprocess_text(text)
+        features = bundle.vectorizer.transform([processed_text])
+        
+        # Get prediction probability, from the compiled forest when there is one
+        scorer = bundle.compiled if bundle.compiled is not None else bundle.classifier
+        proba = scorer.predict_proba(features)[0]
+        decision, confidence = self._decide(proba, protected_attributes, bundle.postprocessor)
+        
+        if self.shadow is not None:
+            self.shadow.offer([processed_text], [protected_attributes], [(decision, confidence)])
+        
+        return decision, confidence, bundle.feature_importance, bundle.version
     
-    def _extract_experience(self, text):
-        """Extract experience information from resume text."""
-        # Simple pattern matching for years of experience
-        experience_pattern = r'(\d+)\s*(?:years?|yrs?)\s*(?:of)?\s*experience'
-        match = re.search(experience_pattern, text.lower())
+    def predict_batch(
+        self,
+        texts: List[str],
+        protected_attributes: Optional[List[Optional[Dict[str, Any]]]] = None,
+        bundle: Optional[ModelBundle] = None,
+        use_cache: bool = False
+    ) -> List[Tuple[str, float, Dict[str, float], str]]:
+        """
+        Predict many resumes with one preprocessing, vectorizing and scoring pass.
+        
+        Gives the same result per resume as ``predict``; every resume in the
+        batch is scored by the same model version.
         
-        if match:
-            return int(match.group(1))
-        return 0
+        Args:
+            texts: Raw resume texts
+            protected_attributes: Optional attributes per resume, in input order
+            bundle: Model to score with instead of the active one
+            use_cache: Read and write the on-disk lemma cache, which pays
+                off when the same resumes are scored again
+            
+        Returns:
+            One (decision, confidence, feature importance, version) tuple per resume
+        """
+        live = bundle is None
+        bundle = bundle or self.bundle
+        protected_attributes = protected_attributes or [None] * len(texts)
+        
+        processed = self.preprocess_batch(
+            texts, n_process=1, use_cache=use_cache,
+            budget_seconds=settings.LONG_DOCUMENT_BUDGET_SECONDS
+        )
+        decisions = self.score_processed(processed, protected_attributes, bundle)
+        
+        if live and self.shadow is not None:
+            self.shadow.offer(processed, protected_attributes, decisions)
+        
+        return [
+            (decision, confidence, bundle.feature_importance, bundle.version)
+            for decision, confidence in decisions
+        ]
     
-    def predict(self, text):
-        """Predict whether to shortlist the resume."""
-        processed_text = self.preprocess_text(text)
-        features = self.vectorizer.transform([processed_text])
+    def score_processed(
+        self,
+        processed: List[str],
+        protected_attributes: List[Optional[Dict[str, Any]]],
+        bundle: ModelBundle
+    ) -> List[Tuple[str, float]]:
+        """
+        Decision and confidence per already preprocessed resume under ``bundle``.
+        
+        Args:
+            processed: Output of ``preprocess_batch``
+            protected_attributes: Attributes per resume, in input order
+            bundle: Model to score with
+            
+        Returns:
+            One (decision, confidence) tuple per resume
+        """
+        features = bundle.vectorizer.transform(processed)
+        
+        scorer = bundle.compiled if bundle.compiled is not None else bundle.classifier
+        probas = scorer.predict_proba(features)
         
-        # Get prediction probability
-        proba = self.classifier.predict_proba(features)[0]
-        decision = "shortlist" if proba[1] > 0.5 else "reject"
+        return [
+            self._decide(proba, attributes, bundle.postprocessor)
+            for proba, attributes in zip(probas, protected_attributes)
+        ]
+    
+    def _decide(
+        self,
+        proba: np.ndarray,
+        protected_attributes: Optional[Dict[str, Any]],
+        postprocessor: Optional[GroupThresholdPostprocessor]
+    ) -> Tuple[str, float]:
+        """Decision and confidence from one row of class probabilities."""
+        threshold = self._decision_threshold(protected_attributes, postprocessor)
+        decision = "shortlist" if proba[1] > threshold else "reject"
         confidence = float(proba[1] if decision == "shortlist" else proba[0])
+        return decision, confidence
+    
+    def _decision_threshold(
+        self,
+        protected_attributes: Optional[Dict[str, Any]],
+        postprocessor: Optional[GroupThresholdPostprocessor]
+    ) -> float:
+        """Shortlist threshold for one candidate."""
+        if postprocessor is None or not protected_attributes:
+            return settings.DECISION_THRESHOLD
+        return postprocessor.threshold_for(
+            protected_attributes.get(postprocessor.attribute)
+        )
+    
+    def fit_thresholds(
+        self,
+        X: List[str],
+        y: List[int],
+        groups: List[Any],
+        attribute: str,
+        constraint: str = 'equalized_odds'
+    ):
+        """
+        Fit per-group decision thresholds on held-out resumes.
+        
+        Args:
+            X: Raw resume texts
+            y: Labels (1 for shortlist, 0 for reject)
+            groups: Value of ``attribute`` for each resume
+            attribute: Protected attribute the thresholds are keyed on
+            constraint: 'equalized_odds' or 'demographic_parity'
+        """
+        bundle = self.bundle
+        X_processed = self.preprocess_batch(X)
+        scores = bundle.classifier.predict_proba(bundle.vectorizer.transform(X_processed))[:, 1]
+        
+        postprocessor = GroupThresholdPostprocessor(
+            attribute,
+            constraint,
+            default_threshold=settings.DECISION_THRESHOLD
+        ).fit(scores, groups, np.asarray(y))
         
-        # Get feature importance
-        feature_names = self.vectorizer.get_feature_names_out()
-        feature_importance = dict(zip(feature_names, self.classifier.feature_importances_))
+        # Thresholds are part of the model, so they get a version of their own
+        self._publish(bundle.derive(postprocessor=postprocessor))
         
-        return decision, confidence, feature_importance
+        logger.info(f"Fitted {constraint} thresholds for {attribute}: {postprocessor.thresholds}")
     
-    def train(self, X: List[str], y: List[int]):
-        """Train the model on resume data."""
+    def train(
+        self,
+        X: List[str],
+        y: List[int],
+        sample_weight: Optional[np.ndarray] = None,
+        sensitive: Optional[List[Any]] = None
+    ):
+        """
+        Train the model on resume data.
+        
+        Args:
+            X: Raw resume texts
+            y: Labels (1 for shortlist, 0 for reject)
+            sample_weight: Optional per-resume weights, e.g. from
+                BiasDetector.compute_sample_weights for reweighing
+            sensitive: Optional protected attribute per resume, used by the
+                fair_logistic classifier's fairness penalty
+            
+        Returns:
+            Wall time in seconds of each training stage
+        """
+        timings = {}
+        
         # Preprocess text
-        X_processed = [self.preprocess_text(text) for text in X]
+        start = time.perf_counter()
+        X_processed = self.preprocess_batch(X)
+        timings['preprocess'] = time.perf_counter() - start
         
         # Transform text to features
-        X_vectorized = self.vectorizer.fit_transform(X_processed)
-        self.feature_names = self.vectorizer.get_feature_names_out()
+        start = time.perf_counter()
+        vectorizer = self._build_vectorizer()
+        X_vectorized = vectorizer.fit_transform(X_processed)
+        timings['vectorize'] = time.perf_counter() - start
         
         # Train model
-        self.classifier.fit(X_vectorized, y)
+        start = time.perf_counter()
+        classifier = self._build_classifier()
+        if isinstance(classifier, FairLogisticRegression):
+            classifier.fit(X_vectorized, y, sensitive=sensitive, sample_weight=sample_weight)
+        else:
+            if sensitive is not None:
+                logger.warning("Protected attributes are only used by the fair_logistic classifier")
+            classifier.fit(X_vectorized, y, sample_weight=sample_weight)
+        timings['fit'] = time.perf_counter() - start
         
-        # Initialize SHAP explainer
-        self.explainer = shap.TreeExplainer(self.classifier)
+        # Save, warm and activate the new model version
+        start = time.perf_counter()
+        self._publish(self._make_bundle(
+            vectorizer,
+            classifier,
+            self.classifier_type,
+            feature_names=list(vectorizer.get_feature_names_out())
+        ))
+        timings['publish'] = time.perf_counter() - start
         
-        # Save model and vectorizer
-        self._save_model()
+        logger.info(
+            "Model training completed: "
+            + ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in timings.items())
+        )
         
-        logger.info("Model training completed")
+        return timings
     
-    def _save_model(self):
-        """Save model and vectorizer to disk."""
-        model_dir = Path(settings.MODEL_PATH)
-        model_dir.mkdir(parents=True, exist_ok=True)
+    def train_streaming(
+        self,
+        batches: Iterable[Tuple[List[str], np.ndarray]],
+        preprocess: bool = True
+    ) -> Dict[str, float]:
+        """
+        Train out-of-core on batches of resumes.
+        
+        Uses a stateless HashingVectorizer and an SGD logistic model updated
+        with ``partial_fit``, so memory stays constant however many batches
+        are fed. Pair with ``streaming.iter_labeled_batches`` to train
+        straight from the database.
+        
+        Args:
+            batches: Iterable of (resume texts, labels) batches
+            preprocess: Lemmatize with spaCy; otherwise only normalize text
+            
+        Returns:
+            Documents seen, batches seen and wall time of each stage
+        """
+        vectorizer = HashingVectorizer(
+            n_features=settings.HASHING_N_FEATURES,
+            stop_words='english',
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm='l2'
+        )
+        classifier = SGDClassifier(loss='log_loss', alpha=1e-6, random_state=42)
+        classes = np.array([0, 1])
+        
+        stats = {'documents': 0, 'batches': 0, 'preprocess': 0.0, 'vectorize': 0.0, 'fit': 0.0}
+        for texts, labels in batches:
+            start = time.perf_counter()
+            if preprocess:
+                processed = self.preprocess_batch(texts, use_cache=False)
+            else:
+                processed = [self._normalize_text(text) for text in texts]
+            stats['preprocess'] += time.perf_counter() - start
+            
+            start = time.perf_counter()
+            X_batch = vectorizer.transform(processed)
+            stats['vectorize'] += time.perf_counter() - start
+            
+            start = time.perf_counter()
+            classifier.partial_fit(X_batch, labels, classes=classes)
+            stats['fit'] += time.perf_counter() - start
+            
+            stats['documents'] += len(texts)
+            stats['batches'] += 1
+        
+        if stats['batches'] == 0:
+            raise ValueError("No training data")
+        
+        self._publish(self._make_bundle(vectorizer, classifier, 'streaming'))
         
-        joblib.dump(self.classifier, model_dir / "resume_model.joblib")
-        joblib.dump(self.vectorizer, model_dir / "vectorizer.joblib")
+        logger.info(
+            f"Streaming training completed on {stats['documents']} resumes: "
+            + ", ".join(f"{stage}={stats[stage]:.2f}s" for stage in ('preprocess', 'vectorize', 'fit'))
+        )
+        
+        return stats
+    
+    def _make_bundle(
+        self,
+        vectorizer: Any,
+        classifier: Any,
+        classifier_type: str,
+        feature_names: Optional[List[str]] = None
+    ) -> ModelBundle:
+        """Wrap a freshly fitted vectorizer and classifier as a new version."""
+        return ModelBundle(
+            version=new_version(classifier_type),
+            vectorizer=vectorizer,
+            classifier=classifier,
+            classifier_type=classifier_type,
+            feature_names=feature_names,
+            feature_importance=compute_feature_importance(vectorizer, classifier)
+        )
+    
+    def _build_explainer(self, classifier):
+        """SHAP explainer for a fitted classifier; trees only."""
+        if isinstance(classifier, RandomForestClassifier):
+            return shap.TreeExplainer(classifier)
+        return None
+    
+    def _warm(self, bundle: ModelBundle):
+        """Run one prediction so the first real request pays no setup cost."""
+        X = bundle.vectorizer.transform([self._normalize_text("software engineer python")])
+        bundle.classifier.predict_proba(X)
+        if bundle.compiled is not None:
+            bundle.compiled.predict_proba(X)
+    
+    def _compile(self, bundle: ModelBundle) -> ModelBundle:
+        """Attach the compiled evaluator when compiled inference is enabled."""
+        if settings.COMPILED_INFERENCE and bundle.compiled is None:
+            bundle = replace(bundle, compiled=compile_classifier(bundle.classifier))
+        return bundle
+    
+    def _activate(self, bundle: ModelBundle):
+        """Compile and warm a bundle, then swap it in with a single reference assignment."""
+        bundle = self._compile(bundle)
+        self._warm(bundle)
+        explainer = self._build_explainer(bundle.classifier)
+        self.bundle = bundle
+        self.explainer = explainer
+    
+    def _publish(self, bundle: ModelBundle):
+        """Save a new version to the registry and make it active."""
+        self.registry.save(bundle)
+        self._activate(bundle)
+        self.registry.set_active(bundle.version)
+    
+    def load_bundle(self, version: str) -> ModelBundle:
+        """
+        Load a model version from the registry without activating it.
         
-        if self.feature_names is not None:
-            with open(model_dir / "feature_names.json", 'w') as f:
-                json.dump(list(self.feature_names), f)
+        For scoring with a candidate model, e.g. ``predict_batch(bundle=...)``,
+        while the active model keeps serving requests.
+        """
+        bundle = self._compile(self.registry.load(version))
+        self._warm(bundle)
+        return bundle
     
-    def load_model(self):
-        """Load model and vectorizer from disk."""
-        model_dir = Path(settings.MODEL_PATH)
+    def load_model(self, version: Optional[str] = None) -> ModelBundle:
+        """
+        Load a model version from the registry and swap it in.
         
-        if not (model_dir / "resume_model.joblib").exists():
-            raise FileNotFoundError("Model file not found")
+        Safe to call while predictions are running: the bundle is loaded
+        and warmed first, and predictions keep using the previous bundle
+        until the reference is swapped.
         
-        self.classifier = joblib.load(model_dir / "resume_model.joblib")
-        self.vectorizer = joblib.load(model_dir / "vectorizer.joblib")
+        Only this process switches models. The version is also recorded as
+        the registry's active one, which every analyzer loads when it starts,
+        so other uvicorn workers serve it after their next restart.
         
-        with open(model_dir / "feature_names.json", 'r') as f:
-            self.feature_names = json.load(f)
+        Args:
+            version: Version to activate; defaults to the registry's active one
+        """
+        with self._swap_lock:
+            version = version or self.registry.active_version()
+            if version is None:
+                raise FileNotFoundError("Model file not found")
+            
+            self.swap_status = {"state": "loading", "version": version}
+            try:
+                bundle = self.registry.load(version)
+                self._activate(bundle)
+                self.registry.set_active(version)
+            except Exception as e:
+                self.swap_status = {"state": "failed", "version": version, "error": str(e)}
+                logger.error(f"Error loading model version {version}: {str(e)}")
+                raise
+            
+            self.swap_status = {"state": "active", "version": version}
         
-        self.explainer = shap.TreeExplainer(self.classifier)
+        logger.info(f"Model version {version} loaded successfully")
         
-        logger.info("Model loaded successfully") 
\ No newline at end of file
+        return bundle
@@ -0,0 +1,147 @@
+"""
+Text preprocessing helpers shared by training and inference.
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+# Precompiled normalization pattern, shared by every preprocessing path
+NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip special characters and extra whitespace."""
+    # Convert to lowercase
+    text = text.lower()
+
+    # Remove special characters and extra whitespace
+    text = NON_WORD_PATTERN.sub(' ', text)
+    return ' '.join(text.split())
+
+
+class LemmaCache:
+    """
+    Persistent cache of lemmatized documents keyed by content hash.
+
+    Backed by SQLite so it survives restarts, is shared between worker
+    processes, and grows incrementally without loading everything into
+    memory. ``namespace`` separates results produced by different
+    preprocessing configurations.
+    """
+
+    _CHUNK = 500
+
+    def __init__(self, path: str, namespace: str = "default"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lemmas (key TEXT PRIMARY KEY, lemmas TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def key(self, text: str) -> str:
+        """Hash of the raw document within this cache's namespace."""
+        digest = hashlib.sha256()
+        digest.update(self.namespace.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Look up cached lemmatized text for the given keys."""
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self._CHUNK):
+                chunk = keys[start:start + self._CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, lemmas FROM lemmas WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, items: Dict[str, str]):
+        """Store lemmatized text for the given keys."""
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO lemmas (key, lemmas) VALUES (?, ?)", list(items.items())
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM lemmas").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LemmaMemo:
+    """
+    Bounded LRU memo of token-to-lemma results from the tagged pipeline.
+
+    Lemmas are context dependent only through the part-of-speech tag, and
+    for most tokens in resumes the tag never changes the lemma. Every token
+    seen by the pipeline is recorded with its lemma; a token later seen with
+    a different lemma is marked ambiguous and never served from the memo.
+    A document is answered from the memo only when all of its tokens are
+    known and unambiguous, so the tagger still runs wherever context matters.
+
+    Args:
+        max_size: Most tokens kept; the least recently used are evicted
+    """
+
+    _AMBIGUOUS = None
+
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lemmas: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, tokens: List[str]) -> Optional[List[str]]:
+        """Lemmas for every token, or None if any token is unknown or ambiguous."""
+        with self._lock:
+            lemmas = []
+            for token in tokens:
+                lemma = self._lemmas.get(token, self._AMBIGUOUS)
+                if lemma is self._AMBIGUOUS:
+                    self.misses += 1
+                    return None
+                lemmas.append(lemma)
+
+            for token in tokens:
+                self._lemmas.move_to_end(token)
+            self.hits += 1
+            return lemmas
+
+    def record(self, tokens: List[str], lemmas: List[str]):
+        """Remember the lemmas the pipeline produced for one document."""
+        with self._lock:
+            for token, lemma in zip(tokens, lemmas):
+                if token in self._lemmas:
+                    if self._lemmas[token] != lemma:
+                        self._lemmas[token] = self._AMBIGUOUS
+                    self._lemmas.move_to_end(token)
+                else:
+                    self._lemmas[token] = lemma
+
+            while len(self._lemmas) > self.max_size:
+                self._lemmas.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._lemmas)
@@ -0,0 +1,142 @@
+"""
+Versioned model bundles and the on-disk registry that stores them.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from ..core.config import settings
+from ..core.logging import logger
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """
+    Everything needed to score a resume, versioned as one unit.
+
+    Bundles are immutable: a new model, or new thresholds for an existing
+    model, always produce a new bundle with a new version. Swapping the
+    bundle reference is therefore the only way a prediction can see a
+    different model, and a prediction that reads the reference once
+    always pairs a vectorizer with the classifier it was trained with.
+    ``compiled`` is an optional fast evaluator derived from the classifier
+    on activation; it is not persisted.
+    """
+    version: str
+    vectorizer: Any
+    classifier: Any
+    classifier_type: str
+    postprocessor: Any = None
+    feature_names: Optional[List[str]] = None
+    feature_importance: Dict[str, float] = field(default_factory=dict)
+    parent: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    compiled: Any = field(default=None, compare=False)
+
+    def derive(self, **changes) -> 'ModelBundle':
+        """New bundle with ``changes`` applied and a fresh version."""
+        return replace(
+            self,
+            version=new_version(self.classifier_type),
+            parent=self.version,
+            created_at=datetime.utcnow().isoformat(),
+            **changes
+        )
+
+    def metadata(self) -> Dict[str, Any]:
+        """JSON-serializable description of the bundle."""
+        return {
+            "version": self.version,
+            "classifier_type": self.classifier_type,
+            "parent": self.parent,
+            "created_at": self.created_at,
+            "thresholds": self.postprocessor.to_dict() if self.postprocessor is not None else None,
+            "n_features": len(self.feature_names) if self.feature_names is not None else None
+        }
+
+
+def new_version(classifier_type: str) -> str:
+    """Sortable, unique version identifier."""
+    return f"{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}-{classifier_type}"
+
+
+def compute_feature_importance(vectorizer: Any, classifier: Any) -> Dict[str, float]:
+    """
+    Global feature importance of a fitted model, computed once per bundle.
+
+    Hashed features have no names, so streaming models report the
+    strongest hash buckets by coefficient magnitude instead.
+    """
+    if isinstance(vectorizer, HashingVectorizer):
+        magnitude = np.abs(classifier.coef_[0])
+        top = np.argsort(magnitude)[::-1][:settings.HASHED_IMPORTANCE_TOP_K]
+        total = magnitude.sum() or 1.0
+        return {f"hash_{i}": float(magnitude[i] / total) for i in top if magnitude[i] > 0}
+
+    feature_names = vectorizer.get_feature_names_out()
+    return {
+        name: float(importance)
+        for name, importance in zip(feature_names, classifier.feature_importances_)
+    }
+
+
+class ModelRegistry:
+    """
+    Directory of saved bundles plus a pointer to the active version.
+
+    Each version lives in ``<root>/<version>/`` as ``bundle.joblib`` and
+    ``metadata.json``. The active version is recorded in ``<root>/ACTIVE``,
+    which is replaced atomically so readers never see a partial write.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.MODEL_REGISTRY_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def save(self, bundle: ModelBundle):
+        """Persist a bundle under its version."""
+        version_dir = self.root / bundle.version
+        version_dir.mkdir(parents=True, exist_ok=True)
+
+        joblib.dump(replace(bundle, compiled=None), version_dir / "bundle.joblib")
+        with open(version_dir / "metadata.json", 'w') as f:
+            json.dump(bundle.metadata(), f, indent=2)
+
+    def load(self, version: str) -> ModelBundle:
+        """Load a saved bundle."""
+        path = self.root / version / "bundle.joblib"
+        if not path.exists():
+            raise FileNotFoundError(f"Model version not found: {version}")
+        return joblib.load(path)
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """Metadata of every saved version, oldest first."""
+        versions = []
+        for metadata_path in sorted(self.root.glob("*/metadata.json")):
+            with open(metadata_path, 'r') as f:
+                versions.append(json.load(f))
+        return versions
+
+    def active_version(self) -> Optional[str]:
+        """Version recorded as active, if any."""
+        pointer = self.root / "ACTIVE"
+        if not pointer.exists():
+            return None
+        return pointer.read_text().strip() or None
+
+    def set_active(self, version: str):
+        """Record ``version`` as active with an atomic rename."""
+        with self._lock:
+            tmp = self.root / f"ACTIVE.{os.getpid()}.tmp"
+            tmp.write_text(version)
+            os.replace(tmp, self.root / "ACTIVE")
+        logger.info(f"Active model version set to {version}")
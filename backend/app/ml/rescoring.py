@@ -0,0 +1,417 @@
+"""
+Re-scoring of stored decisions with a candidate model version.
+
+Run from the backend directory:
+
+    python -m app.ml.rescoring --candidate <version> --output rescoring/<version>
+    python -m app.ml.rescoring --candidate <version> --output rescoring/<version> --max-minutes 60
+
+Rerunning with the same output directory resumes an interrupted or
+time-limited run where it stopped.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.logging import logger
+from .fairness import age_groups, metrics_from_counts, TN, TP
+from .streaming import iter_scored_batches
+
+CHECKPOINT_FILE = "checkpoint.json"
+DELTAS_FILE = "deltas.jsonl"
+SUMMARY_FILE = "summary.json"
+
+# Counters kept per protected-attribute group
+COUNTERS = (
+    'count', 'old_shortlisted', 'new_shortlisted', 'to_shortlist', 'to_reject',
+    'score_delta_sum', 'abs_score_delta_sum'
+)
+
+# Worker-process state, set up once per process by _init_worker
+_worker_analyzer = None
+_worker_bundle = None
+
+
+def _init_worker(version: str, registry_root: str):
+    global _worker_analyzer, _worker_bundle
+    from .model import ResumeAnalyzer
+    from .registry import ModelRegistry
+    _worker_analyzer = ResumeAnalyzer(registry=ModelRegistry(registry_root))
+    _worker_bundle = _worker_analyzer.load_bundle(version)
+
+
+def shortlist_probability(decision: str, confidence: float) -> float:
+    """Model score from a stored (decision, confidence) pair."""
+    return confidence if decision == "shortlist" else 1 - confidence
+
+
+def score_batch(
+    analyzer: Any,
+    bundle: Any,
+    texts: List[str],
+    protected_attributes: List[Dict[str, Any]]
+) -> List[Tuple[float, str]]:
+    """
+    Shortlist probability and decision per resume under ``bundle``.
+
+    Preprocessing goes through the lemma cache, so resumes scored before
+    are not lemmatized again.
+    """
+    results = analyzer.predict_batch(texts, protected_attributes, bundle=bundle, use_cache=True)
+    return [
+        (shortlist_probability(decision, confidence), decision)
+        for decision, confidence, _, _ in results
+    ]
+
+
+def _score_in_worker(texts: List[str], protected_attributes: List[Dict[str, Any]]) -> List[Tuple[float, str]]:
+    return score_batch(_worker_analyzer, _worker_bundle, texts, protected_attributes)
+
+
+def group_label(attribute: str, value: Any) -> Optional[str]:
+    """Group a protected-attribute value falls in; numerical ones are binned."""
+    if value is None:
+        return None
+    if settings.PROTECTED_ATTRIBUTES.get(attribute, {}).get("type") == "numerical":
+        label = age_groups([value])[0]
+        return None if label is None else str(label)
+    return str(value)
+
+
+class DecisionDiff:
+    """
+    Running per-group counts of how decisions changed.
+
+    Kept as plain nested dicts (attribute -> group -> counters) so the
+    state can be checkpointed as JSON and the totals restored on restart.
+    The "all" attribute holds the overall totals.
+    """
+
+    def __init__(self, groups: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None):
+        self.groups = groups or {}
+
+    def add(
+        self,
+        protected_attributes: Dict[str, Any],
+        old_decision: str,
+        new_decision: str,
+        score_delta: float
+    ):
+        labels = {"all": "all"}
+        for attribute in settings.PROTECTED_ATTRIBUTES:
+            label = group_label(attribute, protected_attributes.get(attribute))
+            if label is not None:
+                labels[attribute] = label
+
+        old_shortlisted = old_decision == "shortlist"
+        new_shortlisted = new_decision == "shortlist"
+        for attribute, label in labels.items():
+            counters = self.groups.setdefault(attribute, {}).setdefault(
+                label, dict.fromkeys(COUNTERS, 0)
+            )
+            counters['count'] += 1
+            counters['old_shortlisted'] += old_shortlisted
+            counters['new_shortlisted'] += new_shortlisted
+            counters['to_shortlist'] += new_shortlisted and not old_shortlisted
+            counters['to_reject'] += old_shortlisted and not new_shortlisted
+            counters['score_delta_sum'] += score_delta
+            counters['abs_score_delta_sum'] += abs(score_delta)
+
+    def _fairness(self, attribute: str) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Demographic parity and disparate impact before and after, per unprivileged group."""
+        groups = self.groups.get(attribute, {})
+        privileged = settings.PROTECTED_ATTRIBUTES[attribute]["privileged"]
+        privileged = set(privileged if isinstance(privileged, list) else [privileged])
+        labels = sorted(label for label in groups if label not in privileged)
+        if not labels or not privileged & set(groups):
+            return {}
+
+        def table(label: str, column: str) -> np.ndarray:
+            # Selection rates only: decisions stand in for labels
+            row = np.zeros(4)
+            row[TP] = groups[label][column]
+            row[TN] = groups[label]['count'] - groups[label][column]
+            return row
+
+        results = {}
+        for column, when in (('old_shortlisted', 'old'), ('new_shortlisted', 'new')):
+            reference = sum(table(label, column) for label in privileged if label in groups)
+            unprivileged = np.array([table(label, column) for label in labels])
+            pooled = metrics_from_counts(unprivileged.sum(axis=0), reference)
+            per_group = metrics_from_counts(unprivileged, reference)
+            for i, label in enumerate(labels + ['all_unprivileged']):
+                for metric in ('demographic_parity', 'disparate_impact'):
+                    value = pooled[metric] if label == 'all_unprivileged' else per_group[metric][i]
+                    entry = results.setdefault(label, {}).setdefault(metric, {})
+                    entry[when] = float(value) if np.isfinite(value) else None
+
+        for metrics in results.values():
+            for entry in metrics.values():
+                both = entry['old'] is not None and entry['new'] is not None
+                entry['change'] = entry['new'] - entry['old'] if both else None
+        return results
+
+    def summary(self) -> Dict[str, Any]:
+        """Flip counts, selection rates and score shifts per group, plus fairness changes."""
+        def describe(counters: Dict[str, float]) -> Dict[str, Any]:
+            count = counters['count'] or 1
+            return {
+                'count': counters['count'],
+                'old_selection_rate': counters['old_shortlisted'] / count,
+                'new_selection_rate': counters['new_shortlisted'] / count,
+                'flips_to_shortlist': counters['to_shortlist'],
+                'flips_to_reject': counters['to_reject'],
+                'flip_rate': (counters['to_shortlist'] + counters['to_reject']) / count,
+                'mean_score_delta': counters['score_delta_sum'] / count,
+                'mean_abs_score_delta': counters['abs_score_delta_sum'] / count
+            }
+
+        summary = {'overall': describe(self.groups["all"]["all"]) if "all" in self.groups else {}}
+        for attribute in settings.PROTECTED_ATTRIBUTES:
+            summary[attribute] = {
+                'groups': {
+                    label: describe(counters)
+                    for label, counters in sorted(self.groups.get(attribute, {}).items())
+                },
+                'fairness': self._fairness(attribute)
+            }
+        return summary
+
+
+class RescoringJob:
+    """
+    Re-scores every stored resume with a candidate model version.
+
+    Resumes are read in id order in pages of ``batch_size`` and scored in
+    parallel by ``workers`` processes, each loading the candidate once;
+    the active model is never touched. Results are applied in page order:
+    each resume's score and decision delta is appended to
+    ``deltas.jsonl``, the per-group counts are updated, and a checkpoint
+    holding the last resume id, the size of the deltas file and the counts
+    is replaced atomically. A rerun with the same output directory
+    truncates the deltas to the checkpoint and continues after the last
+    id, so a crash or a spent ``max_seconds`` budget loses at most the
+    pages in flight.
+
+    Args:
+        candidate_version: Registry version to score with
+        output_dir: Where deltas, checkpoint and summary are written
+        analyzer: ResumeAnalyzer used for in-process scoring (``workers``
+            of 1 or less; created when not given) and whose registry the
+            workers load the candidate from
+        workers: Scoring processes
+        batch_size: Resumes per page
+        max_seconds: Stop after this long and leave a checkpoint; None
+            runs to completion
+    """
+
+    def __init__(
+        self,
+        candidate_version: str,
+        output_dir: str,
+        analyzer: Any = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_seconds: Optional[float] = None
+    ):
+        self.candidate_version = candidate_version
+        self.output_dir = Path(output_dir)
+        self.analyzer = analyzer
+        self.workers = workers if workers is not None else settings.RESCORING_WORKERS
+        self.batch_size = batch_size or settings.RESCORING_BATCH_SIZE
+        self.max_seconds = max_seconds
+
+        self.diff = DecisionDiff()
+        self.last_resume_id = 0
+        self.processed = 0
+        self.elapsed = 0.0
+        self._deltas = None
+        self._bundle = None
+
+    def _load_checkpoint(self):
+        path = self.output_dir / CHECKPOINT_FILE
+        deltas = self.output_dir / DELTAS_FILE
+        if not path.exists():
+            # Anything without a checkpoint is from a run that saved nothing
+            deltas.unlink(missing_ok=True)
+            return
+        with open(path, 'r') as f:
+            checkpoint = json.load(f)
+        if checkpoint["candidate_version"] != self.candidate_version:
+            raise ValueError(
+                f"{self.output_dir} holds a run for {checkpoint['candidate_version']}, "
+                f"not {self.candidate_version}"
+            )
+        self.last_resume_id = checkpoint["last_resume_id"]
+        self.processed = checkpoint["processed"]
+        self.elapsed = checkpoint["elapsed_seconds"]
+        self.diff = DecisionDiff(checkpoint["groups"])
+        # Drop deltas written after the checkpoint; their pages are redone
+        with open(deltas, 'ab') as f:
+            f.truncate(checkpoint["deltas_bytes"])
+        logger.info(f"Resuming re-scoring after resume {self.last_resume_id} ({self.processed} done)")
+
+    def _save_checkpoint(self, elapsed: float):
+        self._deltas.flush()
+        os.fsync(self._deltas.fileno())
+        checkpoint = {
+            "candidate_version": self.candidate_version,
+            "last_resume_id": self.last_resume_id,
+            "processed": self.processed,
+            "deltas_bytes": self._deltas.tell(),
+            "elapsed_seconds": elapsed,
+            "updated_at": datetime.utcnow().isoformat(),
+            "groups": self.diff.groups
+        }
+        tmp = self.output_dir / f"{CHECKPOINT_FILE}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, self.output_dir / CHECKPOINT_FILE)
+
+    def _apply(self, rows: List[Dict[str, Any]], scores: List[Tuple[float, str]]):
+        lines = []
+        for row, (new_score, new_decision) in zip(rows, scores):
+            old_score = shortlist_probability(row["decision"], row["confidence"])
+            delta = new_score - old_score
+            self.diff.add(row["protected_attributes"], row["decision"], new_decision, delta)
+            lines.append(json.dumps({
+                "resume_id": row["resume_id"],
+                "baseline_version": row["model_version"],
+                "old_score": old_score,
+                "new_score": new_score,
+                "score_delta": delta,
+                "old_decision": row["decision"],
+                "new_decision": new_decision,
+                "flipped": row["decision"] != new_decision,
+                "protected_attributes": row["protected_attributes"]
+            }, separators=(',', ':')))
+        self._deltas.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        self.last_resume_id = rows[-1]["resume_id"]
+        self.processed += len(rows)
+
+    def _score_in_process(self, rows: List[Dict[str, Any]]) -> List[Tuple[float, str]]:
+        if self.analyzer is None:
+            from .model import ResumeAnalyzer
+            self.analyzer = ResumeAnalyzer()
+        if self._bundle is None:
+            self._bundle = self.analyzer.load_bundle(self.candidate_version)
+        return score_batch(
+            self.analyzer,
+            self._bundle,
+            [row["content"] for row in rows],
+            [row["protected_attributes"] for row in rows]
+        )
+
+    def run(self, db: Session) -> Dict[str, Any]:
+        """
+        Score every resume not yet covered by the checkpoint.
+
+        Returns:
+            The summary: run state ("complete" or "stopped"), progress and
+            the per-group flip and fairness report, also written to
+            ``summary.json``
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._load_checkpoint()
+        started = time.monotonic()
+        deadline = started + self.max_seconds if self.max_seconds else None
+
+        pool = None
+        if self.workers > 1:
+            registry_root = str(self.analyzer.registry.root) if self.analyzer else settings.MODEL_REGISTRY_DIR
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.candidate_version, registry_root)
+            )
+
+        # Enough pages in flight to keep every worker busy, few enough to bound memory
+        pending = deque()
+        stopped = False
+        self._deltas = open(self.output_dir / DELTAS_FILE, 'ab')
+        try:
+            for rows in iter_scored_batches(db, self.batch_size, self.last_resume_id):
+                if deadline is not None and time.monotonic() >= deadline:
+                    stopped = True
+                    break
+                if pool is None:
+                    self._apply(rows, self._score_in_process(rows))
+                    self._save_checkpoint(self.elapsed + time.monotonic() - started)
+                    continue
+                pending.append((rows, pool.submit(
+                    _score_in_worker,
+                    [row["content"] for row in rows],
+                    [row["protected_attributes"] for row in rows]
+                )))
+                if len(pending) >= 2 * self.workers:
+                    rows, future = pending.popleft()
+                    self._apply(rows, future.result())
+                    self._save_checkpoint(self.elapsed + time.monotonic() - started)
+            while pending:
+                rows, future = pending.popleft()
+                self._apply(rows, future.result())
+                self._save_checkpoint(self.elapsed + time.monotonic() - started)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            self._deltas.close()
+
+        self.elapsed += time.monotonic() - started
+        summary = {
+            "state": "stopped" if stopped else "complete",
+            "candidate_version": self.candidate_version,
+            "processed": self.processed,
+            "last_resume_id": self.last_resume_id,
+            "elapsed_seconds": self.elapsed,
+            "resumes_per_second": self.processed / self.elapsed if self.elapsed else 0.0,
+            **self.diff.summary()
+        }
+        with open(self.output_dir / SUMMARY_FILE, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        logger.info(
+            f"Re-scoring with {self.candidate_version} {summary['state']}: {self.processed} resumes, "
+            f"flip rate {summary['overall'].get('flip_rate', 0.0):.3%}"
+        )
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidate', required=True, help="Registry version to score with")
+    parser.add_argument('--output', required=True, help="Directory for deltas, checkpoint and summary")
+    parser.add_argument('--workers', type=int, default=settings.RESCORING_WORKERS)
+    parser.add_argument('--batch-size', type=int, default=settings.RESCORING_BATCH_SIZE)
+    parser.add_argument('--max-minutes', type=float, help="Stop after this long; rerun to continue")
+    parser.add_argument('--database-url', default=settings.SQLALCHEMY_DATABASE_URI)
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+
+    engine = create_engine(args.database_url)
+    job = RescoringJob(
+        args.candidate,
+        args.output,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        max_seconds=args.max_minutes * 60 if args.max_minutes else None
+    )
+    with Session(engine) as db:
+        summary = job.run(db)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
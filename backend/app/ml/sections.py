@@ -0,0 +1,313 @@
+"""
+Rule-based resume sectioning and entity patterns.
+
+A cheap structured-feature extractor: one pass over the lines splits the
+resume into sections, experience entries get date-range arithmetic, and a
+pattern layer in the style of spaCy's EntityRuler labels skills, degrees,
+date ranges and contact details with a single compiled regex.
+"""
+import re
+from datetime import date
+from typing import Dict, List, Tuple, Any, Optional, Sequence
+
+
+SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby',
+    'php', 'swift', 'kotlin', 'go', 'rust', 'sql', 'nosql', 'mongodb',
+    'postgresql', 'mysql', 'redis', 'react', 'angular', 'vue', 'node.js',
+    'django', 'flask', 'spring', 'tensorflow', 'pytorch', 'scikit-learn',
+    'pandas', 'numpy', 'aws', 'azure', 'gcp', 'docker', 'kubernetes'
+]
+
+SECTION_ALIASES = {
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment',
+        'employment history', 'work history', 'career history'
+    ],
+    'education': ['education', 'academic background', 'qualifications', 'academic qualifications'],
+    'skills': ['skills', 'technical skills', 'core competencies', 'technologies', 'tech stack'],
+    'summary': ['summary', 'profile', 'objective', 'about me'],
+    'projects': ['projects', 'selected projects'],
+    'certifications': ['certifications', 'certificates', 'licenses'],
+    'publications': ['publications', 'papers'],
+    'contact': ['contact', 'contact information', 'contact details', 'personal information']
+}
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sept?|oct|nov|dec)[a-z]*\.?'
+_DATE = r'(?:{month}\s+)?(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)\d{{2}}'.format(month=_MONTH)
+_ONGOING = r'present|current|now|today|date'
+
+DATE_RANGE = re.compile(
+    rf'(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|{_ONGOING})',
+    re.IGNORECASE
+)
+DEGREE = (
+    r"ph\.?\s?d\.?|doctorate|mba|m\.?\s?sc\.?|m\.?\s?s\.?|m\.?\s?a\.?|master(?:'s)?(?:\s+of\s+\w+)?"
+    r"|b\.?\s?sc\.?|b\.?\s?s\.?|b\.?\s?a\.?|b\.?\s?eng\.?|bachelor(?:'s)?(?:\s+of\s+\w+)?|associate(?:'s)?"
+)
+YEARS_OF_EXPERIENCE = re.compile(r'(\d+)\s*(?:years?|yrs?)\s*(?:of)?\s*experience')
+BULLET = re.compile(r'^\s*(?:[-*•·▪‣]|\d+[.)])\s*')
+ENTRY_SEPARATOR = re.compile(r'\s+(?:at|@)\s+|\s+[-–—|]\s+|,\s+')
+LIST_SEPARATOR = re.compile(r'\s*[,;|•·]\s*')
+
+_SECTION_BY_ALIAS = {
+    alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+
+class PatternRuler:
+    """
+    Labels spans of text from phrase and regex patterns, like spaCy's EntityRuler.
+
+    All patterns are compiled into one alternation with a named group per
+    label and matched against the lowercased text, so labelling a
+    document is a single case-insensitive ``finditer`` pass. Phrases are tried longest first and must be
+    delimited by non-word characters, so "java" does not match inside
+    "javascript" and "go" does not match inside "good".
+
+    Args:
+        patterns: Dicts with a ``label`` and either a literal ``phrase``
+            or a ``regex`` written for lowercase text
+    """
+
+    def __init__(self, patterns: Sequence[Dict[str, str]]):
+        alternatives: Dict[str, List[str]] = {}
+        for pattern in patterns:
+            if 'phrase' in pattern:
+                alternatives.setdefault(pattern['label'], []).append(re.escape(pattern['phrase'].lower()))
+            else:
+                alternatives.setdefault(pattern['label'], []).append(f"(?:{pattern['regex']})")
+
+        groups = []
+        for label, options in alternatives.items():
+            options = sorted(options, key=len, reverse=True)
+            groups.append(f"(?P<{label}>{'|'.join(options)})")
+        self.labels = list(alternatives)
+        source = r'(?<!\w)(?:' + '|'.join(groups) + r')(?!\w)'
+        # Matching lowercased text is about twice as fast as IGNORECASE;
+        # the flagged pattern covers text whose length lowercasing changes
+        self._pattern = re.compile(source)
+        self._pattern_ignorecase = re.compile(source, re.IGNORECASE)
+
+    def __call__(self, text: str) -> List[Tuple[str, str, int, int]]:
+        """Non-overlapping (label, text, start, end) matches in document order."""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self._pattern.finditer(lowered)
+        else:
+            matches = self._pattern_ignorecase.finditer(text)
+        return [
+            (match.lastgroup, text[match.start():match.end()], match.start(), match.end())
+            for match in matches
+        ]
+
+
+DEFAULT_PATTERNS = (
+    [{'label': 'SKILL', 'phrase': skill} for skill in SKILLS]
+    + [{'label': 'SKILL', 'phrase': phrase} for phrase in (
+        'machine learning', 'deep learning', 'statistical analysis', 'data analysis',
+        'natural language processing', 'computer vision', 'spark', 'hadoop', 'airflow'
+    )]
+    + [
+        {'label': 'DATE_RANGE', 'regex': DATE_RANGE.pattern.replace('?P<start>', '').replace('?P<end>', '')},
+        {'label': 'DEGREE', 'regex': DEGREE},
+        {'label': 'EMAIL', 'regex': r'[\w.+-]+@[\w-]+\.[\w.-]+'},
+        {'label': 'URL', 'regex': r'(?:https?://|www\.)[^\s,;()]+'},
+        {'label': 'PHONE', 'regex': r'\+?\d[\d\s().-]{7,}\d'}
+    ]
+)
+
+_default_ruler: Optional[PatternRuler] = None
+
+
+def default_ruler() -> PatternRuler:
+    """The ruler built from DEFAULT_PATTERNS, compiled on first use."""
+    global _default_ruler
+    if _default_ruler is None:
+        _default_ruler = PatternRuler(DEFAULT_PATTERNS)
+    return _default_ruler
+
+
+def _month_index(value: str, today: date) -> int:
+    """Months since year 0 for one side of a date range."""
+    value = value.strip().lower()
+    if re.fullmatch(_ONGOING, value):
+        return today.year * 12 + today.month - 1
+
+    if '/' in value:
+        month, year = value.split('/')
+        return int(year) * 12 + int(month) - 1
+
+    parts = value.split()
+    year = int(parts[-1])
+    month = MONTHS[parts[0][:3]] if len(parts) > 1 else 1
+    return year * 12 + month - 1
+
+
+def _format_month(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def parse_date_range(text: str, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    """
+    First date range in ``text`` with its start and end month and duration.
+
+    Year-only bounds count from January, so "2015-2018" is three years;
+    "present" and similar resolve to ``today``.
+    """
+    match = DATE_RANGE.search(text)
+    if match is None:
+        return None
+    today = today or date.today()
+    start = _month_index(match.group('start'), today)
+    end = max(start, _month_index(match.group('end'), today))
+    return {
+        'text': match.group(),
+        'start': _format_month(start),
+        'end': _format_month(end),
+        'years': round((end - start) / 12, 2),
+        'ongoing': bool(re.fullmatch(_ONGOING, match.group('end').strip(), re.IGNORECASE))
+    }
+
+
+def total_experience_years(ranges: List[Dict[str, Any]]) -> float:
+    """Years covered by the union of the ranges, so overlapping roles count once."""
+    spans = sorted(
+        (int(r['start'][:4]) * 12 + int(r['start'][5:]) - 1, int(r['end'][:4]) * 12 + int(r['end'][5:]) - 1)
+        for r in ranges
+    )
+    total, current_start, current_end = 0, None, None
+    for start, end in spans:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return round(total / 12, 1)
+
+
+def split_sections(text: str) -> Dict[str, List[str]]:
+    """
+    Lines of the resume grouped by section, in one pass.
+
+    A heading is a line holding only a known section name, optionally
+    followed by a colon and inline content ("Skills: Python, SQL"). Lines
+    before the first heading go to "header".
+    """
+    sections: Dict[str, List[str]] = {'header': []}
+    current = 'header'
+    for line in text.splitlines():
+        # A dictionary lookup on the text before any colon, not a regex per line
+        name, colon, rest = line.partition(':')
+        section = _SECTION_BY_ALIAS.get(' '.join(name.strip().lstrip('#').lower().split()))
+        if section is not None:
+            current = section
+            sections.setdefault(current, [])
+            line = rest
+        line = line.strip()
+        if line:
+            sections[current].append(line)
+    return sections
+
+
+def _parse_experience(lines: List[str], today: date) -> List[Dict[str, Any]]:
+    """Experience entries; lines without a role or dates extend the previous entry."""
+    entries = []
+    for line in lines:
+        line = BULLET.sub('', line)
+        dates = parse_date_range(line, today)
+        remainder = line.replace(dates['text'], '') if dates else line
+        remainder = re.sub(r'[()\[\]]', ' ', remainder).strip(' ,;-–—|')
+        parts = [part.strip() for part in ENTRY_SEPARATOR.split(remainder, maxsplit=1)]
+
+        if dates is None and len(parts) < 2 and entries:
+            entries[-1]['details'].append(line)
+            continue
+
+        entries.append({
+            'title': parts[0] or None,
+            'organization': parts[1] if len(parts) > 1 and parts[1] else None,
+            'dates': dates,
+            'details': []
+        })
+    return entries
+
+
+def _parse_education(lines: List[str], ruler: PatternRuler) -> List[Dict[str, Any]]:
+    """Education entries with degree, field, institution and year when present."""
+    entries = []
+    for line in lines:
+        line = BULLET.sub('', line)
+        degree = next((m for m in ruler(line) if m[0] == 'DEGREE'), None)
+        year = re.search(r'(?:19|20)\d{2}', line)
+        rest = line[degree[3]:] if degree else line
+        rest = re.sub(r'\(?(?:19|20)\d{2}\)?', '', rest)
+        parts = [part.strip(' ,;-–—') for part in re.split(r',|\s+[-–—|]\s+|\s+at\s+', rest, maxsplit=1)]
+        field = re.sub(r'^(?:in|of)\s+', '', parts[0], flags=re.IGNORECASE) if parts[0] else None
+        entries.append({
+            'degree': degree[1] if degree else None,
+            'field': field or None,
+            'institution': parts[1] if len(parts) > 1 and parts[1] else None,
+            'year': int(year.group()) if year else None
+        })
+    return entries
+
+
+def parse_resume(
+    text: str,
+    today: Optional[date] = None,
+    ruler: Optional[PatternRuler] = None
+) -> Dict[str, Any]:
+    """
+    Structured features from a resume without statistical NER.
+
+    Args:
+        text: Raw resume text
+        today: Date that "present" resolves to; defaults to today
+        ruler: Pattern layer; defaults to DEFAULT_PATTERNS
+
+    Returns:
+        Dictionary with parsed ``sections`` (experience, education and
+        skills entries), pattern ``entities`` as lists per label in
+        document order, the union of experience date ranges in
+        ``experience_years``, and any explicitly stated years of
+        experience in ``stated_experience_years``
+    """
+    today = today or date.today()
+    ruler = ruler or default_ruler()
+    lines = split_sections(text)
+
+    experience = _parse_experience(lines.get('experience', []), today)
+    education = _parse_education(lines.get('education', []), ruler)
+
+    skills = []
+    for line in lines.get('skills', []):
+        for item in LIST_SEPARATOR.split(BULLET.sub('', line)):
+            item = item.strip(' .')
+            if item and item.lower() not in (skill.lower() for skill in skills):
+                skills.append(item)
+
+    entities: Dict[str, List[str]] = {}
+    for label, span, _, _ in ruler(text):
+        entities.setdefault(label, []).append(span)
+    for entry in experience:
+        if entry['organization']:
+            entities.setdefault('ORG', []).append(entry['organization'])
+    for entry in education:
+        if entry['institution']:
+            entities.setdefault('ORG', []).append(entry['institution'])
+
+    stated = YEARS_OF_EXPERIENCE.search(text.lower())
+    return {
+        'sections': {'experience': experience, 'education': education, 'skills': skills},
+        'entities': entities,
+        'experience_years': total_experience_years([e['dates'] for e in experience if e['dates']]),
+        'stated_experience_years': int(stated.group(1)) if stated else 0
+    }
@@ -0,0 +1,224 @@
+"""
+Shadow evaluation of a candidate model on live traffic.
+"""
+import queue
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.logging import logger
+from ..core.metrics import counter
+from .rescoring import DecisionDiff, shortlist_probability
+
+# Score distributions are kept as counts over equal-width bins on [0, 1]
+SCORE_BINS = 20
+
+
+class ShadowEvaluator:
+    """
+    Scores live traffic with a candidate model next to the production one.
+
+    The analyzer hands every live prediction, as the preprocessed text it
+    already produced plus its production decision, to ``offer``, which
+    only puts it on a bounded queue. A background thread takes batches off
+    the queue and scores them with the candidate bundle, so the candidate
+    never preprocesses anything again and production requests never wait
+    for it. When the queue is full the prediction is dropped and counted.
+
+    Agreement, score distributions and per-group selection rates and
+    fairness for both models accumulate until the next ``start``. In the
+    per-group report, "old" is the production model and "new" the shadow.
+
+    Args:
+        analyzer: ResumeAnalyzer serving production
+        queue_size: Predictions waiting for the shadow model before new
+            ones are dropped
+        batch_size: Largest batch the shadow model scores at once
+        sample_rate: Share of live predictions offered to the shadow model
+        max_wait_ms: How long the shadow model waits to fill a batch
+    """
+
+    def __init__(
+        self,
+        analyzer: Any,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        sample_rate: Optional[float] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        self.analyzer = analyzer
+        self.batch_size = batch_size or settings.SHADOW_BATCH_SIZE
+        self.sample_rate = sample_rate if sample_rate is not None else settings.SHADOW_SAMPLE_RATE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.SHADOW_MAX_WAIT_MS) / 1000
+        self.bundle = None
+        self.status: Dict[str, Any] = {"state": "idle"}
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or settings.SHADOW_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._reset()
+
+        self.predictions_total = counter(
+            "shadow_predictions_total", "Live predictions scored by the shadow model"
+        )
+        self.dropped_total = counter(
+            "shadow_dropped_total", "Live predictions dropped because the shadow queue was full"
+        )
+        self.disagreements_total = counter(
+            "shadow_disagreements_total", "Shadow decisions that differ from production"
+        )
+
+    def _reset(self):
+        self.diff = DecisionDiff()
+        self.scored = 0
+        self.dropped = 0
+        self.errors = 0
+        self.production_versions: Dict[str, int] = {}
+        self.score_counts = {
+            "production": np.zeros(SCORE_BINS, dtype=np.int64),
+            "shadow": np.zeros(SCORE_BINS, dtype=np.int64)
+        }
+        self.score_sums = {"production": 0.0, "shadow": 0.0}
+        self.started_at = time.time()
+
+    def start(self, version: str):
+        """
+        Load ``version`` and start shadowing with it.
+
+        Blocks while the bundle loads; the API runs it as a background
+        task. Statistics from an earlier shadow version are discarded.
+        """
+        self.status = {"state": "loading", "version": version}
+        try:
+            bundle = self.analyzer.load_bundle(version)
+        except Exception as e:
+            self.status = {"state": "failed", "version": version, "error": str(e)}
+            logger.error(f"Error loading shadow model version {version}: {str(e)}")
+            raise
+
+        with self._lock:
+            self._reset()
+            self.bundle = bundle
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+            self._worker.start()
+
+        self.status = {"state": "active", "version": version}
+        logger.info(f"Shadowing production traffic with model version {version}")
+
+    def stop(self):
+        """Stop shadowing; queued predictions are discarded."""
+        self.bundle = None
+        self.status = {"state": "idle"}
+
+    def offer(
+        self,
+        processed: List[str],
+        protected_attributes: List[Optional[Dict[str, Any]]],
+        decisions: List[Tuple[str, float]]
+    ):
+        """
+        Queue live predictions for the shadow model without blocking.
+
+        Args:
+            processed: Preprocessed texts production scored
+            protected_attributes: Attributes per resume
+            decisions: Production (decision, confidence) per resume
+        """
+        bundle = self.bundle
+        if bundle is None:
+            return
+        version = self.analyzer.bundle.version
+        for text, attributes, (decision, confidence) in zip(processed, protected_attributes, decisions):
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                continue
+            try:
+                self._queue.put_nowait((bundle, text, attributes or {}, decision, confidence, version))
+            except queue.Full:
+                self.dropped += 1
+                self.dropped_total.inc()
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            # Linger for a fuller batch: one scoring call per batch costs the
+            # request threads far less GIL time than one per prediction
+            deadline = time.monotonic() + self.max_wait
+            while len(items) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    items.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Predictions queued for a version that has since been replaced
+            bundle = self.bundle
+            items = [item for item in items if item[0] is bundle]
+            if not items:
+                continue
+            try:
+                self._score(bundle, items)
+            except Exception as e:
+                self.errors += len(items)
+                logger.error(f"Shadow scoring of {len(items)} predictions failed: {str(e)}")
+
+    def _score(self, bundle: Any, items: List[Tuple]):
+        attributes = [item[2] for item in items]
+        shadow = self.analyzer.score_processed([item[1] for item in items], attributes, bundle)
+
+        disagreements = 0
+        with self._lock:
+            if bundle is not self.bundle:
+                return
+            for (_, _, attrs, decision, confidence, version), (shadow_decision, shadow_confidence) in zip(items, shadow):
+                production_score = shortlist_probability(decision, confidence)
+                shadow_score = shortlist_probability(shadow_decision, shadow_confidence)
+                self.diff.add(attrs, decision, shadow_decision, shadow_score - production_score)
+                for model, score in (("production", production_score), ("shadow", shadow_score)):
+                    self.score_counts[model][min(int(score * SCORE_BINS), SCORE_BINS - 1)] += 1
+                    self.score_sums[model] += score
+                self.production_versions[version] = self.production_versions.get(version, 0) + 1
+                disagreements += decision != shadow_decision
+            self.scored += len(items)
+
+        self.predictions_total.inc(len(items))
+        self.disagreements_total.inc(disagreements)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        """Shadow state, queue, agreement, score distributions and per-group comparison."""
+        with self._lock:
+            summary = self.diff.summary()
+            scored = self.scored
+            offered = scored + self.dropped
+            return {
+                **self.status,
+                "since": self.started_at,
+                "production_versions": dict(self.production_versions),
+                "queue_depth": self.queue_depth,
+                "queue_size": self._queue.maxsize,
+                "sample_rate": self.sample_rate,
+                "scored": scored,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "drop_rate": self.dropped / offered if offered else 0.0,
+                "disagreement_rate": summary["overall"].get("flip_rate", 0.0),
+                "score_distributions": {
+                    "bin_edges": np.linspace(0.0, 1.0, SCORE_BINS + 1).round(4).tolist(),
+                    **{
+                        model: {
+                            "counts": counts.tolist(),
+                            "mean": self.score_sums[model] / scored if scored else None
+                        }
+                        for model, counts in self.score_counts.items()
+                    }
+                },
+                "comparison": summary
+            }
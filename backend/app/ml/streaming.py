@@ -0,0 +1,90 @@
+"""
+Constant-memory training data sources for ResumeAnalyzer.train_streaming.
+"""
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List, Tuple
+
+from ..models.resume import Resume, Analysis, BiasMetrics
+
+
+def iter_labeled_batches(
+    db: Session,
+    batch_size: int = 1000
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """
+    Page labeled resumes out of the database without loading the corpus.
+
+    Uses ``yield_per``, which streams rows through a server-side cursor
+    on PostgreSQL, so only one batch of rows is held in memory at a time.
+    The stored decision of each analysis is the training label.
+
+    Yields:
+        Tuples of resume texts and labels (1 for shortlist, 0 for reject)
+    """
+    statement = select(Resume.content, Analysis.decision).join(
+        Analysis, Analysis.resume_id == Resume.id
+    ).order_by(Resume.id).execution_options(yield_per=batch_size)
+
+    for partition in db.execute(statement).partitions(batch_size):
+        texts = [row[0] for row in partition]
+        labels = np.array([1 if row[1] == "shortlist" else 0 for row in partition])
+        yield texts, labels
+
+
+def iter_scored_batches(
+    db: Session,
+    batch_size: int = 1000,
+    after_id: int = 0
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page stored resumes with their latest decision, in resume id order.
+
+    Streams like ``iter_labeled_batches``. Only resumes with an id above
+    ``after_id`` are read, so a caller that records the last id it handled
+    can resume from there without rereading anything.
+
+    Yields:
+        Lists of dicts with ``resume_id``, ``content``, ``decision``,
+        ``confidence``, ``model_version`` and ``protected_attributes``
+        (empty when no bias metrics were stored)
+    """
+    latest_analysis = select(
+        Analysis.resume_id, func.max(Analysis.id).label("id")
+    ).group_by(Analysis.resume_id).subquery()
+    latest_metrics = select(
+        BiasMetrics.resume_id, func.max(BiasMetrics.id).label("id")
+    ).group_by(BiasMetrics.resume_id).subquery()
+
+    statement = select(
+        Resume.id,
+        Resume.content,
+        Analysis.decision,
+        Analysis.confidence,
+        Analysis.model_version,
+        BiasMetrics.protected_attributes
+    ).join(
+        latest_analysis, latest_analysis.c.resume_id == Resume.id
+    ).join(
+        Analysis, Analysis.id == latest_analysis.c.id
+    ).outerjoin(
+        latest_metrics, latest_metrics.c.resume_id == Resume.id
+    ).outerjoin(
+        BiasMetrics, BiasMetrics.id == latest_metrics.c.id
+    ).where(
+        Resume.id > after_id
+    ).order_by(Resume.id).execution_options(yield_per=batch_size)
+
+    for partition in db.execute(statement).partitions(batch_size):
+        yield [
+            {
+                "resume_id": row[0],
+                "content": row[1],
+                "decision": row[2],
+                "confidence": row[3],
+                "model_version": row[4],
+                "protected_attributes": row[5] or {}
+            }
+            for row in partition
+        ]
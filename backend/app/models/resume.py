@@ -22,12 +22,13 @@ class Analysis(Base):
     __tablename__ = "analyses"
     
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"))
+    resume_id = Column(Integer, ForeignKey("resumes.id"), index=True)
     score = Column(Float, nullable=False)
     decision = Column(String, nullable=False)  # "shortlist" or "reject"
     confidence = Column(Float, nullable=False)
     feature_importance = Column(JSON)
     explanation = Column(String)
+    model_version = Column(String, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     resume = relationship("Resume", back_populates="analysis_results")
@@ -36,7 +37,7 @@ class BiasMetrics(Base):
     __tablename__ = "bias_metrics"
     
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"))
+    resume_id = Column(Integer, ForeignKey("resumes.id"), index=True)
     demographic_parity = Column(Float)
     equal_opportunity = Column(Float)
     disparate_impact = Column(Float)
@@ -0,0 +1,188 @@
+"""
+Benchmark the API in-process: metrics SQL endpoints and full analysis requests.
+
+The metrics router runs against an in-memory SQLite database seeded with
+synthetic analyses, and requests go through an in-process ASGI client, so
+no server or PostgreSQL instance is needed.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_api --rows 5000 --requests 200 --concurrency 1 8 32
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Tuple
+
+import httpx
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.bench_batching import _drive
+from benchmarks.bench_preprocessing import resume_like_texts
+
+
+METRICS_ENDPOINTS = ('/summary', '/trends', '/protected-attributes', '/intersectional')
+
+
+def seeded_session_factory(rows: int, seed: int = 0, days: int = 60) -> sessionmaker:
+    """In-memory SQLite database holding ``rows`` resumes with analyses and bias metrics."""
+    from app.db.base import Base
+    from app.models.resume import Resume, Analysis, BiasMetrics
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    genders = rng.choice(['male', 'female', 'other'], rows, p=[0.48, 0.48, 0.04])
+    ages = rng.integers(18, 66, rows)
+    shortlisted = rng.random(rows) < np.where(genders == 'male', 0.45, 0.35)
+    created = [now - timedelta(seconds=int(s)) for s in rng.integers(0, days * 86400, rows)]
+
+    with Session() as session:
+        session.add_all([
+            Resume(id=i + 1, filename=f"resume_{i}.txt", content="", created_at=created[i])
+            for i in range(rows)
+        ])
+        session.add_all([
+            Analysis(
+                resume_id=i + 1,
+                score=float(rng.random()),
+                decision="shortlist" if shortlisted[i] else "reject",
+                confidence=float(rng.uniform(0.5, 1.0)),
+                model_version="benchmark",
+                created_at=created[i]
+            )
+            for i in range(rows)
+        ])
+        session.add_all([
+            BiasMetrics(
+                resume_id=i + 1,
+                demographic_parity=float(rng.uniform(0.7, 1.0)),
+                equal_opportunity=float(rng.uniform(0.7, 1.0)),
+                disparate_impact=float(rng.uniform(0.7, 1.2)),
+                protected_attributes={"gender": str(genders[i]), "age": int(ages[i])},
+                created_at=created[i]
+            )
+            for i in range(rows)
+        ])
+        session.commit()
+
+    return Session
+
+
+def _client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+
+def metrics_endpoints(rows: int = 5000, repeats: int = 5) -> Dict[str, Any]:
+    """Median milliseconds per metrics endpoint over the seeded database."""
+    from fastapi import FastAPI
+    from app.api.routes import metrics
+    from app.db.base import get_db
+
+    Session = seeded_session_factory(rows)
+
+    def get_seeded_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(metrics.router, prefix="/api/v1/metrics")
+    app.dependency_overrides[get_db] = get_seeded_db
+
+    async def measure() -> Dict[str, Any]:
+        results = {}
+        async with _client(app) as client:
+            for endpoint in METRICS_ENDPOINTS:
+                url = f"/api/v1/metrics{endpoint}"
+                response = await client.get(url)
+                if response.status_code != 200:
+                    # e.g. /trends uses PostgreSQL's date_trunc, which SQLite lacks
+                    results[endpoint] = {'status': response.status_code}
+                    continue
+                samples = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    await client.get(url)
+                    samples.append(time.perf_counter() - start)
+                results[endpoint] = {'status': 200, 'p50_ms': statistics.median(samples) * 1e3}
+        return results
+
+    return {'rows': rows, 'endpoints': asyncio.run(measure())}
+
+
+def analysis_requests(requests: int = 200, concurrency: Tuple[int, ...] = (1, 8, 32)) -> Dict[str, Any]:
+    """Throughput and latency of POST /api/analyze-resume at several concurrency levels."""
+    from app.db import init_db
+    from app import main
+
+    texts = resume_like_texts(requests, seed=2)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep the uploaded resumes and analyses out of the repository
+        init_db.RESUME_DIR = init_db.ANALYSIS_DIR = directory
+
+        async def measure(clients: int) -> Dict[str, Any]:
+            failures = []
+            async with _client(main.app) as client:
+                async def analyze(text):
+                    response = await client.post(
+                        "/api/analyze-resume",
+                        params={"gender": "female", "age": 30},
+                        files={"file": ("resume.txt", text.encode('utf-8'), "text/plain")}
+                    )
+                    if response.status_code != 200:
+                        failures.append(response.status_code)
+
+                await analyze(texts[0])
+                measured = await _drive(analyze, texts, clients)
+            await main.prediction_batcher.stop()
+            return {**measured, 'errors': len(failures)}
+
+        for clients in concurrency:
+            results[clients] = asyncio.run(measure(clients))
+
+    return {'requests': requests, 'concurrency': results}
+
+
+def run(
+    rows: int = 5000,
+    requests: int = 200,
+    concurrency: Tuple[int, ...] = (1, 8, 32),
+    repeats: int = 5
+) -> Dict[str, Any]:
+    """Time the metrics endpoints and full analysis requests."""
+    return {
+        'metrics_endpoints': metrics_endpoints(rows, repeats),
+        'analysis_requests': analysis_requests(requests, concurrency)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.rows, args.requests, tuple(args.concurrency), args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark the decision audit log: caller-side record cost, write throughput and time-range reads.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_audit --records 500000
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any
+
+
+def run(records: int = 500_000, window_fraction: float = 0.01, repeats: int = 5) -> Dict[str, Any]:
+    """
+    Record ``records`` decisions, then read a window of ``window_fraction``
+    of the time span with and without the segment index.
+    """
+    from app.db.audit import AuditLog
+
+    content = "Experienced data engineer with Python and SQL. " * 40
+    with tempfile.TemporaryDirectory() as directory:
+        # Small segments so range reads have segments to skip
+        audit = AuditLog(directory, segment_bytes=8 * 2 ** 20)
+
+        start = time.perf_counter()
+        for i in range(records):
+            audit.record(
+                content, "benchmark", 0.73, "shortlist" if i % 3 else "reject",
+                {"gender": "female", "age": 30}, resume_id=i
+            )
+        record_seconds = time.perf_counter() - start
+        audit.close()
+        total_seconds = time.perf_counter() - start
+
+        entries = list(audit.read())
+        first, last = entries[0]["timestamp"], entries[-1]["timestamp"]
+        middle = (first + last) // 2
+        half_window = max(1, int((last - first) * window_fraction / 2))
+        start_ms, end_ms = middle - half_window, middle + half_window
+        window_start = datetime.fromtimestamp(start_ms / 1000, timezone.utc)
+        window_end = datetime.fromtimestamp(end_ms / 1000, timezone.utc)
+
+        def timed(read) -> Dict[str, Any]:
+            samples, count = [], 0
+            for _ in range(repeats):
+                begin = time.perf_counter()
+                count = sum(1 for _ in read())
+                samples.append(time.perf_counter() - begin)
+            return {'records': count, 'p50_ms': statistics.median(samples) * 1e3}
+
+        indexed = timed(lambda: audit.read(window_start, window_end))
+        # The same window found by scanning every record
+        scanned = timed(lambda: (
+            entry for entry in audit.read() if start_ms <= entry["timestamp"] < end_ms
+        ))
+        stats = audit.stats()
+
+    return {
+        'records': records,
+        'record_us': record_seconds / records * 1e6,
+        'write_per_second': records / total_seconds,
+        'bytes_per_record': stats['bytes'] / records,
+        'segments': stats['segments'],
+        'window_read': indexed,
+        'window_full_scan': scanned,
+        'speedup_window_read': scanned['p50_ms'] / indexed['p50_ms']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=500_000)
+    parser.add_argument('--window-fraction', type=float, default=0.01)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.records, args.window_fraction, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark prediction throughput with and without micro-batching under concurrency.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_batching --requests 2000 --concurrency 1 8 32 128
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, Any, List
+
+import numpy as np
+
+from benchmarks.bench_streaming import synthetic_batches
+
+
+async def _drive(predict, texts: List[str], concurrency: int) -> Dict[str, float]:
+    """Issue ``texts`` through ``predict`` from ``concurrency`` concurrent clients."""
+    latencies = []
+    queue = list(reversed(texts))
+
+    async def client():
+        while queue:
+            text = queue.pop()
+            start = time.perf_counter()
+            await predict(text)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'requests_per_second': len(texts) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50) * 1e3),
+        'p99_ms': float(np.percentile(latencies, 99) * 1e3)
+    }
+
+
+def run(requests: int = 2000, concurrency: tuple = (1, 8, 32, 128), max_batch_size: int = 32) -> Dict[str, Any]:
+    """Compare per-request predictions in a thread pool with the micro-batcher."""
+    from app.ml.model import ResumeAnalyzer
+    from app.ml.batching import MicroBatcher
+
+    analyzer = ResumeAnalyzer()
+    texts, _ = next(synthetic_batches(requests, requests, words=300))
+    results = {}
+
+    async def unbatched(text):
+        return await asyncio.get_running_loop().run_in_executor(None, analyzer.predict, text)
+
+    for clients in concurrency:
+        batcher = MicroBatcher(analyzer, max_batch_size=max_batch_size)
+
+        async def measure():
+            per_request = await _drive(unbatched, texts, clients)
+            # Histograms are process-wide, so measure this run as a difference
+            before = batcher.batch_sizes.snapshot()
+            batched = await _drive(batcher.predict, texts, clients)
+            after = batcher.batch_sizes.snapshot()
+            await batcher.stop()
+            return per_request, batched, after['count'] - before['count'], after['sum'] - before['sum']
+
+        per_request, batched, batch_count, batch_total = asyncio.run(measure())
+        results[clients] = {
+            'per_request': per_request,
+            'batched': batched,
+            'mean_batch_size': batch_total / batch_count if batch_count else 0.0,
+            'speedup': batched['requests_per_second'] / per_request['requests_per_second']
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 128])
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.requests, tuple(args.concurrency), args.max_batch_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
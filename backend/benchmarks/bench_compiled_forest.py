@@ -0,0 +1,87 @@
+"""
+Benchmark single-row and small-batch latency of the compiled random forest.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_compiled_forest --documents 5000 --trees 100
+"""
+import argparse
+import json
+import time
+from typing import Dict, Any, Callable
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.ml.compiled_forest import CompiledForest
+from benchmarks.bench_streaming import synthetic_batches
+
+
+def latency_ms(predict: Callable, X: Any, repeats: int) -> Dict[str, float]:
+    """Median and tail latency of ``predict(X)`` in milliseconds."""
+    predict(X)
+    samples = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        samples[i] = time.perf_counter() - start
+    return {
+        'p50_ms': float(np.percentile(samples, 50) * 1e3),
+        'p99_ms': float(np.percentile(samples, 99) * 1e3)
+    }
+
+
+def run(
+    documents: int = 5000,
+    trees: int = 100,
+    batch_sizes: tuple = (1, 8, 32),
+    repeats: int = 200
+) -> Dict[str, Any]:
+    """Fit a forest on synthetic resumes and time both evaluators."""
+    texts, labels = next(synthetic_batches(documents + 1000, documents + 1000))
+    vectorizer = TfidfVectorizer(max_features=1000, ngram_range=(1, 2))
+    X_train = vectorizer.fit_transform(texts[:documents])
+    X_test = vectorizer.transform(texts[documents:])
+
+    forest = RandomForestClassifier(n_estimators=trees, random_state=42)
+    forest.fit(X_train, labels[:documents])
+
+    start = time.perf_counter()
+    compiled = CompiledForest(forest)
+    compile_seconds = time.perf_counter() - start
+
+    results = {
+        'trees': trees,
+        'nodes': int(compiled.value.shape[0]),
+        'max_depth': int(compiled.max_depth),
+        'compile_seconds': compile_seconds,
+        'bit_identical': bool(np.array_equal(forest.predict_proba(X_test), compiled.predict_proba(X_test))),
+        'latency': {}
+    }
+
+    for batch_size in batch_sizes:
+        X = X_test[:batch_size]
+        sklearn_latency = latency_ms(forest.predict_proba, X, repeats)
+        compiled_latency = latency_ms(compiled.predict_proba, X, repeats)
+        results['latency'][batch_size] = {
+            'sklearn': sklearn_latency,
+            'compiled': compiled_latency,
+            'speedup_p50': sklearn_latency['p50_ms'] / compiled_latency['p50_ms']
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.documents, args.trees, repeats=args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
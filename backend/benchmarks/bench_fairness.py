@@ -0,0 +1,115 @@
+"""
+Benchmark native fairness metrics against the AIF360 round-trip.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_fairness --rows 10000000
+"""
+import argparse
+import json
+import time
+from typing import Dict, Any
+
+import numpy as np
+import pandas as pd
+
+from app.ml.fairness import fairness_metrics
+
+
+def make_decisions(n_rows: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """Random labels, predictions and a binary protected attribute with a built-in disparity."""
+    rng = np.random.default_rng(seed)
+    groups = rng.integers(0, 2, n_rows)
+    labels = rng.integers(0, 2, n_rows)
+    shortlist_rate = np.where(groups == 1, 0.55, 0.40)
+    predictions = (rng.random(n_rows) < shortlist_rate).astype(np.int64)
+    return {'groups': groups, 'labels': labels, 'predictions': predictions}
+
+
+def aif360_metrics(data: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """Compute the same metrics through AIF360 datasets."""
+    from aif360.datasets import BinaryLabelDataset
+    from aif360.metrics import ClassificationMetric
+
+    def to_dataset(label_column: str) -> BinaryLabelDataset:
+        return BinaryLabelDataset(
+            df=pd.DataFrame({'group': data['groups'], 'decision': data[label_column]}),
+            label_names=['decision'],
+            protected_attribute_names=['group'],
+            favorable_label=1,
+            unfavorable_label=0
+        )
+
+    metric = ClassificationMetric(
+        to_dataset('labels'),
+        to_dataset('predictions'),
+        unprivileged_groups=[{'group': 0}],
+        privileged_groups=[{'group': 1}]
+    )
+    return {
+        'demographic_parity': metric.statistical_parity_difference(),
+        'disparate_impact': metric.disparate_impact(),
+        'equal_opportunity': metric.equal_opportunity_difference(),
+        'average_odds': metric.average_odds_difference()
+    }
+
+
+def run(rows: int = 10_000_000, aif360_rows: int = 1_000_000, repeats: int = 3) -> Dict[str, Any]:
+    """Time native metrics at ``rows`` and compare with AIF360 at ``aif360_rows``."""
+    data = make_decisions(rows)
+
+    native_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        native = fairness_metrics(
+            data['predictions'], data['groups'], privileged=1, y_true=data['labels']
+        )
+        native_times.append(time.perf_counter() - start)
+
+    results = {
+        'rows': rows,
+        'native_seconds': min(native_times),
+        'native_metrics': native
+    }
+
+    try:
+        import aif360  # noqa: F401
+    except ImportError:
+        results['aif360'] = 'not installed'
+        return results
+
+    sample = {key: value[:aif360_rows] for key, value in data.items()}
+    start = time.perf_counter()
+    reference = aif360_metrics(sample)
+    aif360_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    native_sample = fairness_metrics(
+        sample['predictions'], sample['groups'], privileged=1, y_true=sample['labels']
+    )
+    native_sample_seconds = time.perf_counter() - start
+
+    results.update({
+        'aif360_rows': aif360_rows,
+        'aif360_seconds': aif360_seconds,
+        'native_sample_seconds': native_sample_seconds,
+        'speedup': aif360_seconds / native_sample_seconds,
+        'max_abs_diff': max(
+            abs(native_sample[key] - reference[key]) for key in reference
+        )
+    })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--aif360-rows', type=int, default=1_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.rows, args.aif360_rows, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark the cost of a log call on the calling thread: direct file handlers versus the queue.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_logging --records 20000
+"""
+import argparse
+import json
+import logging
+import queue
+import tempfile
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Any, Callable
+
+
+def _metrics() -> Dict[str, Any]:
+    # The shape of a BiasDetector.compute_metrics result
+    return {
+        'groups': {group: {'selection_rate': 0.4, 'true_positive_rate': 0.7, 'count': 1000}
+                   for group in ('male', 'female', 'other')},
+        'demographic_parity': 0.92,
+        'disparate_impact': 0.85,
+        'equal_opportunity': 0.94
+    }
+
+
+def _per_call_us(log: Callable[[], None], records: int) -> float:
+    start = time.perf_counter()
+    for _ in range(records):
+        log()
+    return (time.perf_counter() - start) / records * 1e6
+
+
+def log_call_overhead(records: int = 20_000) -> Dict[str, Any]:
+    """Microseconds per decision and fairness-metrics log call, as the caller sees them."""
+    from app.core.logging import DeferredQueueHandler, JsonLinesFormatter
+
+    metrics = _metrics()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ('direct', 'queued'):
+            logger = logging.getLogger(f"benchmark.{mode}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(Path(directory) / f"{mode}.log", maxBytes=10485760, backupCount=5)
+            listener = None
+            if mode == 'direct':
+                # The previous setup: text records with the metrics dumped eagerly
+                handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+                logger.addHandler(handler)
+                decision = lambda: logger.info(f"resume.txt: shortlist (confidence {0.8731:.3f}, model v3)")
+                fairness = lambda: logger.info(f"Fairness Metrics: {json.dumps(metrics, indent=2)}")
+            else:
+                handler.setFormatter(JsonLinesFormatter())
+                log_queue = queue.SimpleQueue()
+                listener = QueueListener(log_queue, handler)
+                listener.start()
+                logger.addHandler(DeferredQueueHandler(log_queue))
+                decision = lambda: logger.info(
+                    "%s: %s (confidence %.3f, model %s)", "resume.txt", "shortlist", 0.8731, "v3",
+                    extra={"fields": {"decision": "shortlist", "confidence": 0.8731}}
+                )
+                fairness = lambda: logger.info("Fairness metrics", extra={"fields": {"metrics": metrics}})
+
+            results[mode] = {
+                'decision_us': _per_call_us(decision, records),
+                'fairness_metrics_us': _per_call_us(fairness, records)
+            }
+            start = time.perf_counter()
+            if listener:
+                listener.stop()
+            results[mode]['drain_seconds'] = time.perf_counter() - start
+            logger.handlers.clear()
+            handler.close()
+
+    return {
+        'records': records,
+        **results,
+        'speedup_decision': results['direct']['decision_us'] / results['queued']['decision_us'],
+        'speedup_fairness_metrics': results['direct']['fairness_metrics_us'] / results['queued']['fairness_metrics_us']
+    }
+
+
+def run(records: int = 20_000) -> Dict[str, Any]:
+    """Caller-side cost of logging with and without the queue."""
+    return log_call_overhead(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.records), indent=2))
+
+
+if __name__ == "__main__":
+    main()
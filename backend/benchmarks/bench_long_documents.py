@@ -0,0 +1,135 @@
+"""
+Benchmark chunked parallel processing of very long resumes.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_long_documents --documents 10 --pages 200 --workers 4
+"""
+import argparse
+import json
+import time
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from benchmarks.bench_preprocessing import resume_like_texts
+
+
+PUBLICATION = "{authors}. {title}. In Proceedings of {venue}, pages {start}-{end}, {year}."
+AUTHORS = ['A. Smith', 'B. Chen', 'C. Okafor', 'D. Garcia', 'E. Novak', 'F. Tanaka']
+VENUES = ['NeurIPS', 'ICML', 'ACL', 'KDD', 'SIGMOD', 'FAccT']
+WORDS = ['fair', 'scalable', 'learning', 'ranking', 'bias', 'hiring', 'models', 'streaming', 'graphs']
+
+
+def long_documents(documents: int, pages: int, chars_per_page: int = 3000, seed: int = 0) -> List[str]:
+    """CVs made of an ordinary resume followed by a long publication list, in sections."""
+    rng = np.random.default_rng(seed)
+    texts = []
+    for resume in resume_like_texts(documents, seed=seed):
+        sections = [resume]
+        size = len(resume)
+        while size < pages * chars_per_page:
+            lines = []
+            for _ in range(20):
+                start = int(rng.integers(1, 900))
+                lines.append(PUBLICATION.format(
+                    authors=', '.join(rng.choice(AUTHORS, 3, replace=False)),
+                    title=' '.join(rng.choice(WORDS, 6)).capitalize(),
+                    venue=rng.choice(VENUES),
+                    start=start,
+                    end=start + int(rng.integers(5, 15)),
+                    year=int(rng.integers(1995, 2025))
+                ))
+            section = "Publications\n" + '\n'.join(lines)
+            sections.append(section)
+            size += len(section) + 2
+        texts.append('\n\n'.join(sections))
+    return texts
+
+
+def run(
+    documents: int = 10,
+    pages: int = 200,
+    workers: Optional[int] = None,
+    budget_seconds: float = 5.0
+) -> Dict[str, Any]:
+    """Compare whole-document spaCy passes with chunked processing."""
+    from app.core.config import settings
+    from app.ml.chunking import ChunkedProcessor
+    from app.ml.model import nlp, SPACY_MODEL
+    from app.ml.preprocessing import normalize_text
+
+    texts = long_documents(documents, pages)
+    nlp.max_length = max(len(text) for text in texts) + 1
+    workers = workers or settings.CHUNK_WORKERS
+
+    def whole(text):
+        doc = nlp(normalize_text(text))
+        return ' '.join(token.lemma_ for token in doc), [(e.label_, e.text) for e in nlp(text).ents]
+
+    def timed(function) -> Dict[str, Any]:
+        outputs, seconds = [], []
+        for text in texts:
+            start = time.perf_counter()
+            outputs.append(function(text))
+            seconds.append(time.perf_counter() - start)
+        return {'outputs': outputs, 'mean_seconds': float(np.mean(seconds)), 'max_seconds': float(np.max(seconds))}
+
+    in_process = ChunkedProcessor(nlp, SPACY_MODEL, settings.CHUNK_MAX_CHARS, max_workers=1)
+    pooled = ChunkedProcessor(nlp, SPACY_MODEL, settings.CHUNK_MAX_CHARS, max_workers=workers)
+    pooled.process(texts[0][:settings.CHUNK_MAX_CHARS * workers])  # start and warm the workers
+
+    def chunked(processor):
+        def function(text):
+            result = processor.process(text, with_entities=True)
+            return result['lemmatized'], result['entities']
+        return function
+
+    runs = {
+        'whole_document': timed(whole),
+        'chunked_in_process': timed(chunked(in_process)),
+        f'chunked_{workers}_workers': timed(chunked(pooled))
+    }
+
+    reference = runs['whole_document']['outputs']
+    results = {'documents': len(texts), 'mean_chars': float(np.mean([len(t) for t in texts])), 'runs': {}}
+    for label, measured in runs.items():
+        lemma_agreement, entity_overlap = [], []
+        for (lemmas, entities), (ref_lemmas, ref_entities) in zip(measured['outputs'], reference):
+            a, b = lemmas.split(), ref_lemmas.split()
+            lemma_agreement.append(np.mean([x == y for x, y in zip(a, b)]) if len(a) == len(b) else 0.0)
+            shared = sum((Counter(entities) & Counter(ref_entities)).values())
+            entity_overlap.append(shared / max(1, len(entities), len(ref_entities)))
+        results['runs'][label] = {
+            'mean_seconds': measured['mean_seconds'],
+            'max_seconds': measured['max_seconds'],
+            'lemma_agreement': float(np.mean(lemma_agreement)),
+            'entity_overlap': float(np.mean(entity_overlap))
+        }
+
+    budgeted = [pooled.process(text, with_entities=True, budget_seconds=budget_seconds) for text in texts]
+    results['budget'] = {
+        'budget_seconds': budget_seconds,
+        'max_seconds': max(result['seconds'] for result in budgeted),
+        'truncated_documents': sum(result['truncated'] for result in budgeted),
+        'mean_processed_fraction': float(np.mean([r['processed_chunks'] / r['chunks'] for r in budgeted]))
+    }
+
+    pooled.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=10)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--budget', type=float, default=5.0, help="Per-document budget in seconds")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.documents, args.pages, args.workers, args.budget), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark the stages of a resume analysis and the bias detector's metrics.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_pipeline --documents 200 --rows 100000
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Dict, Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_preprocessing import resume_like_texts
+
+
+def time_call(function: Callable[[], Any], repeats: int) -> float:
+    """Median milliseconds per call over ``repeats`` calls, after one warm-up."""
+    function()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def protected_columns(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Gender and age per decision, in the shapes the API stores them."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'gender': rng.choice(['male', 'female', 'other'], rows, p=[0.48, 0.48, 0.04]),
+        'age': rng.integers(18, 66, rows)
+    })
+
+
+def analyzer_stages(documents: int = 200, repeats: int = 5) -> Dict[str, Any]:
+    """Per-document milliseconds for each ResumeAnalyzer stage."""
+    from app.ml.model import ResumeAnalyzer
+    from app.ml.sections import parse_resume
+
+    analyzer = ResumeAnalyzer()
+    texts = resume_like_texts(documents, seed=1)
+    processed = [analyzer.preprocess_text(text) for text in texts]
+
+    def per_document(function) -> float:
+        return time_call(lambda: [function(text) for text in texts], repeats) / len(texts)
+
+    def predict_batch_ms() -> float:
+        return time_call(lambda: analyzer.predict_batch(texts), repeats) / len(texts)
+
+    return {
+        'documents': len(texts),
+        'normalize_ms': per_document(analyzer._normalize_text),
+        'preprocess_ms': per_document(analyzer.preprocess_text),
+        'sections_ms': per_document(parse_resume),
+        'vectorize_ms': time_call(lambda: analyzer.vectorizer.transform(processed), repeats) / len(texts),
+        'extract_features_ms': per_document(analyzer.extract_features),
+        'predict_ms': per_document(analyzer.predict),
+        'predict_batch_ms': predict_batch_ms()
+    }
+
+
+def bias_metrics(rows: int = 100_000, interval_rows: int = 5000, repeats: int = 5) -> Dict[str, Any]:
+    """Milliseconds for the BiasDetector's metrics at ``rows`` decisions."""
+    from app.ml.bias import BiasDetector
+
+    detector = BiasDetector()
+    rng = np.random.default_rng(0)
+    attributes = protected_columns(rows)
+    predictions = (rng.random(rows) < np.where(attributes['gender'] == 'male', 0.45, 0.35)).astype(int)
+    labels = (rng.random(rows) < 0.4).astype(int)
+    genders = attributes['gender'].to_numpy(dtype=object)
+    records = attributes.iloc[:interval_rows].to_dict('records')
+
+    return {
+        'rows': rows,
+        'compute_metrics_ms': time_call(
+            lambda: detector.compute_metrics(predictions, genders, 'male', labels), repeats
+        ),
+        'intersectional_ms': time_call(
+            lambda: detector.detect_intersectional_bias(predictions, attributes, labels), repeats
+        ),
+        'attribute_intervals_ms': time_call(
+            lambda: detector.summarize_attribute_intervals(predictions[:interval_rows], records), 1
+        ),
+        'detect_bias_single_ms': time_call(
+            lambda: detector.detect_bias(
+                pd.DataFrame([{'skills': []}]), np.array([1]), {'gender': 'female', 'age': 30}
+            ),
+            repeats
+        )
+    }
+
+
+def run(documents: int = 200, rows: int = 100_000, repeats: int = 5) -> Dict[str, Any]:
+    """Time the analyzer's stages and the bias detector's metrics."""
+    return {
+        'analyzer': analyzer_stages(documents, repeats),
+        'bias': bias_metrics(rows, repeats=repeats)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.documents, args.rows, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
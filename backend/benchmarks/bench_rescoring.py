@@ -0,0 +1,73 @@
+"""
+Benchmark re-scoring stored decisions with a candidate model at several worker counts.
+
+The corpus is synthetic and lives in a temporary SQLite database; the
+candidate is trained into a temporary registry, so the configured
+registry and active model are left alone. Runs after the first read
+the lemma cache it filled, as re-scoring an already scored corpus would.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_rescoring --resumes 20000 --workers 1 4
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, Tuple
+
+
+def run(resumes: int = 20_000, workers: Tuple[int, ...] = (1, 4), batch_size: int = 500) -> Dict[str, Any]:
+    """Resumes per second for a full re-scoring run per worker count."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.db.base import Base
+    from app.db.synthetic import CorpusConfig, bulk_insert, generate
+    from app.ml.model import ResumeAnalyzer
+    from app.ml.registry import ModelRegistry
+    from app.ml.rescoring import RescoringJob
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/corpus.db")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            bulk_insert(db, resumes, CorpusConfig(seed=1, disparity={'gender': {'female': 0.8}}))
+
+        analyzer = ResumeAnalyzer(registry=ModelRegistry(str(Path(directory) / "registry")))
+        training = list(generate(2000, CorpusConfig(seed=2)))
+        analyzer.train([record['text'] for record in training], [int(record['qualified']) for record in training])
+        candidate = analyzer.model_version
+
+        for count in workers:
+            job = RescoringJob(
+                candidate, str(Path(directory) / f"run-{count}"),
+                analyzer=analyzer, workers=count, batch_size=batch_size
+            )
+            start = time.perf_counter()
+            with Session(engine) as db:
+                summary = job.run(db)
+            seconds = time.perf_counter() - start
+            results[count] = {
+                'seconds': seconds,
+                'resumes_per_second': resumes / seconds,
+                'flip_rate': summary['overall']['flip_rate']
+            }
+        engine.dispose()
+
+    return {'resumes': resumes, 'batch_size': batch_size, 'workers': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=20_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.resumes, tuple(args.workers), args.batch_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark stored-analysis lookups: uncached, served from the response cache, and 304.
+
+Both lookup endpoints are measured in-process: GET /api/analysis/{filename}
+over analysis files in a temporary directory, and
+GET /api/v1/resumes/analysis/{id} over a seeded in-memory SQLite database.
+"Uncached" runs with a zero-byte cache, so every request rebuilds its body.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_response_cache --documents 200 --rows 5000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from typing import Dict, Any, Callable, List
+
+from benchmarks.bench_api import _client, seeded_session_factory
+
+
+async def _median_ms(client, urls: List[str], headers: Callable[[str], Dict[str, str]], status: int) -> float:
+    samples = []
+    for url in urls:
+        start = time.perf_counter()
+        response = await client.get(url, headers=headers(url))
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == status, (url, response.status_code)
+    return statistics.median(samples) * 1e3
+
+
+async def _measure(app, urls: List[str]) -> Dict[str, float]:
+    from app.api.deps import response_cache
+
+    etags = {}
+    async with _client(app) as client:
+        max_bytes = response_cache.max_bytes
+        response_cache.max_bytes = 0
+        uncached = await _median_ms(client, urls, lambda url: {}, 200)
+        response_cache.max_bytes = max_bytes
+
+        for url in urls:
+            etags[url] = (await client.get(url)).headers["etag"]
+        cached = await _median_ms(client, urls, lambda url: {}, 200)
+        not_modified = await _median_ms(client, urls, lambda url: {"If-None-Match": etags[url]}, 304)
+
+    return {
+        'uncached_p50_ms': uncached,
+        'cached_p50_ms': cached,
+        'not_modified_p50_ms': not_modified,
+        'speedup_cached': uncached / cached
+    }
+
+
+def file_lookups(documents: int = 200) -> Dict[str, Any]:
+    """GET /api/analysis/{filename} over ``documents`` analysis files."""
+    from app import main
+    from app.db import init_db
+
+    with tempfile.TemporaryDirectory() as directory:
+        init_db.ANALYSIS_DIR = directory
+        for i in range(documents):
+            init_db.save_analysis(f"resume_{i}_analysis.json", {
+                "filename": f"resume_{i}.txt",
+                "decision": "shortlist",
+                "confidence": 0.8,
+                "feature_importance": {f"term_{j}": 1.0 / (j + 1) for j in range(200)},
+                "bias_metrics": {"demographic_parity": 0.9, "disparate_impact": 0.95},
+                "analyzed_at": "2026-01-01T00:00:00"
+            })
+        urls = [f"/api/analysis/resume_{i}.txt" for i in range(documents)]
+        return {'documents': documents, **asyncio.run(_measure(main.app, urls))}
+
+
+def row_lookups(rows: int = 5000, lookups: int = 200) -> Dict[str, Any]:
+    """GET /api/v1/resumes/analysis/{id} over a database of ``rows`` resumes."""
+    from fastapi import FastAPI
+    from app.api.routes import resume
+    from app.db.base import get_db
+
+    Session = seeded_session_factory(rows)
+
+    def get_seeded_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(resume.router, prefix="/api/v1/resumes")
+    app.dependency_overrides[get_db] = get_seeded_db
+
+    step = max(1, rows // lookups)
+    urls = [f"/api/v1/resumes/analysis/{i}" for i in range(1, rows + 1, step)][:lookups]
+    return {'rows': rows, 'lookups': len(urls), **asyncio.run(_measure(app, urls))}
+
+
+def run(documents: int = 200, rows: int = 5000) -> Dict[str, Any]:
+    """Median lookup latency without cache, from cache, and as 304."""
+    return {
+        'analysis_files': file_lookups(documents),
+        'analysis_rows': row_lookups(rows, documents)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.documents, args.rows), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark analysis response payloads: size per view and encoding, and serialization time.
+
+Payloads are built the way POST /api/analyze-resume builds them, with a
+model trained into a temporary registry. Serialization compares
+FastAPI's default (jsonable_encoder + json.dumps) with ``app.api.responses.dumps``.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_responses --documents 50
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Callable, List
+
+
+def _median_us(serialize: Callable[[Any], bytes], payloads: List[Any], repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for payload in payloads:
+            serialize(payload)
+        samples.append((time.perf_counter() - start) / len(payloads))
+    return statistics.median(samples) * 1e6
+
+
+def run(documents: int = 50, repeats: int = 20) -> Dict[str, Any]:
+    """Mean bytes per view and encoding, and median serialization microseconds."""
+    from fastapi.encoders import jsonable_encoder
+    from app.api.responses import BROTLI_AVAILABLE, ORJSON_AVAILABLE, FieldSelection, compress, dumps
+    from app.db.synthetic import CorpusConfig, generate
+    from app.main import ANALYSIS_SUMMARY
+    from app.ml.model import ResumeAnalyzer
+    from app.ml.registry import ModelRegistry
+
+    with tempfile.TemporaryDirectory() as directory:
+        analyzer = ResumeAnalyzer(registry=ModelRegistry(str(Path(directory) / "registry")))
+        training = list(generate(1000, CorpusConfig(seed=2)))
+        analyzer.train([record['text'] for record in training], [int(record['qualified']) for record in training])
+
+        payloads = []
+        for record in generate(documents, CorpusConfig(seed=1)):
+            attributes = {"gender": record['gender'], "age": record['age']}
+            features = analyzer.extract_features(record['text'])
+            features["protected_attributes"] = attributes
+            decision, confidence, feature_importance, model_version = analyzer.predict(record['text'], attributes)
+            payloads.append({
+                "filename": f"synthetic_{record['id']}.txt",
+                "features": features,
+                "decision": decision,
+                "confidence": confidence,
+                "feature_importance": feature_importance,
+                "model_version": model_version,
+                "bias_metrics": {"demographic_parity": 0.9, "equal_opportunity": 0.9, "disparate_impact": 0.95},
+                "protected_attributes": attributes,
+                "analyzed_at": datetime.utcnow().isoformat()
+            })
+
+    def default_render(payload):
+        return json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    encodings = ['identity', 'gzip'] + (['br'] if BROTLI_AVAILABLE else [])
+    sizes = {}
+    for view in ('full', 'summary'):
+        bodies = [dumps(FieldSelection(None, view).apply(payload, ANALYSIS_SUMMARY)) for payload in payloads]
+        sizes[view] = {
+            encoding: statistics.mean(
+                len(body) if encoding == 'identity' else len(compress(body, encoding)) for body in bodies
+            )
+            for encoding in encodings
+        }
+
+    default_us = _median_us(default_render, payloads, repeats)
+    fast_us = _median_us(dumps, payloads, repeats)
+    full_bodies = [dumps(payload) for payload in payloads]
+    return {
+        'documents': documents,
+        'orjson': ORJSON_AVAILABLE,
+        'bytes': sizes,
+        'size_reduction_full_gzip': sizes['full']['identity'] / sizes['full']['gzip'],
+        'size_reduction_summary': sizes['full']['identity'] / sizes['summary']['identity'],
+        'serialize_default_us': default_us,
+        'serialize_fast_us': fast_us,
+        'compress_us': {
+            encoding: _median_us(lambda body: compress(body, encoding), full_bodies, repeats)
+            for encoding in encodings if encoding != 'identity'
+        },
+        'speedup_serialize': default_us / fast_us
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.documents, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark the rule-based resume sectioner against spaCy's statistical NER.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_sectioner --documents 500
+    python -m benchmarks.bench_sectioner --corpus resumes --repeat 200
+"""
+import argparse
+import json
+import time
+from typing import Dict, Any, List, Optional
+
+from benchmarks.bench_preprocessing import load_corpus
+
+
+def _throughput(function, texts: List[str]) -> Dict[str, float]:
+    start = time.perf_counter()
+    for text in texts:
+        function(text)
+    elapsed = time.perf_counter() - start
+    return {'documents_per_second': len(texts) / elapsed, 'ms_per_document': elapsed / len(texts) * 1e3}
+
+
+def run(documents: int = 500, corpus: Optional[str] = None, repeat: int = 1) -> Dict[str, Any]:
+    """Time both extractors over the same texts and report what each finds."""
+    from app.ml.model import nlp
+    from app.ml.sections import parse_resume
+
+    texts = load_corpus(corpus, documents) * repeat
+    parse_resume(texts[0])  # compile the pattern layer
+
+    rules = _throughput(parse_resume, texts)
+    statistical = _throughput(lambda text: nlp(text).ents, texts)
+
+    parsed = [parse_resume(text) for text in texts]
+    labels = sorted({label for result in parsed for label in result['entities']})
+    coverage = {
+        'documents_with_experience_dates': sum(
+            any(entry['dates'] for entry in result['sections']['experience']) for result in parsed
+        ),
+        'documents_with_stated_years': sum(result['stated_experience_years'] > 0 for result in parsed),
+        'documents_with_education': sum(bool(result['sections']['education']) for result in parsed),
+        'documents_with_skills_section': sum(bool(result['sections']['skills']) for result in parsed),
+        'mean_entities_per_label': {
+            label: sum(len(result['entities'].get(label, [])) for result in parsed) / len(parsed)
+            for label in labels
+        }
+    }
+
+    return {
+        'documents': len(texts),
+        'rules': rules,
+        'statistical_ner': statistical,
+        'speedup': rules['documents_per_second'] / statistical['documents_per_second'],
+        'coverage': coverage
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=500)
+    parser.add_argument('--corpus', help="Directory of .txt resumes; generated when omitted")
+    parser.add_argument('--repeat', type=int, default=1, help="Times to repeat the corpus")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.documents, args.corpus, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark production prediction latency with and without a shadow model.
+
+Both models are trained into a temporary registry, so the configured
+registry and active model are left alone. The same resumes are scored
+one at a time, as the API does for single requests, first with no
+shadow and then with the second model shadowing the first.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_shadow --requests 2000
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+import numpy as np
+
+
+def _latencies(analyzer, records: List[Dict[str, Any]]) -> Dict[str, float]:
+    samples = []
+    for record in records:
+        start = time.perf_counter()
+        analyzer.predict(record['text'], {'gender': record['gender'], 'age': record['age']})
+        samples.append(time.perf_counter() - start)
+    samples = np.array(samples) * 1e3
+    return {
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'mean_ms': float(samples.mean())
+    }
+
+
+def run(requests: int = 2000, queue_size: int = 1000) -> Dict[str, Any]:
+    """Latency percentiles without and with shadowing, plus what the shadow saw."""
+    from app.db.synthetic import CorpusConfig, generate
+    from app.ml.model import ResumeAnalyzer
+    from app.ml.registry import ModelRegistry
+    from app.ml.shadow import ShadowEvaluator
+
+    with tempfile.TemporaryDirectory() as directory:
+        analyzer = ResumeAnalyzer(registry=ModelRegistry(str(Path(directory) / "registry")))
+        for seed in (2, 3):
+            training = list(generate(2000, CorpusConfig(seed=seed)))
+            analyzer.train([record['text'] for record in training], [int(record['qualified']) for record in training])
+            if seed == 2:
+                candidate = analyzer.model_version
+        production = analyzer.model_version
+
+        records = list(generate(requests, CorpusConfig(seed=1, disparity={'gender': {'female': 0.8}})))
+        # Warm the preprocessing path so both runs see the same caches
+        _latencies(analyzer, records[:50])
+
+        baseline = _latencies(analyzer, records)
+
+        shadow = ShadowEvaluator(analyzer, queue_size=queue_size)
+        shadow.start(candidate)
+        analyzer.shadow = shadow
+        shadowed = _latencies(analyzer, records)
+        # Let the shadow catch up before reading its statistics
+        while shadow.queue_depth:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        stats = shadow.stats()
+        analyzer.shadow = None
+        shadow.stop()
+
+    return {
+        'requests': requests,
+        'production_version': production,
+        'shadow_version': candidate,
+        'without_shadow': baseline,
+        'with_shadow': shadowed,
+        'p99_overhead_ms': shadowed['p99_ms'] - baseline['p99_ms'],
+        'shadow': {
+            key: stats[key]
+            for key in ('scored', 'dropped', 'drop_rate', 'errors', 'disagreement_rate')
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--queue-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.requests, args.queue_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
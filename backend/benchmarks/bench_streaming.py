@@ -0,0 +1,98 @@
+"""
+Benchmark memory and throughput of out-of-core streaming training.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_streaming --documents 5000000
+"""
+import argparse
+import json
+import os
+import resource
+import time
+from typing import Dict, Any, Iterator, List, Tuple
+
+import numpy as np
+
+
+VOCABULARY = [
+    'python', 'java', 'javascript', 'typescript', 'sql', 'react', 'django', 'flask',
+    'aws', 'docker', 'kubernetes', 'tensorflow', 'pandas', 'engineer', 'developer',
+    'scientist', 'analyst', 'manager', 'senior', 'lead', 'team', 'project', 'data',
+    'machine', 'learning', 'web', 'cloud', 'backend', 'frontend', 'experience',
+    'university', 'degree', 'computer', 'science', 'mathematics', 'design', 'build'
+]
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MiB."""
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def synthetic_batches(
+    documents: int,
+    batch_size: int,
+    words: int = 200,
+    seed: int = 0
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """Generate labeled resume-like documents one batch at a time."""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(VOCABULARY)
+    weights = rng.normal(size=len(VOCABULARY))
+
+    for start in range(0, documents, batch_size):
+        size = min(batch_size, documents - start)
+        tokens = rng.integers(0, len(VOCABULARY), (size, words))
+        scores = weights[tokens].mean(axis=1)
+        labels = (scores > np.median(scores)).astype(np.int64)
+        yield [' '.join(vocabulary[row]) for row in tokens], labels
+
+
+def run(documents: int = 5_000_000, batch_size: int = 1000, preprocess: bool = False) -> Dict[str, Any]:
+    """Stream ``documents`` synthetic resumes through train_streaming."""
+    from app.ml.model import ResumeAnalyzer
+
+    analyzer = ResumeAnalyzer()
+    rss_samples = []
+
+    def sampled(batches):
+        for i, batch in enumerate(batches):
+            if i % 100 == 0:
+                rss_samples.append(current_rss_mb())
+            yield batch
+
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    stats = analyzer.train_streaming(
+        sampled(synthetic_batches(documents, batch_size)),
+        preprocess=preprocess
+    )
+    elapsed = time.perf_counter() - start
+
+    return {
+        'documents': stats['documents'],
+        'seconds': elapsed,
+        'documents_per_second': stats['documents'] / elapsed,
+        'stage_seconds': {key: stats[key] for key in ('preprocess', 'vectorize', 'fit')},
+        'rss_before_mb': rss_before,
+        'rss_first_sample_mb': rss_samples[0] if rss_samples else None,
+        'rss_last_sample_mb': rss_samples[-1] if rss_samples else None,
+        'rss_max_sample_mb': max(rss_samples) if rss_samples else None,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=5_000_000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--preprocess', action='store_true', help="Lemmatize with spaCy")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.documents, args.batch_size, args.preprocess), indent=2))
+
+
+if __name__ == "__main__":
+    main()
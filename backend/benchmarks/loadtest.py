@@ -0,0 +1,518 @@
+"""
+Load-test a running API server: throughput, latency percentiles, errors and worker memory.
+
+Launches a local uvicorn server (or targets ``--url``), drives a weighted
+mix of endpoints with resumes of mixed sizes, and reports throughput,
+p50/p95/p99 latency and error rate per endpoint, plus a timeline of the
+same figures and the server's resident memory per interval. ``--soak``
+runs for hours and fits the memory trend to catch slow leaks.
+
+Run from the backend directory:
+
+    python -m benchmarks.loadtest --app app --concurrency 32 --duration 2m
+    python -m benchmarks.loadtest --app v1 --database-url sqlite:///loadtest.db --rate 50
+    python -m benchmarks.loadtest --url http://localhost:8000 --server-pid 1234 --soak --timeline soak.jsonl
+
+With ``--rate`` arrivals are open-loop (Poisson) and latency is measured
+from each request's scheduled start, so a slow server cannot hide its
+queueing delay by slowing the client down; arrivals that find all
+``--concurrency`` slots busy are counted as dropped. Without ``--rate``
+each of ``--concurrency`` clients sends its next request as soon as the
+previous one completes.
+
+A launched app server stores uploads and analyses in backend/resumes and
+backend/analysis as it would in production. The v1 server stores them in
+the database ``SQLALCHEMY_DATABASE_URI`` names, or ``--database-url``,
+after migrating it to the latest schema.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+
+# Endpoint name -> (method, path, sends a resume file)
+ENDPOINTS = {
+    'analyze': ('POST', '/api/analyze-resume', True),
+    'upload': ('POST', '/api/v1/resumes/upload', True),
+    'metrics_summary': ('GET', '/api/v1/metrics/summary', False),
+    'metrics_protected_attributes': ('GET', '/api/v1/metrics/protected-attributes', False),
+    'metrics_intersectional': ('GET', '/api/v1/metrics/intersectional', False),
+    'inference_stats': ('GET', '/api/metrics/inference', False),
+    'prometheus': ('GET', '/metrics', False),
+}
+
+# Launchable applications and the mix used when --mix is not given
+APPS = {
+    'app': ('app.main:app', {'analyze': 0.9, 'inference_stats': 0.05, 'prometheus': 0.05}),
+    'v1': ('main:app', {'upload': 0.8, 'metrics_summary': 0.1, 'metrics_protected_attributes': 0.1}),
+}
+
+# Resume size class -> approximate characters; "large" crosses LONG_DOCUMENT_CHARS
+SIZES = {'small': 2_000, 'medium': 12_000, 'large': 80_000}
+DEFAULT_SIZE_MIX = {'small': 0.8, 'medium': 0.17, 'large': 0.03}
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class LatencyHistogram:
+    """
+    Latencies in log-spaced buckets 1% wide.
+
+    Memory stays bounded however long the test runs, and percentiles are
+    accurate to within 1%.
+    """
+
+    _GROWTH = math.log(1.01)
+
+    def __init__(self):
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+
+    def record(self, seconds: float, error: bool = False):
+        self.buckets[int(math.log(max(seconds, 1e-6)) / self._GROWTH)] += 1
+        self.count += 1
+        self.errors += error
+        self.total_seconds += seconds
+
+    def merge(self, other: 'LatencyHistogram'):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.errors += other.errors
+        self.total_seconds += other.total_seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q``-th percentile, in seconds."""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return math.exp((bucket + 1) * self._GROWTH)
+        return math.exp((max(self.buckets) + 1) * self._GROWTH)
+
+    def summary(self, seconds: float) -> Dict[str, Any]:
+        def ms(q):
+            value = self.percentile(q)
+            return value * 1e3 if value is not None else None
+
+        return {
+            'requests': self.count,
+            'requests_per_second': self.count / seconds if seconds else 0.0,
+            'error_rate': self.errors / self.count if self.count else 0.0,
+            'mean_ms': self.total_seconds / self.count * 1e3 if self.count else None,
+            'p50_ms': ms(50),
+            'p95_ms': ms(95),
+            'p99_ms': ms(99)
+        }
+
+
+def parse_duration(value: str) -> float:
+    """Seconds from "90", "90s", "15m" or "4h"."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*', value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid duration: {value}")
+    return float(match.group(1)) * {'': 1, 's': 1, 'm': 60, 'h': 3600}[match.group(2)]
+
+
+def parse_weights(values: List[str], known: Dict[str, Any]) -> Dict[str, float]:
+    """{"name": weight} from ["name=weight", ...], normalized to sum to one."""
+    weights = {}
+    for value in values:
+        name, _, weight = value.partition('=')
+        if name not in known:
+            raise argparse.ArgumentTypeError(f"Unknown name {name!r}; expected one of {', '.join(known)}")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def process_tree_rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of ``pid`` and all its descendants in MiB, from /proc."""
+    children: Dict[int, List[int]] = {}
+    for entry in Path('/proc').iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            # The command name is in parentheses and may contain spaces
+            stat = (entry / 'stat').read_text()
+            parent = int(stat[stat.rindex(')') + 2:].split()[1])
+        except (OSError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry.name))
+
+    total_pages, pending, found = 0, [pid], False
+    while pending:
+        current = pending.pop()
+        try:
+            total_pages += int(Path(f'/proc/{current}/statm').read_text().split()[1])
+            found = True
+        except (OSError, ValueError):
+            continue
+        pending.extend(children.get(current, []))
+    return total_pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20 if found else None
+
+
+def resume_payloads(size_mix: Dict[str, float], per_size: int = 50, seed: int = 0) -> Dict[str, List[Tuple[bytes, Dict]]]:
+    """
+    Resume files per size class, with the candidate's protected attributes.
+
+    Larger resumes are a synthetic resume followed by project entries
+    taken from other synthetic resumes until the size class is reached.
+    """
+    from app.db.synthetic import CorpusConfig, generate
+
+    records = list(generate(per_size * len(size_mix) * 4, CorpusConfig(seed=seed)))
+    lines = [line for record in records for line in record['text'].splitlines() if line.startswith('- ')]
+    payloads = {}
+    for index, size in enumerate(size_mix):
+        payloads[size] = []
+        for i in range(per_size):
+            record = records[index * per_size + i]
+            text = record['text']
+            if len(text) < SIZES[size]:
+                extra, position = ["", "Projects:"], i * 31
+                while len(text) + sum(len(line) + 1 for line in extra) < SIZES[size]:
+                    extra.append(lines[position % len(lines)])
+                    position += 1
+                text = text + '\n' + '\n'.join(extra)
+            payloads[size].append((text.encode('utf-8'), {'gender': record['gender'], 'age': record['age']}))
+    return payloads
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def launched_server(
+    app: str,
+    workers: int = 1,
+    port: int = 0,
+    ready_timeout: float = 300.0,
+    database_url: Optional[str] = None
+):
+    """
+    Run ``uvicorn app`` from the backend directory until the block exits.
+
+    ``database_url`` overrides the server's ``SQLALCHEMY_DATABASE_URI``.
+
+    Yields:
+        The server's base URL and process id
+    """
+    port = port or _free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', app, '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(workers), '--log-level', 'warning'],
+        cwd=str(BACKEND_DIR),
+        env={**os.environ, 'SQLALCHEMY_DATABASE_URI': database_url} if database_url else None
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + ready_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with status {process.returncode} before becoming ready")
+            try:
+                # Models load at import, so the first response means the server is warm
+                if httpx.get(f"{url}/metrics", timeout=2.0).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server not ready after {ready_timeout}s")
+            time.sleep(0.5)
+        yield url, process.pid
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+class LoadTest:
+    """
+    Drives a weighted endpoint mix against ``url`` and records the results.
+
+    Args:
+        url: Server base URL
+        mix: Endpoint name -> share of requests
+        size_mix: Resume size class -> share of file uploads
+        concurrency: Most requests in flight
+        rate: Open-loop arrivals per second; None for closed-loop clients
+        interval: Seconds per timeline sample
+        server_pid: Server process whose memory (with its workers) is sampled
+        timeline_path: JSON-lines file each timeline sample is appended to
+        seed: Seed for the request mix
+    """
+
+    def __init__(
+        self,
+        url: str,
+        mix: Dict[str, float],
+        size_mix: Dict[str, float],
+        concurrency: int = 32,
+        rate: Optional[float] = None,
+        interval: float = 10.0,
+        server_pid: Optional[int] = None,
+        timeline_path: Optional[str] = None,
+        seed: int = 0
+    ):
+        self.url = url
+        self.mix = mix
+        self.size_mix = size_mix
+        self.concurrency = concurrency
+        self.rate = rate
+        self.interval = interval
+        self.server_pid = server_pid
+        self.timeline_path = timeline_path
+        self.random = random.Random(seed)
+        self.payloads = resume_payloads(size_mix) if any(ENDPOINTS[name][2] for name in mix) else {}
+
+        self.totals: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in mix}
+        self.current: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in mix}
+        self.status_codes: Counter = Counter()
+        self.timeline: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self._in_flight = 0
+
+    def _choose(self, weights: Dict[str, float]) -> str:
+        return self.random.choices(list(weights), weights=list(weights.values()))[0]
+
+    async def _request(self, client: httpx.AsyncClient, scheduled: float):
+        name = self._choose(self.mix)
+        method, path, with_file = ENDPOINTS[name]
+        kwargs = {}
+        if with_file:
+            content, attributes = self.random.choice(self.payloads[self._choose(self.size_mix)])
+            kwargs = {'files': {'file': ('resume.txt', content, 'text/plain')}, 'params': attributes}
+
+        self._in_flight += 1
+        try:
+            response = await client.request(method, path, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finally:
+            self._in_flight -= 1
+
+        latency = time.perf_counter() - scheduled
+        error = not (isinstance(status, int) and status < 400)
+        self.status_codes[str(status)] += 1
+        self.totals[name].record(latency, error)
+        self.current[name].record(latency, error)
+
+    async def _closed_loop(self, client: httpx.AsyncClient, stop_at: float):
+        async def worker():
+            while time.perf_counter() < stop_at:
+                await self._request(client, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def _open_loop(self, client: httpx.AsyncClient, stop_at: float):
+        tasks = set()
+        scheduled = time.perf_counter()
+        while scheduled < stop_at:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(tasks) >= self.concurrency:
+                self.dropped += 1
+            else:
+                task = asyncio.ensure_future(self._request(client, scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            scheduled += self.random.expovariate(self.rate)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def _sample(self, elapsed: float):
+        window = LatencyHistogram()
+        for histogram in self.current.values():
+            window.merge(histogram)
+        sample = {
+            'elapsed_seconds': round(elapsed, 3),
+            **window.summary(self.interval),
+            'in_flight': self._in_flight,
+            'dropped': self.dropped,
+            'server_rss_mb': process_tree_rss_mb(self.server_pid) if self.server_pid else None
+        }
+        self.timeline.append(sample)
+        self.current = {name: LatencyHistogram() for name in self.mix}
+        if self.timeline_path:
+            with open(self.timeline_path, 'a') as f:
+                f.write(json.dumps(sample) + '\n')
+
+    async def _sampler(self, start: float, stop_at: float):
+        next_sample = start + self.interval
+        while next_sample <= stop_at:
+            await asyncio.sleep(max(0.0, next_sample - time.perf_counter()))
+            self._sample(next_sample - start)
+            next_sample += self.interval
+
+    async def run(self, duration: float) -> Dict[str, Any]:
+        """Apply load for ``duration`` seconds and summarize."""
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.url, limits=limits, timeout=120.0) as client:
+            start = time.perf_counter()
+            stop_at = start + duration
+            sampler = asyncio.ensure_future(self._sampler(start, stop_at))
+            if self.rate:
+                await self._open_loop(client, stop_at)
+            else:
+                await self._closed_loop(client, stop_at)
+            elapsed = time.perf_counter() - start
+            sampler.cancel()
+
+        overall = LatencyHistogram()
+        for histogram in self.totals.values():
+            overall.merge(histogram)
+        return {
+            'url': self.url,
+            'duration_seconds': elapsed,
+            'concurrency': self.concurrency,
+            'arrival_rate': self.rate,
+            'overall': overall.summary(elapsed),
+            'endpoints': {name: histogram.summary(elapsed) for name, histogram in self.totals.items()},
+            'status_codes': dict(self.status_codes),
+            'dropped_arrivals': self.dropped,
+            'memory': memory_trend(self.timeline),
+            'timeline': self.timeline
+        }
+
+
+def memory_trend(
+    timeline: List[Dict[str, Any]],
+    warmup_fraction: float = 0.1,
+    min_span_seconds: float = 900.0
+) -> Dict[str, Any]:
+    """
+    Server memory over the run and its growth rate.
+
+    The growth rate is a least-squares slope over the samples after the
+    first ``warmup_fraction``, when caches and pools are still filling.
+    It is only given once those samples span ``min_span_seconds``; over
+    shorter runs allocator noise dominates the trend.
+    """
+    samples = [(s['elapsed_seconds'], s['server_rss_mb']) for s in timeline if s['server_rss_mb'] is not None]
+    if not samples:
+        return {}
+    steady = samples[int(len(samples) * warmup_fraction):]
+    slope = None
+    if len(steady) >= 3 and steady[-1][0] - steady[0][0] >= min_span_seconds:
+        times, rss = np.array(steady).T
+        slope = float(np.polyfit(times / 3600, rss, 1)[0])
+    return {
+        'start_rss_mb': samples[0][1],
+        'end_rss_mb': samples[-1][1],
+        'max_rss_mb': max(rss for _, rss in samples),
+        'growth_mb_per_hour': slope
+    }
+
+
+def run(
+    app: Optional[str] = 'app',
+    url: Optional[str] = None,
+    workers: int = 1,
+    concurrency: int = 32,
+    rate: Optional[float] = None,
+    duration: float = 60.0,
+    mix: Optional[Dict[str, float]] = None,
+    size_mix: Optional[Dict[str, float]] = None,
+    interval: float = 10.0,
+    server_pid: Optional[int] = None,
+    timeline_path: Optional[str] = None,
+    max_growth_mb_per_hour: Optional[float] = None,
+    database_url: Optional[str] = None
+) -> Dict[str, Any]:
+    """Load-test ``url``, or a server launched for ``app``, and summarize."""
+    mix = mix or APPS[app or 'app'][1]
+    size_mix = size_mix or DEFAULT_SIZE_MIX
+
+    def test(target: str, pid: Optional[int]) -> Dict[str, Any]:
+        load = LoadTest(target, mix, size_mix, concurrency, rate, interval, pid, timeline_path)
+        return asyncio.run(load.run(duration))
+
+    if url:
+        results = test(url, server_pid)
+    else:
+        if app == 'v1':
+            from app.db.migrations import upgrade
+            upgrade(database_url)
+        with launched_server(APPS[app][0], workers, database_url=database_url) as (target, pid):
+            results = test(target, pid)
+
+    growth = results['memory'].get('growth_mb_per_hour')
+    if max_growth_mb_per_hour is not None and growth is not None:
+        results['memory']['growth_flagged'] = growth > max_growth_mb_per_hour
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--app', choices=list(APPS), default='app', help="Application to launch")
+    target.add_argument('--url', help="Test an already running server instead")
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn workers for a launched server")
+    parser.add_argument('--database-url', help="Database of a launched v1 server, e.g. sqlite:///loadtest.db")
+    parser.add_argument('--server-pid', type=int, help="Process to sample memory of when using --url")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--rate', type=float, help="Open-loop arrivals per second")
+    parser.add_argument('--duration', type=parse_duration, help="e.g. 90s, 15m, 4h (default 60s, or 4h with --soak)")
+    parser.add_argument('--mix', nargs='+', help=f"Endpoint weights as name=weight; names: {', '.join(ENDPOINTS)}")
+    parser.add_argument('--sizes', nargs='+', help=f"Resume size weights as size=weight; sizes: {', '.join(SIZES)}")
+    parser.add_argument('--interval', type=parse_duration, help="Timeline sample period (default 10s, or 60s with --soak)")
+    parser.add_argument('--timeline', help="Append each timeline sample to this JSON-lines file as it is taken")
+    parser.add_argument('--soak', action='store_true', help="Run for hours and flag steady memory growth")
+    parser.add_argument('--max-growth', type=float, default=50.0, help="Soak memory growth limit in MiB per hour")
+    parser.add_argument('--output', help="Write the summary to this JSON file")
+    args = parser.parse_args()
+
+    results = run(
+        app=None if args.url else args.app,
+        url=args.url,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration or (4 * 3600 if args.soak else 60.0),
+        mix=parse_weights(args.mix, ENDPOINTS) if args.mix else None,
+        size_mix=parse_weights(args.sizes, SIZES) if args.sizes else None,
+        interval=args.interval or (60.0 if args.soak else 10.0),
+        server_pid=args.server_pid,
+        timeline_path=args.timeline,
+        max_growth_mb_per_hour=args.max_growth if args.soak else None,
+        database_url=args.database_url
+    )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if results['memory'].get('growth_flagged'):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
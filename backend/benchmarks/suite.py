@@ -0,0 +1,160 @@
+"""
+Run the benchmark suite, record results as JSON and compare against a baseline.
+
+Run from the backend directory:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline baseline.json --output results.json --tolerance 0.15
+    python -m benchmarks.suite --only pipeline api
+
+Every measured value is flattened to a dotted key. Keys ending in ``_ms``
+or ``seconds`` are lower-is-better and keys containing ``per_second`` or
+starting with ``speedup`` are higher-is-better; anything else (counts,
+parity figures) is recorded but not compared. The exit status is 1 when a
+compared value is worse than the baseline by more than the tolerance.
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+
+# Benchmark name -> (module, keyword arguments sized for a run of a few minutes)
+SUITE = {
+    'pipeline': ('benchmarks.bench_pipeline', {'documents': 200, 'rows': 100_000, 'repeats': 5}),
+    'api': ('benchmarks.bench_api', {'rows': 5000, 'requests': 200, 'concurrency': (1, 8, 32)}),
+    'sectioner': ('benchmarks.bench_sectioner', {'documents': 500}),
+    'compiled_forest': ('benchmarks.bench_compiled_forest', {'documents': 2000, 'repeats': 100}),
+    'batching': ('benchmarks.bench_batching', {'requests': 1000, 'concurrency': (1, 32)}),
+    'synthetic': ('benchmarks.bench_synthetic', {'rows': 100_000}),
+    'logging': ('benchmarks.bench_logging', {'records': 20_000}),
+    'audit': ('benchmarks.bench_audit', {'records': 200_000}),
+    'rescoring': ('benchmarks.bench_rescoring', {'resumes': 20_000, 'workers': (1, 4)}),
+    'shadow': ('benchmarks.bench_shadow', {'requests': 1000}),
+    'response_cache': ('benchmarks.bench_response_cache', {'documents': 200, 'rows': 5000}),
+    'responses': ('benchmarks.bench_responses', {'documents': 50}),
+}
+
+
+def flatten(results: Any, prefix: str = '') -> Dict[str, float]:
+    """Numeric leaves of nested results as {"a.b.c": value}."""
+    if isinstance(results, dict):
+        flat = {}
+        for key, value in results.items():
+            flat.update(flatten(value, f"{prefix}{key}."))
+        return flat
+    if isinstance(results, bool) or not isinstance(results, (int, float)):
+        return {}
+    return {prefix[:-1]: float(results)}
+
+
+def direction(key: str) -> Optional[int]:
+    """+1 if higher is better, -1 if lower is better, None if not compared."""
+    name = key.rsplit('.', 1)[-1]
+    if 'per_second' in name or name.startswith('speedup'):
+        return 1
+    if name.endswith('_ms') or name.endswith('seconds') or name.startswith('ms_'):
+        return -1
+    return None
+
+
+def compare(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    tolerance: float
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Compare flattened results with a flattened baseline.
+
+    Args:
+        current: Values from this run
+        baseline: Values from the baseline run
+        tolerance: Allowed relative change in the worse direction
+
+    Returns:
+        Regressions and improvements beyond the tolerance, each with the
+        key, both values and the relative change
+    """
+    report = {'regressions': [], 'improvements': []}
+    for key, value in current.items():
+        better = direction(key)
+        reference = baseline.get(key)
+        if better is None or not reference:
+            continue
+        change = (value - reference) / abs(reference)
+        entry = {'key': key, 'baseline': reference, 'current': value, 'change': change}
+        if change * better < -tolerance:
+            report['regressions'].append(entry)
+        elif change * better > tolerance:
+            report['improvements'].append(entry)
+    return report
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the selected benchmarks (all by default) and collect their results."""
+    names = only or list(SUITE)
+    unknown = [name for name in names if name not in SUITE]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    results, durations = {}, {}
+    for name in names:
+        module, kwargs = SUITE[name]
+        start = time.perf_counter()
+        results[name] = importlib.import_module(module).run(**kwargs)
+        durations[name] = time.perf_counter() - start
+
+    return {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'benchmark_seconds': durations
+        },
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', nargs='+', choices=list(SUITE), help="Benchmarks to run; all by default")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Results JSON from an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="Allowed relative slowdown")
+    args = parser.parse_args()
+
+    report = run(args.only)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        report['comparison'] = compare(
+            flatten(report['results']), flatten(baseline['results']), args.tolerance
+        )
+        report['comparison']['baseline_commit'] = baseline.get('meta', {}).get('commit')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if report.get('comparison', {}).get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
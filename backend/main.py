@@ -2,20 +2,36 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from typing import List, Dict, Any
+import time
 import uvicorn
 import json
 from pathlib import Path
+from sqlalchemy import create_engine
 
 # Import our modules
 from app.core.config import settings
-from app.api.routes import resume, analysis, metrics
-from app.core.logging import setup_logging
+from app.db.base import SessionLocal
+from app.db.migrations import upgrade
+from app.api.routes import resume, analysis, metrics, admin
+from app.core.logging import setup_logging, stop_logging
+from app.api.deps import resume_analyzer, prediction_batcher, decision_audit, job_manager
+from app.api.instrumentation import instrument
+from app.api.responses import CompressionMiddleware, FastJSONResponse
+
+# Bind request sessions to the configured database
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    # Sessions are opened in the threadpool and used on the event loop
+    connect_args={"check_same_thread": False} if settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite") else {}
+)
+SessionLocal.configure(bind=engine)
 
 # Create FastAPI app
 app = FastAPI(
     title="EthicalHire API",
     description="AI Ethics in Recruitment - Backend API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Setup CORS middleware
@@ -27,10 +43,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# br/gzip for large responses
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Request metrics, Server-Timing headers and the /metrics scrape endpoint
+instrument(app)
+started_at = time.time()
+
 # Include routers
 app.include_router(resume.router, prefix="/api/v1/resumes", tags=["resumes"])
 app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["analysis"])
 app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["metrics"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
+
+@app.on_event("startup")
+async def start_logging():
+    # Runs in every uvicorn worker, unlike the __main__ block below
+    setup_logging()
+
+@app.on_event("startup")
+async def start_chunk_workers():
+    # Spawn the long-document workers now, so loading spaCy in them is not
+    # paid by the first long resume
+    resume_analyzer.chunked_processor.start()
+
+@app.on_event("shutdown")
+async def stop_prediction_batcher():
+    job_manager.shutdown()
+    await prediction_batcher.stop()
+    resume_analyzer.chunked_processor.close()
+    decision_audit.close()
+    stop_logging()
 
 @app.get("/")
 async def root():
@@ -42,11 +86,15 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "model_version": resume_analyzer.model_version,
+        "uptime_seconds": time.time() - started_at
+    }
 
 if __name__ == "__main__":
-    # Setup logging
-    setup_logging()
+    # Bring the schema up to date once, before any worker starts
+    upgrade()
     
     # Run the application
     uvicorn.run(
@@ -0,0 +1,91 @@
+"""
+Segment rotation and time-range reads of the decision audit log.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import audit
+from app.db.audit import INDEX_INTERVAL, AuditLog
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+T0 = 1_700_000_000_000
+
+
+def at(ms):
+    return EPOCH + timedelta(milliseconds=ms)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Sets the millisecond timestamp the audit log records next."""
+    now = SimpleNamespace(ms=T0)
+    # Half a millisecond past, so int(seconds * 1000) lands on ms exactly
+    monkeypatch.setattr(audit, "time", SimpleNamespace(time=lambda: (now.ms + 0.5) / 1000))
+    return now
+
+
+def record(log, clock, ms, **context):
+    clock.ms = ms
+    log.record("resume text", "v1", 0.7, "shortlist", {"gender": "female"}, **context)
+
+
+def test_segments_rotate_at_size_limit(tmp_path, clock):
+    log = AuditLog(str(tmp_path), segment_bytes=1)
+    for i in range(3):
+        record(log, clock, T0 + i, n=i)
+        log.flush()
+    log.close()
+
+    assert len(log.segments()) == 3
+    assert [entry["n"] for entry in log.read()] == [0, 1, 2]
+    assert [entry["n"] for entry in log.read(start=at(T0 + 1))] == [1, 2]
+    assert [entry["n"] for entry in log.read(end=at(T0 + 1))] == [0]
+
+
+def test_read_from_timestamp_straddling_index_entries(tmp_path, clock):
+    log = AuditLog(str(tmp_path))
+    # 100 records per millisecond, so index entries fall inside a millisecond
+    records = 3 * 100
+    for i in range(records):
+        record(log, clock, T0 + i // 100, n=i)
+    log.close()
+
+    assert records > 2 * INDEX_INTERVAL
+    assert [entry["n"] for entry in log.read(start=at(T0 + 1))] == list(range(100, 300))
+    assert [entry["n"] for entry in log.read(start=at(T0 + 1), end=at(T0 + 2))] == list(range(100, 200))
+
+
+def test_read_merges_segments_of_all_processes(tmp_path, clock, monkeypatch):
+    logs = {}
+    for pid in (1001, 1002):
+        with monkeypatch.context() as patch:
+            patch.setattr(os, "getpid", lambda: pid)
+            logs[pid] = AuditLog(str(tmp_path), segment_bytes=1)
+            # Interleaved timestamps, one segment per record
+            for i in range(pid % 2, 8, 2):
+                record(logs[pid], clock, T0 + 10 * i, n=i)
+                logs[pid].flush()
+            logs[pid].close()
+
+    log = logs[1001]
+    assert len(log.segments()) == 8
+    assert [entry["n"] for entry in log.read()] == list(range(8))
+    assert [entry["n"] for entry in log.read(start=at(T0 + 25), end=at(T0 + 60))] == [3, 4, 5]
+    assert [entry["n"] for entry in log.read(start=at(T0 + 25), n=4)] == [4]
+
+
+def test_read_ignores_partial_trailing_line(tmp_path, clock):
+    log = AuditLog(str(tmp_path))
+    for i in range(3):
+        record(log, clock, T0 + i, n=i)
+    log.close()
+
+    [segment] = log.segments()
+    with open(segment, "ab") as f:
+        f.write(b'{"timestamp": %d, "n": 3' % (T0 + 3))
+
+    assert [entry["n"] for entry in log.read()] == [0, 1, 2]
+    assert [entry["n"] for entry in log.read(start=at(T0 + 2))] == [2]
@@ -0,0 +1,103 @@
+"""
+When the micro-batcher flushes a batch: full, or when its window closes.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.ml.batching import MicroBatcher
+
+
+class RecordingAnalyzer:
+    """Scores each text by its length and records the batches it was given."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def predict_batch(self, texts, attributes):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return [("shortlist", float(len(text)), {}, "v1") for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def batching_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "BATCHING_ENABLED", True)
+
+
+def run(batcher, texts):
+    """Submit ``texts`` concurrently; returns the results and the seconds taken."""
+    async def submit():
+        try:
+            return await asyncio.gather(*(batcher.predict(text) for text in texts))
+        finally:
+            await batcher.stop()
+
+    started = time.perf_counter()
+    results = asyncio.run(submit())
+    return results, time.perf_counter() - started
+
+
+def test_full_batches_flush_without_waiting():
+    analyzer = RecordingAnalyzer()
+    batcher = MicroBatcher(analyzer, max_batch_size=4, max_wait_ms=10_000)
+    batcher.window = lambda: batcher.max_wait
+
+    texts = [f"resume {'x' * i}" for i in range(8)]
+    results, elapsed = run(batcher, texts)
+
+    assert analyzer.batches == [texts[:4], texts[4:]]
+    assert [confidence for _, confidence, _, _ in results] == [float(len(text)) for text in texts]
+    assert elapsed < 5
+
+
+def test_partial_batch_flushes_when_the_window_closes():
+    analyzer = RecordingAnalyzer()
+    batcher = MicroBatcher(analyzer, max_batch_size=8, max_wait_ms=100)
+    batcher.window = lambda: batcher.max_wait
+
+    _, elapsed = run(batcher, ["a", "b", "c"])
+
+    assert analyzer.batches == [["a", "b", "c"]]
+    assert 0.09 <= elapsed < 5
+
+
+def test_window_scales_with_queue_depth():
+    batcher = MicroBatcher(RecordingAnalyzer(), max_batch_size=5, max_wait_ms=20)
+
+    # A lone request is dispatched at once; a full batch in flight waits the most
+    batcher.depth_average = 1.0
+    assert batcher.window() == 0.0
+    batcher.depth_average = 3.0
+    assert batcher.window() == pytest.approx(0.010)
+    batcher.depth_average = 12.0
+    assert batcher.window() == pytest.approx(0.020)
+
+
+def test_lone_request_is_not_held_open():
+    analyzer = RecordingAnalyzer()
+
+    _, elapsed = run(MicroBatcher(analyzer, max_batch_size=4, max_wait_ms=10_000), ["lone"])
+
+    assert analyzer.batches == [["lone"]]
+    assert elapsed < 5
+
+
+def test_failed_batch_fails_every_request():
+    batcher = MicroBatcher(RecordingAnalyzer(fail=True), max_batch_size=4, max_wait_ms=0)
+
+    async def submit():
+        try:
+            return await asyncio.gather(
+                *(batcher.predict(text) for text in ["a", "b"]), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(submit())
+
+    assert [str(result) for result in results] == ["model unavailable"] * 2
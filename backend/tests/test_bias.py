@@ -0,0 +1,32 @@
+"""
+BiasDetector summaries over stored decisions.
+"""
+import numpy as np
+
+from app.core.config import settings
+from app.ml.bias import BiasDetector
+
+
+def test_interval_summary_bins_ages_and_skips_unknown_values(monkeypatch):
+    monkeypatch.setattr(settings, "BIAS_INTERVAL_METHOD", "analytical")
+    detector = BiasDetector()
+    rng = np.random.default_rng(0)
+    ages = rng.integers(18, 66, 400)
+    genders = rng.choice(["male", "female"], 400)
+    predictions = (rng.random(400) < 0.4).astype(int)
+    attributes = [{"gender": str(gender), "age": int(age)} for gender, age in zip(genders, ages)]
+    # Decisions without attributes, or with an unparseable age, are left out
+    attributes[0] = None
+    attributes[1] = {"gender": "female", "age": None}
+    attributes[2] = {"gender": "male", "age": "unknown"}
+
+    summaries = detector.summarize_attribute_intervals(predictions, attributes)
+
+    known = np.arange(400) >= 3
+    expected = detector.compute_metric_intervals(
+        predictions[known], detector._get_age_groups(ages[known]), ["25-34", "35-44"]
+    )
+    assert summaries["age"] == expected
+    assert summaries["gender"] == detector.compute_metric_intervals(
+        predictions[1:], np.array([attrs["gender"] for attrs in attributes[1:]], dtype=object), "male"
+    )
@@ -0,0 +1,141 @@
+"""
+Conditional GETs through the response cache.
+"""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.api.caching import CachedResponse, ResponseCache
+from app.api.responses import CompressionMiddleware
+from app.core.config import settings
+
+LARGE = {"items": [{"id": i, "decision": "shortlist"} for i in range(200)]}
+SMALL = {"id": 1}
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(max_bytes=2 ** 20, max_age=60)
+
+
+@pytest.fixture
+def client(cache, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_ENABLED", True)
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_BYTES", 500)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/large")
+    def large(request: Request):
+        return cache.respond(request, "large", 1, lambda: LARGE)
+
+    @app.get("/small")
+    def small(request: Request):
+        return cache.respond(request, "small", 1, lambda: SMALL)
+
+    return TestClient(app)
+
+
+def test_not_modified_matches_compressed_response(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].startswith("W/")
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    revalidated = client.get(
+        "/large", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == response.headers["etag"]
+    assert revalidated.headers["vary"] == response.headers["vary"]
+
+
+def test_not_modified_matches_uncompressed_response(client):
+    for path in ("/large", "/small"):
+        encoding = "identity" if path == "/large" else "gzip"
+        response = client.get(path, headers={"Accept-Encoding": encoding})
+        assert "content-encoding" not in response.headers
+        assert not response.headers["etag"].startswith("W/")
+
+        revalidated = client.get(
+            path, headers={"Accept-Encoding": encoding, "If-None-Match": response.headers["etag"]}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == response.headers["etag"]
+        assert revalidated.headers["vary"] == "Accept-Encoding"
+
+
+class Loader:
+    """Builds content and counts how often the cache had to."""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.content
+
+
+@pytest.fixture
+def plain_client(cache, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_ENABLED", False)
+    versions = {"analysis": 1}
+    loader = Loader(SMALL)
+    app = FastAPI()
+
+    @app.get("/analysis")
+    def analysis(request: Request):
+        return cache.respond(request, "analysis", versions["analysis"], loader)
+
+    return TestClient(app), versions, loader
+
+
+def test_cached_body_served_until_validator_changes(plain_client, cache):
+    client, versions, loader = plain_client
+
+    first = client.get("/analysis")
+    second = client.get("/analysis")
+    assert first.json() == second.json() == SMALL
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.headers["cache-control"] == "private, max-age=60"
+    assert loader.calls == 1
+
+    versions["analysis"] = 2
+    loader.content = {"id": 2}
+    changed = client.get("/analysis")
+    assert changed.json() == {"id": 2}
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert loader.calls == 2
+    assert len(cache) == 1
+
+
+def test_not_modified_only_for_current_etag(plain_client):
+    client, versions, loader = plain_client
+    etag = client.get("/analysis").headers["etag"]
+
+    assert client.get("/analysis", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/analysis", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get("/analysis", headers={"If-None-Match": "*"}).status_code == 304
+
+    versions["analysis"] = 2
+    loader.content = {"id": 2}
+    stale = client.get("/analysis", headers={"If-None-Match": etag})
+    assert stale.status_code == 200
+    assert stale.json() == {"id": 2}
+
+
+def test_least_recently_used_entries_evicted_past_max_bytes():
+    cache = ResponseCache(max_bytes=30, max_age=60)
+    for key in ("a", "b", "c"):
+        cache.put(key, CachedResponse(1, b"x" * 10, '"%s"' % key))
+    assert cache.get("a", 1) is not None
+
+    cache.put("d", CachedResponse(1, b"x" * 10, '"d"'))
+    assert cache.get("b", 1) is None
+    assert [key for key in "acd" if cache.get(key, 1) is not None] == ["a", "c", "d"]
+    assert cache.bytes == 30
+
+    cache.put("huge", CachedResponse(1, b"x" * 31, '"huge"'))
+    assert cache.get("huge", 1) is None
+    assert len(cache) == 3
@@ -0,0 +1,59 @@
+"""
+Long-document budgets of the chunked processor.
+"""
+import time
+from types import SimpleNamespace
+
+from app.ml.chunking import ChunkedProcessor, split_into_chunks
+
+TEXT = "First section about Python.\n\nSecond section about SQL.\n\nThird section about Docker."
+
+
+class Doc(list):
+    ents = []
+
+
+def fake_nlp(text, disable=()):
+    """Tokens whose lemma is the lowercased word, and no entities."""
+    return Doc(SimpleNamespace(lemma_=word.lower()) for word in text.split())
+
+
+def test_chunks_rejoin_to_the_original_text():
+    chunks = split_into_chunks(TEXT, 30)
+
+    assert len(chunks) == 3
+    assert "".join(chunks) == TEXT
+
+
+def test_budget_starts_once_the_workers_are_ready(monkeypatch):
+    processor = ChunkedProcessor(fake_nlp, "en_core_web_sm", max_chars=30, max_workers=2)
+    deadlines = []
+
+    def wait_ready(timeout=None):
+        # Workers spawning and loading the model
+        time.sleep(0.3)
+        return True
+
+    def process_in_pool(chunks, disable, with_entities, deadline):
+        deadlines.append(deadline - time.monotonic())
+        return processor._process_in_process(chunks, disable, with_entities, deadline)
+
+    monkeypatch.setattr(processor, "wait_ready", wait_ready)
+    monkeypatch.setattr(processor, "_process_in_pool", process_in_pool)
+
+    result = processor.process(TEXT, budget_seconds=0.2)
+
+    assert deadlines[0] > 0.1
+    assert not result["truncated"]
+    assert result["processed_chunks"] == 3
+    assert result["seconds"] < 0.3
+
+
+def test_in_process_processor_needs_no_workers():
+    processor = ChunkedProcessor(fake_nlp, "en_core_web_sm", max_chars=30, max_workers=1)
+
+    processor.start()
+
+    assert processor._pool is None
+    assert processor.wait_ready(timeout=0)
+    assert processor.process(TEXT)["lemmatized"].split()[:3] == ["first", "section", "about"]
@@ -0,0 +1,75 @@
+"""
+The array-compiled forest against scikit-learn's own predictions.
+"""
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.ensemble import RandomForestClassifier
+
+from app.ml.compiled_forest import CompiledForest, compile_classifier
+
+
+def forest(X, y, **params):
+    params = {"n_estimators": 25, "random_state": 0, "n_jobs": 1, **params}
+    return RandomForestClassifier(**params).fit(X, y)
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 12))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(scale=0.5, size=600) > 0).astype(int)
+    return X, y
+
+
+def test_probabilities_are_identical_to_scikit_learn(dataset):
+    X, y = dataset
+    # Unbounded depth, so trees run well past the leaf-compaction interval
+    model = forest(X[:400], y[:400])
+    compiled = CompiledForest(model, chunk_size=64)
+
+    assert compiled.max_depth > CompiledForest._COMPACT_EVERY
+    np.testing.assert_array_equal(compiled.predict_proba(X[400:]), model.predict_proba(X[400:]))
+    np.testing.assert_array_equal(compiled.predict(X[400:]), model.predict(X[400:]))
+    # A single row given as a 1-D array
+    np.testing.assert_array_equal(compiled.predict_proba(X[400]), model.predict_proba(X[400:401]))
+
+
+def test_leaves_match_scikit_learn(dataset):
+    X, y = dataset
+    model = forest(X, y, max_depth=6)
+    compiled = CompiledForest(model)
+
+    # Global node indices, offset by each tree's first node
+    leaves = compiled.apply(X[:50]) - compiled.roots[:, None]
+    np.testing.assert_array_equal(leaves, model.apply(X[:50]).T)
+
+
+def test_sparse_input_and_multiclass_labels(dataset):
+    X, y = dataset
+    X = np.where(np.abs(X) < 0.8, 0.0, X)
+    labels = np.array(["reject", "review", "shortlist"])[y + (X[:, 3] > 0)]
+    model = forest(sparse.csr_matrix(X[:400]), labels[:400])
+    compiled = compile_classifier(model)
+
+    rows = sparse.csr_matrix(X[400:])
+    np.testing.assert_array_equal(compiled.predict_proba(rows), model.predict_proba(rows))
+    np.testing.assert_array_equal(compiled.predict(rows), model.predict(rows))
+
+
+def test_missing_values_follow_the_learned_direction(dataset):
+    X, y = dataset
+    X = X.copy()
+    X[np.random.default_rng(1).random(X.shape) < 0.1] = np.nan
+    model = forest(X[:400], y[:400])
+
+    np.testing.assert_array_equal(CompiledForest(model).predict_proba(X[400:]), model.predict_proba(X[400:]))
+
+
+def test_only_fitted_forests_compile(dataset):
+    X, y = dataset
+
+    assert compile_classifier(RandomForestClassifier()) is None
+    assert compile_classifier(object()) is None
+    with pytest.raises(ValueError):
+        CompiledForest(forest(X, np.column_stack([y, 1 - y])))
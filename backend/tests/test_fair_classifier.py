@@ -0,0 +1,81 @@
+"""
+Objective, gradient and fit of the fairness-regularized logistic model.
+"""
+import numpy as np
+import pytest
+from scipy import optimize, sparse
+from sklearn.linear_model import LogisticRegression
+
+from app.ml import fair_classifier
+from app.ml.fair_classifier import FairLogisticRegression
+
+
+def data(n=300, n_features=8, seed=0):
+    rng = np.random.default_rng(seed)
+    groups = rng.choice(["a", "b", "c"], n)
+    X = rng.normal(size=(n, n_features))
+    # The first feature leaks group membership
+    X[:, 0] += np.where(groups == "a", 1.0, -0.5)
+    y = (X[:, 0] + X[:, 1] + rng.normal(size=n) > 0).astype(int)
+    return X, y, groups
+
+
+@pytest.fixture
+def objective(monkeypatch):
+    """Captures the objective FairLogisticRegression hands to L-BFGS."""
+    captured = []
+
+    def recording_minimize(fun, x0, **kwargs):
+        captured.append(fun)
+        return optimize.minimize(fun, x0, **kwargs)
+
+    monkeypatch.setattr(fair_classifier, "minimize", recording_minimize)
+    return captured
+
+
+def test_gradient_matches_finite_differences(objective):
+    X, y, groups = data()
+    weights = np.random.default_rng(1).uniform(0.5, 2.0, len(y))
+    FairLogisticRegression(eta=5.0, C=0.5).fit(X, y, sensitive=groups, sample_weight=weights)
+    [fun] = objective
+
+    rng = np.random.default_rng(2)
+    for _ in range(3):
+        params = rng.normal(scale=0.5, size=X.shape[1] + 1)
+        error = optimize.check_grad(lambda p: fun(p)[0], lambda p: fun(p)[1], params)
+        assert error < 1e-6 * max(1.0, np.linalg.norm(fun(params)[1]))
+
+
+def test_sparse_input_gives_the_same_objective(objective):
+    X, y, groups = data()
+    dense = FairLogisticRegression(eta=2.0).fit(X, y, sensitive=groups)
+    csr = FairLogisticRegression(eta=2.0).fit(sparse.csr_matrix(X), y, sensitive=groups)
+
+    params = np.random.default_rng(3).normal(size=X.shape[1] + 1)
+    np.testing.assert_allclose(objective[0](params)[0], objective[1](params)[0])
+    np.testing.assert_allclose(objective[0](params)[1], objective[1](params)[1])
+    np.testing.assert_allclose(dense.coef_, csr.coef_, atol=1e-6)
+
+
+def test_without_penalty_matches_scikit_learn():
+    X, y, groups = data()
+
+    fair = FairLogisticRegression(eta=0.0, C=0.5, tol=1e-10).fit(X, y, sensitive=groups)
+    plain = LogisticRegression(C=0.5, tol=1e-10, max_iter=1000).fit(X, y)
+
+    np.testing.assert_allclose(fair.coef_, plain.coef_, atol=1e-4)
+    np.testing.assert_allclose(fair.intercept_, plain.intercept_, atol=1e-4)
+
+
+def test_penalty_decorrelates_scores_from_groups():
+    X, y, groups = data()
+    one_hot = (groups[:, None] == np.array(["a", "b", "c"])).astype(float)
+    one_hot -= one_hot.mean(axis=0)
+
+    def covariance(model):
+        return np.linalg.norm(one_hot.T @ model.decision_function(X) / len(y))
+
+    plain = FairLogisticRegression(eta=0.0).fit(X, y, sensitive=groups)
+    fair = FairLogisticRegression(eta=100.0).fit(X, y, sensitive=groups)
+
+    assert covariance(fair) < 0.1 * covariance(plain)
@@ -0,0 +1,163 @@
+"""
+Native fairness metrics, and the age bins shared by bias detection,
+re-scoring and the synthetic corpus.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml.bias import BiasDetector
+from app.ml.fairness import (
+    AGE_GROUPS, age_groups, analytical_intervals, bootstrap_intervals, confusion_counts,
+    fairness_metrics, metric_intervals, per_group_metrics
+)
+from app.ml.rescoring import group_label
+
+AGES = [18, 24, 25, 34, 35, 44, 45, 54, 55, 80]
+EXPECTED = ["18-24", "18-24", "25-34", "25-34", "35-44", "35-44", "45-54", "45-54", "55+", "55+"]
+
+
+def test_age_groups_bins_and_missing_values():
+    assert list(age_groups(AGES)) == EXPECTED
+    assert list(age_groups([None, np.nan, "unknown", "40"])) == [None, None, None, "35-44"]
+    assert set(EXPECTED) == set(AGE_GROUPS)
+
+
+def test_bias_detector_and_rescoring_use_the_same_bins():
+    detector = BiasDetector()
+
+    assert list(detector._get_age_groups(AGES)) == EXPECTED
+    assert [detector._get_age_group(age) for age in AGES] == EXPECTED
+    assert [group_label("age", age) for age in AGES] == EXPECTED
+    assert group_label("age", "unknown") is None
+
+
+def rows(group, tn, fp, fn, tp):
+    """Group labels, predictions and labels for the given confusion counts."""
+    cells = [(0, 0)] * tn + [(0, 1)] * fp + [(1, 0)] * fn + [(1, 1)] * tp
+    return [group] * len(cells), [pred for _, pred in cells], [true for true, _ in cells]
+
+
+def table(*groups):
+    columns = [sum(column, []) for column in zip(*(rows(*group) for group in groups))]
+    return columns[0], np.array(columns[1]), np.array(columns[2])
+
+
+# Privileged "a": selection 0.6, TPR 0.8, FPR 0.4; "b": selection 0.3, TPR 0.4, FPR 0.2;
+# "c": selection 0.5, TPR 0.5, FPR 0.5
+GROUPS, Y_PRED, Y_TRUE = table(("a", 3, 2, 1, 4), ("b", 4, 1, 3, 2), ("c", 1, 1, 1, 1))
+
+
+def test_confusion_counts_per_group():
+    codes = pd.factorize(np.array(GROUPS), sort=True)[0]
+    counts = confusion_counts(codes, Y_PRED, Y_TRUE)
+
+    assert counts.tolist() == [[3, 2, 1, 4], [4, 1, 3, 2], [1, 1, 1, 1]]
+    # Rows without a group are left out
+    codes[0] = -1
+    assert confusion_counts(codes, Y_PRED, Y_TRUE)[0].tolist() == [2, 2, 1, 4]
+
+
+def test_fairness_metrics_match_hand_computed_values():
+    metrics = fairness_metrics(Y_PRED, GROUPS, "a", Y_TRUE)
+
+    # Unprivileged "b" and "c" pooled: selection 5/14, TPR 3/7, FPR 2/7
+    assert metrics["demographic_parity"] == pytest.approx(5 / 14 - 0.6)
+    assert metrics["disparate_impact"] == pytest.approx((5 / 14) / 0.6)
+    assert metrics["equal_opportunity"] == pytest.approx(3 / 7 - 0.8)
+    assert metrics["average_odds"] == pytest.approx(0.5 * ((2 / 7 - 0.4) + (3 / 7 - 0.8)))
+
+    without_labels = fairness_metrics(Y_PRED, GROUPS, "a")
+    assert set(without_labels) == {"demographic_parity", "disparate_impact"}
+    assert without_labels["disparate_impact"] == pytest.approx(metrics["disparate_impact"])
+
+
+def test_per_group_metrics_compare_each_group_with_privileged():
+    metrics = per_group_metrics(Y_PRED, GROUPS, ["a"], Y_TRUE)
+
+    assert set(metrics) == {"b", "c"}
+    assert metrics["b"]["demographic_parity"] == pytest.approx(-0.3)
+    assert metrics["b"]["disparate_impact"] == pytest.approx(0.5)
+    assert metrics["b"]["equal_opportunity"] == pytest.approx(-0.4)
+    assert metrics["b"]["average_odds"] == pytest.approx(-0.3)
+    assert metrics["c"]["disparate_impact"] == pytest.approx(0.5 / 0.6)
+    assert metrics["c"]["total"] == 4
+
+
+def test_fairness_metrics_match_aif360():
+    aif360 = pytest.importorskip("aif360")
+    from aif360.datasets import BinaryLabelDataset
+    from aif360.metrics import ClassificationMetric
+
+    rng = np.random.default_rng(0)
+    n = 5000
+    group = rng.integers(0, 2, n)
+    y_true = rng.integers(0, 2, n)
+    y_pred = (rng.random(n) < np.where(group == 1, 0.55, 0.4)).astype(int)
+
+    def dataset(labels):
+        return BinaryLabelDataset(
+            df=pd.DataFrame({"group": group, "label": labels}),
+            label_names=["label"],
+            protected_attribute_names=["group"]
+        )
+
+    expected = ClassificationMetric(
+        dataset(y_true), dataset(y_pred),
+        unprivileged_groups=[{"group": 0}], privileged_groups=[{"group": 1}]
+    )
+    metrics = fairness_metrics(y_pred, group, 1, y_true)
+
+    assert metrics["demographic_parity"] == pytest.approx(expected.statistical_parity_difference())
+    assert metrics["disparate_impact"] == pytest.approx(expected.disparate_impact())
+    assert metrics["equal_opportunity"] == pytest.approx(expected.equal_opportunity_difference())
+    assert metrics["average_odds"] == pytest.approx(expected.average_odds_difference())
+
+
+COUNTS = np.array([[3, 2, 1, 4], [4, 1, 3, 2], [1, 1, 1, 1]])
+PRIVILEGED = np.array([True, False, False])
+Z95 = 1.959963984540054
+
+
+def test_analytical_intervals_match_wald_bounds():
+    intervals = analytical_intervals(COUNTS, PRIVILEGED)
+
+    # Column 1 is "b" alone: selection 0.3 vs 0.6 over ten rows each
+    margin = Z95 * np.sqrt(0.3 * 0.7 / 10 + 0.6 * 0.4 / 10)
+    assert intervals["demographic_parity"][:, 1] == pytest.approx([-0.3 - margin, -0.3 + margin])
+    # TPR 2/5 vs 4/5 over five positives each
+    margin = Z95 * np.sqrt(0.4 * 0.6 / 5 + 0.8 * 0.2 / 5)
+    assert intervals["equal_opportunity"][:, 1] == pytest.approx([-0.4 - margin, -0.4 + margin])
+    # Delta method on log(0.3 / 0.6)
+    margin = Z95 * np.sqrt((0.7 / 0.3) / 10 + (0.4 / 0.6) / 10)
+    assert intervals["disparate_impact"][:, 1] == pytest.approx(0.5 * np.exp([-margin, margin]))
+    # Column 0 pools "b" and "c": selection 5/14
+    margin = Z95 * np.sqrt((5 / 14) * (9 / 14) / 14 + 0.024)
+    assert intervals["demographic_parity"][:, 0] == pytest.approx([5 / 14 - 0.6 - margin, 5 / 14 - 0.6 + margin])
+
+
+def test_bootstrap_intervals_are_seeded_and_bracket_estimates():
+    first = bootstrap_intervals(COUNTS, PRIVILEGED, n_resamples=500, n_jobs=1, seed=7)
+    second = bootstrap_intervals(COUNTS, PRIVILEGED, n_resamples=500, n_jobs=1, seed=7)
+
+    for name in first:
+        np.testing.assert_array_equal(first[name], second[name])
+    assert first["demographic_parity"].shape == (2, 3)
+
+    intervals = metric_intervals(
+        Y_PRED, GROUPS, "a", Y_TRUE, n_resamples=500, n_jobs=1, seed=7
+    )
+    for label in ("overall", "b"):
+        for bounds in intervals[label].values():
+            assert bounds["lower"] <= bounds["estimate"] <= bounds["upper"]
+
+
+def test_bootstrap_intervals_agree_with_analytical_on_large_samples():
+    # With thousands of rows per group the percentile bootstrap and the
+    # normal approximation should give nearly the same bounds
+    counts = COUNTS * 500
+    bootstrap = bootstrap_intervals(counts, PRIVILEGED, n_resamples=4000, n_jobs=1, seed=0)
+    analytical = analytical_intervals(counts, PRIVILEGED)
+
+    for name in ("demographic_parity", "disparate_impact", "equal_opportunity", "average_odds"):
+        np.testing.assert_allclose(bootstrap[name], analytical[name], atol=0.01)
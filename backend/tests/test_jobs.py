@@ -0,0 +1,100 @@
+"""
+Idempotency of asynchronous analysis jobs.
+"""
+import io
+import os
+import threading
+import time
+import zipfile
+
+import pytest
+
+from app.api.jobs import IdempotencyConflict, JobManager, spool_upload
+
+
+class Recorder:
+    """Processor that counts the files it is given."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, filename, content):
+        with self._lock:
+            self.calls.append((filename, content))
+        return {"length": len(content)}
+
+
+def wait_finished(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while not job.finished:
+        assert time.time() < deadline, "job did not finish"
+        time.sleep(0.01)
+
+
+def spooled_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return spool_upload(buffer, ".zip")
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(workers=2, max_running=1)
+    yield manager
+    manager.shutdown()
+
+
+def test_replay_returns_existing_job(manager):
+    process = Recorder()
+    job, created = manager.submit_file("a.txt", b"resume", process, "key-1")
+    wait_finished(job)
+    replay, replay_created = manager.submit_file("a.txt", b"resume", process, "key-1")
+
+    assert created and not replay_created
+    assert replay is job
+    assert job.state == "succeeded"
+    assert process.calls == [("a.txt", b"resume")]
+
+
+def test_key_reused_for_different_upload_conflicts(manager):
+    process = Recorder()
+    job, _ = manager.submit_file("a.txt", b"resume", process, "key-1")
+
+    with pytest.raises(IdempotencyConflict):
+        manager.submit_file("a.txt", b"another resume", process, "key-1")
+    assert manager.get(job.id) is job
+
+
+def test_uploads_without_key_are_separate_jobs(manager):
+    process = Recorder()
+    first, _ = manager.submit_file("a.txt", b"resume", process)
+    second, created = manager.submit_file("a.txt", b"resume", process)
+
+    assert created
+    assert first.id != second.id
+    assert first.idempotency_key != second.idempotency_key
+
+
+def test_zip_replay_and_conflict_delete_spooled_upload(manager):
+    process = Recorder()
+    path, fingerprint = spooled_zip({"a.txt": b"first", "b.txt": b"second"})
+    job, _ = manager.submit_zip(path, fingerprint, process, "key-zip")
+    wait_finished(job)
+
+    assert job.processed == 2 and job.failed == 0
+    assert not os.path.exists(path)
+
+    path, fingerprint = spooled_zip({"a.txt": b"first", "b.txt": b"second"})
+    replay, created = manager.submit_zip(path, fingerprint, process, "key-zip")
+    assert replay is job and not created
+    assert not os.path.exists(path)
+
+    path, fingerprint = spooled_zip({"c.txt": b"third"})
+    with pytest.raises(IdempotencyConflict):
+        manager.submit_zip(path, fingerprint, process, "key-zip")
+    assert not os.path.exists(path)
+    assert len(process.calls) == 2
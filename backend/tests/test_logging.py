@@ -0,0 +1,44 @@
+"""
+Log file naming with one or several server processes.
+"""
+import os
+
+import pytest
+
+from app.core import logging as app_logging
+from app.core.config import settings
+
+
+@pytest.fixture
+def auto(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_FILE_PER_PROCESS", "auto")
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.setattr(app_logging.multiprocessing, "parent_process", lambda: None)
+    return monkeypatch
+
+
+def file_name(tmp_path):
+    handler = app_logging._file_handler(tmp_path, "app", None)
+    handler.close()
+    return os.path.basename(handler.baseFilename)
+
+
+def test_single_process_shares_one_file(auto, tmp_path):
+    assert file_name(tmp_path) == "app.jsonl"
+
+
+def test_worker_processes_get_their_own_files(auto, tmp_path):
+    auto.setattr(app_logging.multiprocessing, "parent_process", lambda: object())
+    assert file_name(tmp_path) == f"app.{os.getpid()}.jsonl"
+
+
+def test_web_concurrency_turns_on_per_process_files(auto, tmp_path):
+    auto.setenv("WEB_CONCURRENCY", "4")
+    assert file_name(tmp_path) == f"app.{os.getpid()}.jsonl"
+
+
+@pytest.mark.parametrize("value, expected", [("true", True), ("false", False)])
+def test_explicit_setting_wins(auto, value, expected):
+    auto.setenv("WEB_CONCURRENCY", "4")
+    auto.setattr(settings, "LOG_FILE_PER_PROCESS", value)
+    assert app_logging.per_process_files() is expected
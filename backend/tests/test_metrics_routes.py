@@ -0,0 +1,104 @@
+"""
+Metrics summary of the v1 API, against a temporary SQLite database.
+"""
+import inspect
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.responses import FastJSONResponse
+from app.api.routes import metrics
+from app.db.base import Base, get_db
+from app.models.resume import Resume, Analysis, BiasMetrics
+
+
+def add_analysis(session_factory, resume_id, decision, gender):
+    with session_factory() as db:
+        db.add(Resume(id=resume_id, filename=f"resume_{resume_id}.txt", content=""))
+        db.add(Analysis(resume_id=resume_id, score=0.5, decision=decision, confidence=0.8, model_version="test"))
+        db.add(BiasMetrics(resume_id=resume_id, protected_attributes={"gender": gender, "age": 30}))
+        db.commit()
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    monkeypatch.setattr(metrics, "_intervals", None)
+
+    def get_test_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.include_router(metrics.router, prefix="/api/v1/metrics")
+    app.dependency_overrides[get_db] = get_test_db
+    return TestClient(app)
+
+
+def test_summary_runs_off_the_event_loop():
+    assert not inspect.iscoroutinefunction(metrics.get_metrics_summary)
+
+
+def test_summary_intervals_recomputed_only_when_rows_are_added(client, session_factory, monkeypatch):
+    calls = []
+    summarize = metrics.bias_detector.summarize_attribute_intervals
+
+    def counting_summarize(**kwargs):
+        calls.append(len(kwargs["predictions"]))
+        return summarize(**kwargs)
+
+    monkeypatch.setattr(metrics.bias_detector, "summarize_attribute_intervals", counting_summarize)
+    for resume_id, (decision, gender) in enumerate(
+        [("shortlist", "male"), ("reject", "female"), ("shortlist", "female"), ("reject", "male")], 1
+    ):
+        add_analysis(session_factory, resume_id, decision, gender)
+
+    first = client.get("/api/v1/metrics/summary")
+    second = client.get("/api/v1/metrics/summary")
+    assert first.status_code == second.status_code == 200
+    assert first.json()["fairness_intervals"] == second.json()["fairness_intervals"]
+    assert calls == [4]
+
+    add_analysis(session_factory, 5, "shortlist", "female")
+    third = client.get("/api/v1/metrics/summary")
+    assert third.json()["total_resumes"] == 5
+    assert calls == [4, 5]
+
+
+def test_intersectional_streams_rows_off_the_event_loop(client, session_factory, monkeypatch):
+    assert not inspect.iscoroutinefunction(metrics.get_intersectional_bias)
+    # Several pages, so streaming has to stitch them back together
+    monkeypatch.setattr(metrics, "_PAGE_SIZE", 3)
+    rows = [("shortlist", "male"), ("reject", "female"), ("shortlist", "female"), ("reject", "male")] * 2
+    for resume_id, (decision, gender) in enumerate(rows, 1):
+        add_analysis(session_factory, resume_id, decision, gender)
+
+    response = client.get("/api/v1/metrics/intersectional", params={"min_support": 1})
+
+    assert response.status_code == 200
+    expected = metrics.bias_detector.detect_intersectional_bias(
+        predictions=np.array([1 if decision == "shortlist" else 0 for decision, _ in rows]),
+        protected_attributes=pd.DataFrame({"gender": [gender for _, gender in rows], "age": [30] * len(rows)}),
+        min_support=1
+    )
+    assert expected
+    assert response.json() == json.loads(FastJSONResponse(expected).body)
@@ -0,0 +1,39 @@
+"""
+Alembic migrations against temporary SQLite databases.
+"""
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from app.db.base import Base
+from app.db.migrations import upgrade
+from app.models import resume  # noqa: F401
+
+
+def test_head_matches_models(tmp_path):
+    url = f"sqlite:///{tmp_path / 'head.db'}"
+    upgrade(url)
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+    engine.dispose()
+
+
+def test_upgrade_keeps_rows_of_initial_schema(tmp_path):
+    url = f"sqlite:///{tmp_path / 'existing.db'}"
+    upgrade(url, "0001")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO resumes (id, filename, content) VALUES (1, 'a.txt', '')"))
+        connection.execute(text(
+            "INSERT INTO analyses (resume_id, score, decision, confidence) VALUES (1, 0.7, 'shortlist', 0.7)"
+        ))
+
+    upgrade(url)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("analyses")}
+    assert "model_version" in columns
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT decision, model_version FROM analyses")).all() == [("shortlist", None)]
+    engine.dispose()
@@ -0,0 +1,144 @@
+"""
+Reweighing weights and per-group threshold post-processing.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml.bias import BiasDetector
+from app.ml.mitigation import GroupThresholdPostprocessor, reweighing_weights
+
+
+def test_reweighing_weights_match_hand_computed_values():
+    groups = ["a", "a", "a", "a", "b", "b"]
+    labels = np.array([1, 1, 1, 0, 1, 0])
+
+    # P(group) * P(label) / P(group, label) with P(1) = 4/6
+    a_positive = (4 / 6) * (4 / 6) / (3 / 6)
+    a_negative = (4 / 6) * (2 / 6) / (1 / 6)
+    b_positive = (2 / 6) * (4 / 6) / (1 / 6)
+    b_negative = (2 / 6) * (2 / 6) / (1 / 6)
+    expected = [a_positive] * 3 + [a_negative, b_positive, b_negative]
+    assert reweighing_weights(groups, labels) == pytest.approx(expected)
+    # Existing weights are scaled, and enter the contingency table
+    base = np.full(6, 2.0)
+    assert reweighing_weights(groups, labels, base) == pytest.approx(2 * np.array(expected))
+
+
+def test_reweighing_weights_decouple_group_and_label():
+    rng = np.random.default_rng(0)
+    groups = rng.choice(["a", "b", "c", None], 2000)
+    labels = (rng.random(2000) < np.where(groups == "a", 0.7, 0.3)).astype(int)
+
+    weights = reweighing_weights(groups, labels)
+
+    # Missing groups are weighted as a group of their own
+    overall = np.average(labels, weights=weights)
+    for group in ("a", "b", "c", None):
+        rows = groups == group if group is not None else pd.isna(groups)
+        assert np.average(labels[rows], weights=weights[rows]) == pytest.approx(overall)
+
+
+def test_reweighing_weights_match_aif360():
+    pytest.importorskip("aif360")
+    from aif360.algorithms.preprocessing import Reweighing
+    from aif360.datasets import BinaryLabelDataset
+
+    rng = np.random.default_rng(1)
+    group = rng.integers(0, 2, 500)
+    labels = (rng.random(500) < np.where(group == 1, 0.6, 0.35)).astype(int)
+    dataset = BinaryLabelDataset(
+        df=pd.DataFrame({"group": group, "label": labels}),
+        label_names=["label"],
+        protected_attribute_names=["group"]
+    )
+
+    expected = Reweighing(
+        unprivileged_groups=[{"group": 0}], privileged_groups=[{"group": 1}]
+    ).fit_transform(dataset).instance_weights
+
+    assert reweighing_weights(group, labels) == pytest.approx(expected)
+
+
+def test_reweighing_mitigation_bins_ages():
+    detector = BiasDetector()
+    features = pd.DataFrame({
+        "years": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        "age": [26, 30, 33, 50, 52, 54]
+    })
+    labels = np.array([1, 1, 0, 1, 0, 0])
+
+    _, _, weights = detector.mitigate_bias(features, labels, {"age": {}}, "reweighing")
+
+    # Two age groups, 25-34 and 45-54, rather than six distinct ages
+    expected = reweighing_weights(["25-34"] * 3 + ["45-54"] * 3, labels)
+    assert weights == pytest.approx(expected)
+    assert weights == pytest.approx(detector.compute_sample_weights(labels, features[["age"]]))
+
+
+def scored_groups(n=4000, seed=0):
+    """Scores that run higher for group "a" than for group "b"."""
+    rng = np.random.default_rng(seed)
+    groups = rng.choice(["a", "b"], n)
+    labels = (rng.random(n) < 0.5).astype(int)
+    scores = np.clip(0.3 * labels + np.where(groups == "a", 0.35, 0.15) + rng.normal(0, 0.15, n), 0, 1)
+    return scores, groups, labels
+
+
+def test_demographic_parity_thresholds_equalize_selection_rates():
+    scores, groups, labels = scored_groups()
+    target = (scores > 0.5).mean()
+
+    postprocessor = GroupThresholdPostprocessor("gender", "demographic_parity").fit(scores, groups)
+    decisions = postprocessor.predict(scores, groups)
+
+    assert set(postprocessor.thresholds) == {"a", "b"}
+    assert postprocessor.threshold_for("a") > postprocessor.threshold_for("b")
+    for group in ("a", "b"):
+        assert decisions[groups == group].mean() == pytest.approx(target, abs=0.01)
+
+
+def test_equalized_odds_thresholds_narrow_rate_gaps():
+    scores, groups, labels = scored_groups()
+
+    def gaps(decisions):
+        rates = [
+            (decisions[(groups == group) & (labels == 1)].mean(), decisions[(groups == group) & (labels == 0)].mean())
+            for group in ("a", "b")
+        ]
+        return np.abs(np.subtract(*rates))
+
+    postprocessor = GroupThresholdPostprocessor("gender", "equalized_odds").fit(scores, groups, labels)
+
+    before = gaps((scores > 0.5).astype(int))
+    after = gaps(postprocessor.predict(scores, groups))
+    assert (after < before / 2).all()
+
+    with pytest.raises(ValueError):
+        GroupThresholdPostprocessor("gender", "equalized_odds").fit(scores, groups)
+
+
+def test_thresholds_never_split_tied_scores():
+    # The default threshold selects 2 of 8 rows; group "b" ties three rows at 0.4
+    scores = np.array([0.9, 0.8, 0.2, 0.1, 0.4, 0.4, 0.4, 0.1])
+    groups = np.array(["a"] * 4 + ["b"] * 4)
+
+    postprocessor = GroupThresholdPostprocessor("gender", "demographic_parity").fit(scores, groups)
+
+    # One of four rows in "a"; in "b" selecting none (0) is closer to 1/4
+    # than selecting the whole tie (3/4)
+    assert postprocessor.thresholds == {"a": 0.8, "b": 0.4}
+    assert postprocessor.predict(scores, groups).tolist() == [1, 0, 0, 0, 0, 0, 0, 0]
+
+
+def test_unseen_groups_use_the_default_and_round_trip():
+    scores, groups, labels = scored_groups(500)
+    postprocessor = GroupThresholdPostprocessor("gender", "equalized_odds", 0.6).fit(scores, groups, labels)
+
+    restored = GroupThresholdPostprocessor.from_dict(postprocessor.to_dict())
+
+    assert restored.thresholds == postprocessor.thresholds
+    assert restored.threshold_for("unknown") == 0.6
+    np.testing.assert_array_equal(restored.predict(scores, groups), postprocessor.predict(scores, groups))
+    with pytest.raises(ValueError):
+        GroupThresholdPostprocessor("gender", "calibration")
@@ -0,0 +1,38 @@
+"""
+Which model a new ResumeAnalyzer serves.
+"""
+import pytest
+
+from app.core.config import settings
+from app.db.synthetic import CorpusConfig, generate
+from app.ml.model import ResumeAnalyzer
+from app.ml.registry import ModelRegistry
+
+
+@pytest.fixture(autouse=True)
+def lemma_cache(tmp_path, monkeypatch):
+    # Training fills the lemma cache; keep it out of the source tree
+    monkeypatch.setattr(settings, "PREPROCESS_CACHE_PATH", str(tmp_path / "lemmas.sqlite3"))
+
+
+def test_bootstrap_model_without_active_version(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    analyzer = ResumeAnalyzer(registry=registry)
+
+    assert registry.active_version() is None
+    assert analyzer.model_version not in {v["version"] for v in registry.list_versions()}
+
+
+def test_new_analyzer_loads_active_version(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    records = list(generate(200, CorpusConfig(seed=3)))
+    ResumeAnalyzer(registry=registry).train(
+        [record["text"] for record in records], [int(record["qualified"]) for record in records]
+    )
+    active = registry.active_version()
+
+    restarted = ResumeAnalyzer(registry=ModelRegistry(str(tmp_path / "registry")))
+
+    assert active is not None
+    assert restarted.model_version == active
+    assert restarted.swap_status == {"state": "active", "version": active}
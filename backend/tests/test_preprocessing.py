@@ -0,0 +1,54 @@
+"""
+Batch preprocessing and the on-disk lemma cache.
+"""
+from app.core.config import settings
+from app.ml.model import ResumeAnalyzer
+from app.ml.registry import ModelRegistry
+
+TEXTS = [
+    "Software engineer building Python services and data pipelines.",
+    "Data scientist with SQL, statistics and machine learning experience.",
+]
+
+
+def test_empty_cache_is_filled_and_then_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PREPROCESS_CACHE_PATH", str(tmp_path / "lemmas.sqlite3"))
+    analyzer = ResumeAnalyzer(registry=ModelRegistry(str(tmp_path / "registry")))
+
+    first = analyzer.preprocess_batch(TEXTS)
+    cache = analyzer._get_lemma_cache()
+    assert len(cache) == len(TEXTS)
+
+    monkeypatch.setattr(analyzer, "_lemmatize", lambda texts, n_process: [""] * len(texts))
+    assert analyzer.preprocess_batch(TEXTS) == first
+
+
+def test_use_cache_false_leaves_cache_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PREPROCESS_CACHE_PATH", str(tmp_path / "lemmas.sqlite3"))
+    analyzer = ResumeAnalyzer(registry=ModelRegistry(str(tmp_path / "registry")))
+
+    analyzer.preprocess_batch(TEXTS, use_cache=False)
+
+    assert len(analyzer._get_lemma_cache()) == 0
+
+
+def test_predict_batch_keeps_long_documents_within_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PREPROCESS_CACHE_PATH", str(tmp_path / "lemmas.sqlite3"))
+    monkeypatch.setattr(settings, "LONG_DOCUMENT_CHARS", 40)
+    monkeypatch.setattr(settings, "LONG_DOCUMENT_BUDGET_SECONDS", 0.5)
+    analyzer = ResumeAnalyzer(registry=ModelRegistry(str(tmp_path / "registry")))
+    budgets = []
+
+    def process_long_document(text, budget_seconds, with_entities=False):
+        budgets.append(budget_seconds)
+        return {"lemmatized": "python engineer", "entities": [], "truncated": True}
+
+    monkeypatch.setattr(analyzer, "_process_long_document", process_long_document)
+
+    analyzer.predict_batch(TEXTS, use_cache=True)
+    assert budgets == [0.5, 0.5]
+    # Truncated lemmas are not cached
+    assert len(analyzer._get_lemma_cache()) == 0
+
+    analyzer.preprocess_batch(TEXTS)
+    assert budgets[2:] == [None, None]
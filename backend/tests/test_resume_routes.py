@@ -0,0 +1,134 @@
+"""
+Upload route of the v1 API, against a temporary SQLite database.
+"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.routes import resume
+from app.db.audit import AuditLog
+from app.db.base import Base, get_db
+from app.ml.rescoring import shortlist_probability
+from app.models.resume import Resume, Analysis, BiasMetrics
+
+SAMPLE_RESUME = """Jane Smith
+Senior Software Engineer
+
+Experience
+2016 - 2024 Backend engineer at Acme, building Python and SQL data pipelines.
+
+Skills
+Python, SQL, Docker, Kubernetes, machine learning
+"""
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def client(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(resume, "decision_audit", AuditLog(str(tmp_path / "audit")))
+
+    def get_test_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(resume.router, prefix="/api/v1/resumes")
+    app.dependency_overrides[get_db] = get_test_db
+    with TestClient(app) as client:
+        yield client
+    resume.decision_audit.close()
+
+
+def test_upload_stores_analysis_and_bias_metrics(client, session_factory):
+    response = client.post(
+        "/api/v1/resumes/upload",
+        files={"file": ("jane_smith.txt", SAMPLE_RESUME.encode(), "text/plain")}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["decision"] in ("shortlist", "reject")
+    assert "fairness" in body["bias_metrics"]
+
+    with session_factory() as db:
+        stored = db.get(Resume, body["resume_id"])
+        assert stored.filename == "jane_smith.txt"
+        analyses = db.query(Analysis).filter(Analysis.resume_id == stored.id).all()
+        metrics = db.query(BiasMetrics).filter(BiasMetrics.resume_id == stored.id).all()
+
+    assert len(analyses) == 1
+    assert analyses[0].decision == body["decision"]
+    assert analyses[0].confidence == pytest.approx(body["confidence"])
+    assert analyses[0].model_version == body["model_version"]
+    assert len(metrics) == 1
+    fairness = body["bias_metrics"]["fairness"]
+    assert metrics[0].demographic_parity == fairness.get("demographic_parity")
+    assert metrics[0].disparate_impact == fairness.get("disparate_impact")
+
+
+def test_upload_audits_shortlist_probability(client):
+    response = client.post(
+        "/api/v1/resumes/upload",
+        files={"file": ("jane_smith.txt", SAMPLE_RESUME.encode(), "text/plain")}
+    )
+    body = response.json()
+    resume.decision_audit.flush()
+
+    [entry] = resume.decision_audit.read()
+    assert entry["resume_id"] == body["resume_id"]
+    assert entry["decision"] == body["decision"]
+    assert entry["score"] == pytest.approx(shortlist_probability(body["decision"], body["confidence"]))
+
+
+def test_failed_upload_is_not_audited(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("bias detection failed")
+
+    monkeypatch.setattr(resume.bias_detector, "detect_bias", fail)
+    response = client.post(
+        "/api/v1/resumes/upload",
+        files={"file": ("jane_smith.txt", SAMPLE_RESUME.encode(), "text/plain")}
+    )
+    resume.decision_audit.flush()
+
+    assert response.status_code == 500
+    assert list(resume.decision_audit.read()) == []
+
+
+def test_upload_extracts_features_off_the_event_loop(client, monkeypatch):
+    extract = resume.resume_analyzer.extract_features
+    on_loop = []
+
+    def recording_extract(text):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return extract(text)
+
+    monkeypatch.setattr(resume.resume_analyzer, "extract_features", recording_extract)
+    response = client.post(
+        "/api/v1/resumes/upload",
+        files={"file": ("jane_smith.txt", SAMPLE_RESUME.encode(), "text/plain")}
+    )
+
+    assert response.status_code == 200
+    assert on_loop == [False]
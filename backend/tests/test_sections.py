@@ -0,0 +1,101 @@
+"""
+Rule-based sectioning, date-range arithmetic and the extracted feature shape.
+"""
+from datetime import date
+
+import pytest
+
+from app.core.config import settings
+from app.ml.model import ResumeAnalyzer
+from app.ml.registry import ModelRegistry
+from app.ml.sections import parse_date_range, parse_resume, total_experience_years
+
+TODAY = date(2024, 7, 15)
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 555 123 4567
+
+Summary
+Backend engineer with 4 years of experience.
+
+Work Experience
+- Senior Engineer at Acme Corp (Jan 2021 - Present)
+  Built Python and Go services
+- Engineer, Initech, 03/2018 to 2021
+- Intern - Globex | Jun 2019 - Aug 2019
+
+Education
+B.Sc. in Computer Science, State University, 2017
+
+Skills: Python, Go, SQL; Docker
+"""
+
+
+@pytest.mark.parametrize("text, start, end, years, ongoing", [
+    ("2015-2018", "2015-01", "2018-01", 3.0, False),
+    ("Jan 2019 - Mar 2021", "2019-01", "2021-03", 2.17, False),
+    ("September 2020 to present", "2020-09", "2024-07", 3.83, True),
+    ("03/2016 until 06/2016", "2016-03", "2016-06", 0.25, False),
+    # An end before the start is clamped to a zero-length range
+    ("2020 - 2019", "2020-01", "2020-01", 0.0, False),
+])
+def test_date_range_arithmetic(text, start, end, years, ongoing):
+    parsed = parse_date_range(f"Engineer ({text})", today=TODAY)
+
+    assert (parsed["start"], parsed["end"], parsed["years"], parsed["ongoing"]) == (start, end, years, ongoing)
+
+
+def test_date_range_absent():
+    assert parse_date_range("Engineer at Acme", today=TODAY) is None
+
+
+def test_overlapping_ranges_count_once():
+    ranges = [
+        {"start": "2018-01", "end": "2020-01"},
+        {"start": "2019-01", "end": "2021-01"},
+        # Contained in the first range
+        {"start": "2018-06", "end": "2018-09"},
+        {"start": "2022-01", "end": "2022-07"},
+    ]
+
+    assert total_experience_years(ranges) == 3.5
+    assert total_experience_years([]) == 0
+
+
+def test_parse_resume_sections_and_experience():
+    parsed = parse_resume(RESUME, today=TODAY)
+    experience = parsed["sections"]["experience"]
+
+    assert [(entry["title"], entry["organization"]) for entry in experience] == [
+        ("Senior Engineer", "Acme Corp"), ("Engineer", "Initech"), ("Intern", "Globex")
+    ]
+    assert experience[0]["details"] == ["Built Python and Go services"]
+    assert experience[0]["dates"]["ongoing"]
+    # 03/2018 to 07/2024 as one span; the internship falls inside it
+    assert parsed["experience_years"] == 6.3
+    assert parsed["stated_experience_years"] == 4
+
+    assert parsed["sections"]["education"] == [
+        {"degree": "B.Sc.", "field": "Computer Science", "institution": "State University", "year": 2017}
+    ]
+    assert parsed["sections"]["skills"] == ["Python", "Go", "SQL", "Docker"]
+    assert parsed["entities"]["EMAIL"] == ["jane.doe@example.com"]
+    assert parsed["entities"]["ORG"] == ["Acme Corp", "Initech", "Globex", "State University"]
+    # Whole words only: "go" is not found inside "Google" or "good"
+    assert parse_resume("Good at Google Sheets", today=TODAY)["entities"].get("SKILL") is None
+
+
+def test_extracted_features_keep_their_original_shape(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PREPROCESS_CACHE_PATH", str(tmp_path / "lemmas.sqlite3"))
+    analyzer = ResumeAnalyzer(registry=ModelRegistry(str(tmp_path / "registry")))
+
+    features = analyzer.extract_features(RESUME)
+
+    # One entity per label and whole years, as clients have always received
+    assert features["entities"]["ORG"] == "State University"
+    assert all(isinstance(value, str) for value in features["entities"].values())
+    assert isinstance(features["experience"], int)
+    # The full lists and fractional years sit alongside
+    assert features["entity_lists"]["ORG"][0] == "Acme Corp"
+    assert features["experience"] == int(features["experience_years"])
+    assert features["skills"] == ["python", "go", "sql", "docker"]